@@ -1,6 +1,7 @@
 # backend/ai_tutor_api.py (append this)
 from fastapi import APIRouter, Request
 from ai_tutor_engine import generate_goal_plan
+from inference_executor import InferenceOverloaded, get_inference_executor
 
 router = APIRouter()
 
@@ -12,6 +13,8 @@ async def goal_oriented_plan(request: Request):
         days = int(data.get("days", 7))
         if not role:
             return {"error": "Missing role"}
-        return generate_goal_plan(role, days)
+        return await get_inference_executor().run(generate_goal_plan, role, days)
+    except InferenceOverloaded:
+        raise  # -> 503 (main.py)
     except Exception as e:
         return {"error": str(e)}
@@ -1,13 +1,8 @@
 import random
 import re
 import urllib.parse
-import json
-import os
 
-# Load existing dataset (QA + roles)
-def load_dataset(path="data/careermate_full_dataset.json"):
-    with open(path, "r") as f:
-        return json.load(f)
+from dataset_store import get_dataset
 
 def get_youtube_link(topic: str) -> str:
     query = "+".join(re.findall(r"\w+", topic))
@@ -48,19 +43,17 @@ def format_day_plan(topic, day_num):
     }
 
 def generate_goal_plan(role: str, days: int = 7) -> dict:
-    dataset = load_dataset()
+    dataset = get_dataset()  # shared in-memory copy, no disk access
     topics = []
 
     # Pull 20 unique role-related questions
-    if role in dataset:
-        qas = dataset[role]
-    else:
-        all_qas = sum(dataset.values(), [])
-        qas = random.sample(all_qas, min(50, len(all_qas)))
+    rows = dataset.role_rows(role)
+    if rows is None:
+        rows = random.sample(range(len(dataset)), min(50, len(dataset)))
 
     seen = set()
-    for qa in qas:
-        t = qa.get("question", "")
+    for row in rows:
+        t = dataset.questions[row]
         if t and t not in seen:
             seen.add(t)
             topics.append(t)
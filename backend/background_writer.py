@@ -0,0 +1,158 @@
+# backend/background_writer.py
+#
+# Moves SQLite writes off the request path. Callers enqueue (sql, params)
+# statements and return immediately; one daemon thread per database drains
+# the queue and commits up to max_batch submissions per transaction, so a
+# burst of requests costs one WAL sync instead of one file write per call.
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from metrics import stage
+
+FLUSH_INTERVAL_MS = float(os.getenv("CAREERMATE_WRITER_FLUSH_MS", "20"))
+MAX_BATCH = int(os.getenv("CAREERMATE_WRITER_MAX_BATCH", "256"))
+MAX_ATTEMPTS = 3
+
+_STOP = object()
+
+
+def connect(db_path):
+    """WAL-mode connection shared by several workers (readers never block the writer)."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class BackgroundWriter:
+    def __init__(self, db_path, max_batch=MAX_BATCH, flush_interval_ms=FLUSH_INTERVAL_MS):
+        self.db_path = db_path
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name=f"writer-{os.path.basename(db_path)}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)  # don't lose queued writes on shutdown
+
+    def submit(self, sql, params=(), on_done=None):
+        """Queue one statement; on_done() runs on the writer thread once it's committed."""
+        self.submit_many([(sql, params)], on_done)
+
+    def submit_many(self, statements, on_done=None):
+        """Queue [(sql, params), ...] to be committed in the same transaction."""
+        self._queue.put((list(statements), on_done))
+
+    def flush(self, timeout=None) -> bool:
+        """Block until everything submitted so far has been committed."""
+        done = threading.Event()
+        self._queue.put(([], done.set))
+        return done.wait(timeout)
+
+    def busy(self) -> bool:
+        """True while submitted writes are still queued or being committed."""
+        return self._queue.unfinished_tasks > 0
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+    # ─── Writer thread ─────────────────────────────────────────────────────────
+    def _run(self):
+        db = connect(self.db_path)
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            # Give concurrent requests a moment to join the same transaction
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(db, batch)
+            for _ in batch:
+                self._queue.task_done()
+        db.close()
+
+    def _commit(self, db, batch):
+        statements = [statement for group, _ in batch for statement in group]
+        if statements:
+            # Whole transaction, retries included: how long a batch of session /
+            # history writes keeps the database busy
+            with stage("session_write"):
+                for attempt in range(MAX_ATTEMPTS):
+                    try:
+                        db.execute("BEGIN IMMEDIATE")
+                        for sql, params in statements:
+                            db.execute(sql, params)
+                        db.execute("COMMIT")
+                        self.written += len(statements)
+                        self.batches += 1
+                        break
+                    except sqlite3.OperationalError as e:
+                        # Usually "database is locked" by another worker: back off and retry
+                        if db.in_transaction:
+                            db.execute("ROLLBACK")
+                        if attempt == MAX_ATTEMPTS - 1:
+                            self._commit_each(db, batch, e)
+                        else:
+                            time.sleep(0.05 * 2 ** attempt)
+                    except sqlite3.Error as e:
+                        # A bad statement shouldn't sink the rest of the batch
+                        if db.in_transaction:
+                            db.execute("ROLLBACK")
+                        self._commit_each(db, batch, e)
+                        break
+
+        for _, on_done in batch:
+            if on_done is not None:
+                try:
+                    on_done()
+                except Exception as e:
+                    print(f"[⚠️ Writer] Callback failed: {e}")
+
+    def _commit_each(self, db, batch, error):
+        print(f"[⚠️ Writer] Batch of {len(batch)} failed ({error}); retrying one by one")
+        for group, _ in batch:
+            if not group:
+                continue
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                for sql, params in group:
+                    db.execute(sql, params)
+                db.execute("COMMIT")
+                self.written += len(group)
+            except sqlite3.Error as e:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                self.failed += len(group)
+                print(f"[⚠️ Writer] Dropped write to {self.db_path}: {e}")
@@ -0,0 +1,241 @@
+# backend/batch_pipeline.py
+#
+# Offline bulk generation of flashcards and reference answers, so the API
+# serves them from disk instead of waiting on the LLM:
+#   • flashcards        -> content_store (data/content.db), read by /generate-flashcards
+#   • reference answers -> reference_store (data/reference_cache.db), read by feedback scoring
+# Inputs are streamed line by line (JSONL {"kind", "text"} or plain text),
+# generated with bounded concurrency and skipped when their content hash is
+# already stored. A checkpoint file records how far the input has been fully
+# processed and which items failed, so a rerun resumes where it stopped and
+# retries the failures.
+#
+#   python batch_pipeline.py inputs > inputs.jsonl         # dataset topics + Coursera keywords
+#   python batch_pipeline.py run --input inputs.jsonl --concurrency 4
+#   python batch_pipeline.py run --dataset                 # same inputs, no intermediate file
+#   python batch_pipeline.py export --kind flashcard > flashcards.jsonl
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from content_store import content_hash, get_content_store
+from dataset_store import get_dataset
+from flashcard_generator import FLASHCARD_CONCURRENCY, generate_flashcard_prompt, parse_flashcard
+from generate_feedback import get_reference_store, reference_prompt
+from llm_client import get_llm_client
+from study_plan_generator import COURSERA_COURSES
+
+KINDS = ("flashcard", "reference")
+CHECKPOINT_EVERY = 5.0  # seconds
+
+
+def dataset_inputs():
+    """Flashcards for every dataset topic and Coursera keyword, references for
+    dataset questions that don't ship an answer."""
+    dataset = get_dataset()
+    for keyword in COURSERA_COURSES:
+        yield {"kind": "flashcard", "text": keyword}
+    for _, question, answer in dataset.iter_rows():
+        yield {"kind": "flashcard", "text": question}
+        if not answer:
+            yield {"kind": "reference", "text": question}
+
+
+def read_inputs(path, default_kind):
+    """Stream {"kind", "text"} items from a JSONL or plain-text file."""
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                yield None  # keep line numbers aligned with the checkpoint
+                continue
+            if line.startswith("{"):
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    print(f"[⚠️ Skipped] Invalid JSON line: {line[:60]!r}")
+                    yield None
+                    continue
+                yield {"kind": item.get("kind", default_kind), "text": item.get("text", "")}
+            else:
+                yield {"kind": default_kind, "text": line}
+
+
+class Checkpoint:
+    """Low-water mark over input positions: every item before `done` has been
+    attempted, and those in `failed` need another try."""
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.done = 0
+        self.failed = set()
+        self._finished = set()
+        self._saved_at = time.monotonic()
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                state = json.load(f)
+            if state.get("source") == source:
+                self.done = state.get("done", 0)
+                self.failed = set(state.get("failed", ()))
+
+    def pending(self, position) -> bool:
+        return position >= self.done or position in self.failed
+
+    def finish(self, position, ok=True):
+        if ok:
+            self.failed.discard(position)
+        else:
+            self.failed.add(position)
+        if position < self.done:
+            return  # a retried failure: the low-water mark is already past it
+        self._finished.add(position)
+        while self.done in self._finished:
+            self._finished.remove(self.done)
+            self.done += 1
+        if time.monotonic() - self._saved_at > CHECKPOINT_EVERY:
+            self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"source": self.source, "done": self.done, "failed": sorted(self.failed)}, f)
+        os.replace(tmp, self.path)
+        self._saved_at = time.monotonic()
+
+
+class Pipeline:
+    def __init__(self, concurrency=FLASHCARD_CONCURRENCY, flashcard_model="llama2:7b", reference_model="mistral"):
+        self.concurrency = max(1, concurrency)
+        self.flashcard_model = flashcard_model
+        self.reference_model = reference_model
+        self.content = get_content_store()
+        self.references = get_reference_store()
+        self.counts = {"generated": 0, "skipped": 0, "failed": 0}
+
+    def is_done(self, kind, text):
+        if kind == "flashcard":
+            return self.content.get(kind, text) is not None
+        return self.references.lookup(text) is not None
+
+    async def generate(self, kind, text):
+        client = get_llm_client()
+        if kind == "flashcard":
+            raw = await client.generate(generate_flashcard_prompt(text), model=self.flashcard_model)
+            card = parse_flashcard(raw)
+            if card["question"] == "Unknown":
+                raise ValueError("response is not in flashcard format")
+            await asyncio.to_thread(self.content.put, kind, text, card)
+        else:
+            answer = (await client.generate(reference_prompt(text), model=self.reference_model)).strip()
+            if not answer:
+                raise ValueError("empty reference answer")
+            await asyncio.to_thread(self.references.put, text, answer)
+
+    async def run(self, items, checkpoint):
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)  # bounded: the input is never read ahead
+        seen = set()
+
+        async def worker():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                position, item = entry
+                ok = False
+                try:
+                    ok = await self.process(item, seen)
+                except Exception as e:
+                    # e.g. the store lookup failing: a dead worker would leave
+                    # the producer blocked on the full queue, so record the
+                    # item as failed (retried next run) and keep draining
+                    self.counts["failed"] += 1
+                    print(f"[❌ Batch] {str(item)[:60]!r}: {e}")
+                finally:
+                    checkpoint.finish(position, ok)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        for position, item in enumerate(items):
+            if not checkpoint.pending(position):
+                continue
+            await queue.put((position, item))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        checkpoint.save()
+
+    async def process(self, item, seen) -> bool:
+        """False if the item failed and should be retried by the next run."""
+        if item is None:
+            return True
+        kind, text = item["kind"], (item.get("text") or "").strip()
+        if kind not in KINDS or not text:
+            print(f"[⚠️ Skipped] Unsupported input: {item}")
+            return True
+        key = content_hash(kind, text)
+        if key in seen or await asyncio.to_thread(self.is_done, kind, text):
+            self.counts["skipped"] += 1
+            return True
+        seen.add(key)
+        try:
+            await self.generate(kind, text)
+            self.counts["generated"] += 1
+        except Exception as e:
+            # Recorded in the checkpoint, so the next run retries it
+            self.counts["failed"] += 1
+            print(f"[❌ {kind} failed] {text[:60]!r}: {e}")
+            return False
+        total = self.counts["generated"]
+        if total % 25 == 0:
+            print(f"[⚙️ Batch] {total} generated, {self.counts['skipped']} skipped, {self.counts['failed']} failed")
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk flashcard / reference-answer generation")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("inputs", help="print dataset topics + Coursera keywords as JSONL")
+    run = sub.add_parser("run", help="generate everything not already stored")
+    source = run.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL ({\"kind\", \"text\"}) or one topic per line")
+    source.add_argument("--dataset", action="store_true", help="use the dataset inputs directly")
+    run.add_argument("--kind", choices=KINDS, default="flashcard", help="kind for plain-text lines")
+    run.add_argument("--concurrency", type=int, default=FLASHCARD_CONCURRENCY)
+    run.add_argument("--checkpoint", help="defaults to <input>.ckpt (data/batch_dataset.ckpt for --dataset)")
+    export = sub.add_parser("export", help="print stored flashcards as JSONL")
+    export.add_argument("--kind", choices=("flashcard",), default="flashcard")
+    args = parser.parse_args()
+
+    if args.command == "inputs":
+        for item in dataset_inputs():
+            print(json.dumps(item))
+        return
+    if args.command == "export":
+        for text, output in get_content_store().iter_kind(args.kind):
+            sys.stdout.write(json.dumps({"kind": args.kind, "text": text, "output": output}) + "\n")
+        return
+
+    if args.dataset:
+        # A changed dataset file gets a fresh checkpoint (positions would shift)
+        items, source_name = dataset_inputs(), f"dataset@{get_dataset().mtime}"
+        checkpoint_path = args.checkpoint or os.path.join(os.path.dirname(__file__), "data", "batch_dataset.ckpt")
+    else:
+        items, source_name = read_inputs(args.input, args.kind), os.path.abspath(args.input)
+        checkpoint_path = args.checkpoint or f"{args.input}.ckpt"
+
+    checkpoint = Checkpoint(checkpoint_path, source_name)
+    if checkpoint.done:
+        print(f"↩️ Resuming after {checkpoint.done} inputs ({len(checkpoint.failed)} failed ones to retry)")
+    pipeline = Pipeline(args.concurrency)
+    asyncio.run(pipeline.run(items, checkpoint))
+    print(f"✅ Batch done: {pipeline.counts} (store: {get_content_store().stats()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# backend/bench_api.py
+#
+# End-to-end load test: starts the app with uvicorn in-process against the
+# fake Ollama server (stub models optional), drives each endpoint at the
+# given concurrency and reports p50/p95/p99 latency, throughput and memory.
+# Sessions, history, content and reference caches go to a temp directory,
+# so the real data/ files are never touched.
+#
+#   python bench_api.py --stub-models --concurrency 1 8 32 --requests 200
+#   python bench_api.py --llm-delay-ms 300 --endpoints get-question get-feedback
+#   python bench_api.py --ollama-url http://localhost:11434    # real models + LLM
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from bench_rag import peak_rss_mb, rss_mb
+
+ANSWER = ("In my last project I owned the feature pipeline end to end: I profiled the slow joins, "
+          "moved them into a nightly batch job, added data-quality checks and cut training time by half.")
+ENDPOINTS = ("get-question", "submit-answer", "get-feedback", "generate-flashcards",
+             "generate-study-plan", "ai-tutor/goal-plan")
+UNKNOWN_ROLE_SHARE = 0.1  # share of /get-question calls for roles outside the dataset
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+# ─── Server ────────────────────────────────────────────────────────────────────
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(args, data_dir):
+    """Point the app at the fake LLM and temp storage, then serve it on a thread."""
+    if args.ollama_url:
+        os.environ["OLLAMA_URL"] = args.ollama_url
+    else:
+        from fake_ollama import start_fake_ollama
+        _, url = start_fake_ollama(delay_ms=args.llm_delay_ms)
+        os.environ["OLLAMA_URL"] = url
+    os.environ["CAREERMATE_SESSION_DB"] = os.path.join(data_dir, "sessions.db")
+    os.environ["CAREERMATE_CONTENT_DB"] = os.path.join(data_dir, "content.db")
+    os.environ["CAREERMATE_REFERENCE_DB"] = os.path.join(data_dir, "reference_cache.db")
+
+    import uvicorn
+    import main
+
+    if args.stub_models:
+        from stub_models import install_stub_models
+        install_stub_models(encode_ms=args.encode_ms)
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    server.install_signal_handlers = lambda: None  # not the main thread
+    threading.Thread(target=server.run, name="bench-server", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(client, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if (await client.get("/readyz")).status_code == 200:
+            return
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"app not ready after {timeout}s: {(await client.get('/readyz')).json()}")
+
+
+# ─── Load generation ───────────────────────────────────────────────────────────
+async def run_phase(client, name, requests, concurrency):
+    """requests: list of (method, path, kwargs). Returns a result row and the
+    successful JSON responses in request order (None for failures)."""
+    latencies, statuses = [], {}
+    responses = [None] * len(requests)
+    pending = iter(enumerate(requests))
+
+    async def worker():
+        for i, (method, path, kwargs) in pending:
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, path, **kwargs)
+                status = r.status_code
+                if status == 200:
+                    responses[i] = r.json()
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    row = {
+        "endpoint": name, "concurrency": concurrency, "requests": len(requests),
+        "errors": len(requests) - statuses.get(200, 0),
+        "rps": len(requests) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99), "max_ms": latencies[-1] if latencies else 0.0,
+        "rss_mb": rss_mb(), "statuses": {str(k): v for k, v in statuses.items()},
+    }
+    return row, responses
+
+
+def phases(args, rng):
+    """(name, build_requests) in run order; later phases reuse earlier responses."""
+    from dataset_store import get_dataset
+    from study_plan_generator import COURSERA_COURSES
+
+    dataset = get_dataset()
+    roles = dataset.roles
+    topics = list(COURSERA_COURSES)
+    n = args.requests
+
+    def question_requests(_):
+        picks = [f"Quantum Gardener {i % 5}" if rng.random() < UNKNOWN_ROLE_SHARE else rng.choice(roles)
+                 for i in range(n)]
+        return [("POST", "/get-question", {"json": {"role": role}}) for role in picks]
+
+    def answer_requests(sessions):
+        return [("POST", "/submit-answer", {"json": {"session_id": s["session_id"], "question": s["question"],
+                                                     "answer": ANSWER}}) for s in sessions]
+
+    def feedback_requests(sessions):
+        return [("GET", "/get-feedback", {"params": {"session_id": s["session_id"]}}) for s in sessions]
+
+    def flashcard_requests(_):
+        return [("POST", "/generate-flashcards", {"json": {"topic_tags": rng.sample(topics, 3)}}) for _ in range(n)]
+
+    def study_plan_requests(_):
+        return [("POST", "/generate-study-plan", {"json": [
+            {"question": dataset.questions[rng.randrange(len(dataset))], "f1": round(rng.uniform(0.3, 0.9), 2)}
+            for _ in range(10)
+        ]}) for _ in range(n)]
+
+    def goal_plan_requests(_):
+        return [("POST", "/ai-tutor/goal-plan", {"json": {"role": rng.choice(roles), "days": 7}}) for _ in range(n)]
+
+    return [
+        ("get-question", question_requests),
+        ("submit-answer", answer_requests),
+        ("get-feedback", feedback_requests),
+        ("generate-flashcards", flashcard_requests),
+        ("generate-study-plan", study_plan_requests),
+        ("ai-tutor/goal-plan", goal_plan_requests),
+    ]
+
+
+async def run_benchmark(args, base_url):
+    import httpx
+
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    rows = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await wait_ready(client, args.ready_timeout)
+        print(f"🚀 App ready at {base_url} (RSS {rss_mb():.0f} MB)", file=sys.stderr)
+        wanted = set(args.endpoints or ENDPOINTS)
+        if "get-feedback" in wanted:
+            wanted.add("submit-answer")  # feedback is only scored for a real answer
+        if "submit-answer" in wanted:
+            wanted.add("get-question")
+        for concurrency in args.concurrency:
+            sessions = []
+            for name, build in phases(args, rng):
+                if name not in wanted or (name in ("submit-answer", "get-feedback") and not sessions):
+                    continue
+                requests = build(sessions)
+                row, responses = await run_phase(client, name, requests, concurrency)
+                if name == "get-question":
+                    sessions = [r for r in responses if r]
+                if not args.endpoints or name in args.endpoints:
+                    rows.append(row)
+                    print_row(row, args.json)
+    return rows
+
+
+# ─── Report ────────────────────────────────────────────────────────────────────
+def print_header():
+    print(f"{'endpoint':<20} {'conc':>4} {'reqs':>5} {'errors':>6} {'req/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'RSS MB':>7}")
+
+
+def print_row(row, as_json=False):
+    if as_json:
+        print(json.dumps(row), flush=True)
+        return
+    print(f"{row['endpoint']:<20} {row['concurrency']:>4} {row['requests']:>5} {row['errors']:>6} "
+          f"{row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+          f"{row['max_ms']:>8.1f} {row['rss_mb']:>7.0f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency / throughput benchmark for the CareerMate API")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint per concurrency level")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, metavar="NAME",
+                        help=f"only these ({', '.join(ENDPOINTS)}); interview steps also run the steps before them")
+    parser.add_argument("--stub-models", action="store_true", help="hashing encoder + token-overlap scorer")
+    parser.add_argument("--encode-ms", type=float, default=0.0, help="simulated cost per stub encode call")
+    parser.add_argument("--llm-delay-ms", type=float, default=50.0, help="fake Ollama latency per completion")
+    parser.add_argument("--ollama-url", help="use a real Ollama server instead of the fake one")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print rows as JSON lines instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="careermate-bench-") as data_dir:
+        server, base_url = start_app(args, data_dir)
+        if not args.json:
+            print_header()
+        try:
+            asyncio.run(run_benchmark(args, base_url))
+        finally:
+            server.should_exit = True
+    if not args.json:
+        print(f"peak RSS {peak_rss_mb():.0f} MB (server and load generator share the process)")
+
+
+if __name__ == "__main__":
+    main()
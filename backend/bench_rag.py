@@ -0,0 +1,157 @@
+# backend/bench_rag.py
+#
+# Microbenchmarks for the retrieval side on synthetic datasets: RAGEngine
+# load / build_index / search (single, role-filtered, batched, cached) and
+# extract_weak_topics, with resident memory after each size. Uses the stub
+# embedding model by default so the numbers track our code, not torch.
+# Keyword queries (two of a question's words + its project number) measure
+# latency and top-1 hit rate, to compare --mode vector with --mode hybrid.
+#
+#   python bench_rag.py --sizes 1000 10000 100000
+#   python bench_rag.py --sizes 100000 --mode hybrid
+#   python bench_rag.py --sizes 1000000 --index hnsw
+#   python bench_rag.py --sizes 5000 --real-model          # all-MiniLM-L6-v2
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from bench_weak_topics import synthetic_dataset, synthetic_history
+from dataset_store import load_dataset_file
+from rag_engine import RAGEngine
+from bm25_index import tokenize
+from stub_models import StubEncoder
+from study_plan_generator import extract_weak_topics
+from topic_index import TopicIndex
+
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def per_query_ms(fn, queries):
+    start = time.perf_counter()
+    for args in queries:
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def bench_size(n, args, tmp_dir):
+    dataset = synthetic_dataset(n, n_roles=args.roles)
+    path = os.path.join(tmp_dir, f"dataset_{n}.json")
+    with open(path, "w") as f:
+        json.dump(dataset, f)
+    del dataset
+
+    model = None if args.real_model else StubEncoder()
+    rag = RAGEngine(model=model, index_type=args.index, query_cache_size=args.queries * 4, search_mode=args.mode)
+    row = {"questions": n}
+
+    start = time.perf_counter()
+    rag.load_data(path)
+    row["load_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rag.build_index()
+    row["build_s"] = time.perf_counter() - start
+
+    # Queries: lightly edited dataset questions, so every one has neighbours
+    rng = random.Random(1)
+    picks = [rng.randrange(len(rag.questions)) for _ in range(args.queries)]
+    texts = [rag.questions[i].replace("would you", "do you", 1) + f" {i}" for i in picks]
+    roles = [rag.role_of(i) for i in picks]
+    k = args.k
+
+    row["search_ms"] = per_query_ms(lambda q: rag.search(q, k=k), [(q,) for q in texts])
+    rag.query_results.clear()
+    rag.query_embeddings.clear()
+    row["role_ms"] = per_query_ms(lambda q, r: rag.search(q, k=k, role=r), list(zip(texts, roles)))
+    row["cached_ms"] = per_query_ms(lambda q, r: rag.search(q, k=k, role=r), list(zip(texts, roles)))
+    rag.query_results.clear()
+    rag.query_embeddings.clear()
+    batch = args.batch
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch):
+        rag.search_batch(texts[i:i + batch], k=k, roles=roles[i:i + batch])
+    row["batch_ms"] = (time.perf_counter() - start) * 1000 / len(texts)
+
+    keyword_queries = []
+    for i in picks:
+        terms = tokenize(rag.questions[i])  # [handle, <words>, project, <number>]
+        keyword_queries.append(" ".join(rng.sample(terms[1:-2], min(2, len(terms) - 3)) + terms[-2:]))
+    found = []
+    row["keyword_ms"] = per_query_ms(lambda q, i: found.append(rag.search(q, k=k)[0]["question"] == rag.questions[i]),
+                                     list(zip(keyword_queries, picks)))
+    row["keyword_top1"] = sum(found) / len(found)
+
+    # Weak-topic matching over the same questions
+    snapshot = load_dataset_file(path)
+    start = time.perf_counter()
+    topic_index = (snapshot, TopicIndex(snapshot.questions_lower))
+    row["topics_build_s"] = time.perf_counter() - start
+    history = synthetic_history({"all": [{"question": q} for q in snapshot.questions]}, args.history)
+    start = time.perf_counter()
+    matched = extract_weak_topics(history, topic_index=topic_index)
+    row["weak_ms"] = (time.perf_counter() - start) * 1000
+    row["weak_topics"] = len(matched)
+
+    row["rss_mb"] = rss_mb()
+    os.remove(path)
+    return row
+
+
+def print_row(r):
+    print(f"{r['questions']:>9} {r['load_s']:>7.2f} {r['build_s']:>8.2f} {r['search_ms']:>10.3f} "
+          f"{r['role_ms']:>8.3f} {r['cached_ms']:>10.3f} {r['batch_ms']:>9.3f} "
+          f"{r['keyword_ms']:>7.3f} {r['keyword_top1']:>7.0%} "
+          f"{r['topics_build_s']:>9.2f} {r['weak_ms']:>8.1f} {r['rss_mb']:>8.0f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG search and weak-topic microbenchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--index", default="flat", help="flat | ivf_flat | ivf_pq | hnsw")
+    parser.add_argument("--mode", default="vector", choices=("vector", "hybrid"), help="RAGEngine search mode")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--history", type=int, default=50, help="score entries per weak-topic call")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--real-model", action="store_true", help="encode with all-MiniLM-L6-v2")
+    parser.add_argument("--json", action="store_true", help="print rows as JSON lines instead")
+    args = parser.parse_args()
+
+    if not args.json:
+        print(f"{'questions':>9} {'load s':>7} {'build s':>8} {'search ms':>10} {'role ms':>8} "
+              f"{'cached ms':>10} {'batch ms':>9} {'kw ms':>7} {'kw top1':>7} {'topics s':>9} {'weak ms':>8} {'RSS MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.sizes:
+            row = bench_size(n, args, tmp_dir)
+            if args.json:
+                print(json.dumps(row), flush=True)
+            else:
+                print_row(row)
+    if not args.json:
+        print(f"peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# backend/bench_weak_topics.py
+#
+# Compares the indexed extract_weak_topics with the original difflib scan
+# (every dataset question × every weak keyword) on synthetic datasets, and
+# checks that both return exactly the same matches.
+#
+#   python bench_weak_topics.py --questions 2000 --history 50
+
+import argparse
+import difflib
+import random
+import time
+
+from topic_index import TopicIndex
+
+WORDS = ("model data feature training overfitting gradient descent neural network pipeline api cache "
+         "latency deploy docker kubernetes design user research metric precision recall bias variance "
+         "regression classification clustering embedding transformer attention query index database").split()
+
+
+def synthetic_dataset(n_questions, n_roles=8, seed=0):
+    rng = random.Random(seed)
+    dataset = {}
+    for i in range(n_questions):
+        words = rng.sample(WORDS, rng.randint(2, 16))
+        question = f"How would you handle {' '.join(words)} in project {i}?"
+        dataset.setdefault(f"Role {i % n_roles}", []).append({"question": question, "answer": "..."})
+    return dataset
+
+
+def synthetic_history(dataset, n_entries, seed=1):
+    """Mix of exact, lightly edited, truncated and unrelated questions."""
+    rng = random.Random(seed)
+    questions = [qa["question"] for qas in dataset.values() for qa in qas]
+    history = []
+    for _ in range(n_entries):
+        q = rng.choice(questions)
+        kind = rng.random()
+        if kind < 0.25:
+            text = q
+        elif kind < 0.5:
+            text = q.replace("would you", "do you", 1)
+        elif kind < 0.75:
+            text = q[: len(q) // 2]
+        else:
+            text = " ".join(rng.sample(WORDS, 6))
+        history.append({"question": text, "f1": round(rng.uniform(0.3, 0.9), 2)})
+    return history
+
+
+def weak_keywords(score_data, threshold=0.7):
+    return [
+        item["question"].strip().lower()
+        for item in score_data
+        if isinstance(item, dict) and "question" in item
+        and isinstance(item.get("f1", 1.0), (int, float)) and item.get("f1", 1.0) < threshold
+    ]
+
+
+def difflib_matches(dataset, score_data):
+    # The original nested loop from study_plan_generator.extract_weak_topics
+    keywords = weak_keywords(score_data)
+    matches = []
+    for role, qas in dataset.items():
+        for item in qas:
+            question_text = item.get("question", "").strip().lower()
+            for keyword in keywords:
+                sim_score = difflib.SequenceMatcher(None, keyword, question_text).ratio()
+                if keyword in question_text or question_text in keyword or sim_score > 0.75:
+                    f1 = next((e["f1"] for e in score_data if e["question"].strip().lower() in keyword), 0.0)
+                    matches.append((item["question"], role, f1))
+                    break
+    return matches
+
+
+def build_index(dataset):
+    rows = [(role, qa) for role, qas in dataset.items() for qa in qas]
+    return TopicIndex([qa.get("question", "").strip().lower() for _, qa in rows]), rows
+
+
+def indexed_matches(index, rows, score_data):
+    keywords = weak_keywords(score_data)
+    matches = []
+    for row, pos in index.match(keywords):
+        role, item = rows[row]
+        f1 = next((e["f1"] for e in score_data if e["question"].strip().lower() in keywords[pos]), 0.0)
+        matches.append((item["question"], role, f1))
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark weak-topic matching")
+    parser.add_argument("--questions", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--history", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'questions':>9} {'keywords':>8} {'build s':>8} {'index ms':>9} {'repeat ms':>10} "
+          f"{'difflib ms':>11} {'speedup':>8}  same")
+    for n in args.questions:
+        dataset = synthetic_dataset(n)
+        history = synthetic_history(dataset, args.history)
+
+        start = time.perf_counter()
+        index, rows = build_index(dataset)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = indexed_matches(index, rows, history)
+        index_ms = (time.perf_counter() - start) * 1000
+
+        # Same history plus a few new answers, as sent by the next request
+        more = history + synthetic_history(dataset, 5, seed=2)
+        start = time.perf_counter()
+        indexed_matches(index, rows, more)
+        repeat_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        slow = difflib_matches(dataset, history)
+        difflib_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{n:>9} {len(weak_keywords(history)):>8} {build_s:>8.2f} {index_ms:>9.1f} {repeat_ms:>10.1f} "
+              f"{difflib_ms:>11.1f} "
+              f"{difflib_ms / max(index_ms, 1e-9):>7.1f}x  {'✅' if fast == slow else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
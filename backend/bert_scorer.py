@@ -0,0 +1,67 @@
+# backend/bert_scorer.py
+
+import os
+import threading
+
+from metrics import stage
+
+# None -> bert_score's default English model (roberta-large). Lighter options
+# such as "distilroberta-base" or "distilbert-base-uncased" cut CPU latency a lot.
+DEFAULT_MODEL = os.getenv("CAREERMATE_BERTSCORE_MODEL") or None
+# Answers longer than this many tokens are truncated before scoring (0 = no cap)
+DEFAULT_MAX_TOKENS = int(os.getenv("CAREERMATE_BERTSCORE_MAX_TOKENS", "0"))
+
+
+class FeedbackScorer:
+    """Long-lived BERTScore scorer: the model and tokenizer are loaded once
+    and reused for every request."""
+
+    def __init__(self, model_type=DEFAULT_MODEL, num_layers=None, max_tokens=DEFAULT_MAX_TOKENS,
+                 batch_size=32, device="cpu"):
+        from bert_score import BERTScorer  # heavy (torch + transformers): load on first use
+
+        self.scorer = BERTScorer(
+            model_type=model_type, num_layers=num_layers, lang="en", batch_size=batch_size, device=device
+        )
+        self.max_tokens = max_tokens or None
+        # One forward pass at a time; parallel torch calls only fight over cores
+        self._lock = threading.Lock()
+
+    def _truncate(self, text: str) -> str:
+        if not self.max_tokens:
+            return text
+        tokenizer = self.scorer._tokenizer
+        ids = tokenizer.encode(text, add_special_tokens=False)
+        if len(ids) <= self.max_tokens:
+            return text
+        return tokenizer.decode(ids[:self.max_tokens])
+
+    def score_pairs(self, pairs):
+        """Score many (answer, reference) pairs in one pass.
+
+        Returns a list of (precision, recall, f1) tuples in input order.
+        """
+        if not pairs:
+            return []
+        candidates = [self._truncate(answer) for answer, _ in pairs]
+        references = [self._truncate(reference) for _, reference in pairs]
+        with self._lock, stage("bertscore"):
+            P, R, F1 = self.scorer.score(candidates, references, verbose=False)
+        return list(zip(P.tolist(), R.tolist(), F1.tolist()))
+
+    def score(self, answer: str, reference: str):
+        return self.score_pairs([(answer, reference)])[0]
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_scorer() -> FeedbackScorer:
+    """Process-wide scorer, created on first use (or at startup via warm-up)."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = FeedbackScorer()
+    return _scorer
@@ -0,0 +1,186 @@
+# backend/bm25_index.py
+#
+# BM25 inverted index over RAGEngine rows (question + answer, question terms
+# weighted up), for hybrid retrieval: keyword-heavy queries ("How do you
+# prevent overfitting?") are answered from postings in well under a
+# millisecond, without the embedding model.
+#
+# Postings are one CSR table (term -> slice of doc ids / term frequencies),
+# built in a single pass; rows added later go into a small per-term overlay
+# and removed rows are masked out. Like the FAISS index, an instance is never
+# modified once published: updated() returns a new one that shares the
+# unchanged arrays, so searches running on the old one are unaffected.
+
+import math
+import re
+import time
+from array import array
+
+import numpy as np
+
+K1 = 1.2
+B = 0.75
+QUESTION_WEIGHT = 2  # a term in the question counts as much as two in the answer
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset("""
+a about an and are as at be been being but by can could did do does doing for from had has have how i if
+in into is it its me my of on or our should so than that the their them then there these they this those
+to was we were what when where which while who whom why will with would you your
+""".split())
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _weighted_counts(question, answer):
+    """{term: weighted frequency}, weighted document length."""
+    counts = {}
+    for term in tokenize(question):
+        counts[term] = counts.get(term, 0) + QUESTION_WEIGHT
+    for term in tokenize(answer):
+        counts[term] = counts.get(term, 0) + 1
+    return counts, sum(counts.values())
+
+
+class BM25Index:
+    def __init__(self, questions=(), answers=()):
+        """Index rows 0..n-1 of the parallel question / answer sequences."""
+        start = time.perf_counter()
+        self.vocab = {}                  # term -> term id in the CSR table
+        term_ids, doc_ids, tfs = array("I"), array("I"), array("H")
+        lengths = array("f")
+        for row, (question, answer) in enumerate(zip(questions, answers)):
+            counts, length = _weighted_counts(question, answer)
+            for term, tf in counts.items():
+                tid = self.vocab.get(term)
+                if tid is None:
+                    tid = self.vocab[term] = len(self.vocab)
+                term_ids.append(tid)
+                doc_ids.append(row)
+                tfs.append(min(tf, 0xFFFF))
+            lengths.append(length)
+
+        # Group postings by term; the stable sort keeps each term's rows ascending
+        term_ids = np.frombuffer(term_ids, dtype=np.uint32) if term_ids else np.zeros(0, np.uint32)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = (np.frombuffer(doc_ids, dtype=np.uint32) if doc_ids else np.zeros(0, np.uint32))[order]
+        self.tfs = (np.frombuffer(tfs, dtype=np.uint16) if tfs else np.zeros(0, np.uint16))[order]
+        self.offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(self.vocab)), out=self.offsets[1:])
+        del term_ids, order
+
+        self.doc_len = np.array(lengths, dtype=np.float32)
+        self.live = np.ones(len(self.doc_len), dtype=bool)
+        self.overlay = {}                # term -> (doc ids, tfs) for rows added by updated()
+        self.n_live = len(self.doc_len)
+        self.total_len = float(self.doc_len.sum())
+        if len(self.doc_len):
+            print(f"[🔤 BM25] Indexed {len(self.doc_len)} rows, {len(self.vocab)} terms "
+                  f"in {time.perf_counter() - start:.2f}s")
+
+    def __len__(self):
+        return self.n_live
+
+    def updated(self, added=(), removed=()):
+        """New index with rows added ((row, question, answer), row ids
+        continuing from the current end) and rows removed (ids)."""
+        new = object.__new__(BM25Index)
+        new.vocab, new.doc_ids, new.tfs, new.offsets = self.vocab, self.doc_ids, self.tfs, self.offsets
+        new.overlay = dict(self.overlay)
+        new.live = self.live.copy()
+        new.n_live, new.total_len = self.n_live, self.total_len
+
+        removed = [row for row in removed if row < len(new.live) and new.live[row]]
+        if removed:
+            new.live[removed] = False
+            new.n_live -= len(removed)
+            new.total_len -= float(self.doc_len[removed].sum())
+
+        lengths, postings = [], {}
+        for row, question, answer in added:
+            if row != len(self.doc_len) + len(lengths):
+                raise ValueError(f"BM25 rows must be added in order (expected {len(self.doc_len) + len(lengths)}, got {row})")
+            counts, length = _weighted_counts(question, answer)
+            for term, tf in counts.items():
+                ids, tfs = postings.setdefault(term, ([], []))
+                ids.append(row)
+                tfs.append(min(tf, 0xFFFF))
+            lengths.append(length)
+        for term, (ids, tfs) in postings.items():
+            old_ids, old_tfs = new.overlay.get(term, (np.zeros(0, np.uint32), np.zeros(0, np.uint16)))
+            new.overlay[term] = (np.concatenate([old_ids, np.asarray(ids, dtype=np.uint32)]),
+                                 np.concatenate([old_tfs, np.asarray(tfs, dtype=np.uint16)]))
+        new.doc_len = np.concatenate([self.doc_len, np.asarray(lengths, dtype=np.float32)]) if lengths else self.doc_len
+        new.live = np.concatenate([new.live, np.ones(len(lengths), dtype=bool)]) if lengths else new.live
+        new.n_live += len(lengths)
+        new.total_len += float(sum(lengths))
+        return new
+
+    def _postings(self, term):
+        tid = self.vocab.get(term)
+        if tid is None:
+            ids, tfs = np.zeros(0, np.uint32), np.zeros(0, np.uint16)
+        else:
+            ids, tfs = self.doc_ids[self.offsets[tid]:self.offsets[tid + 1]], self.tfs[self.offsets[tid]:self.offsets[tid + 1]]
+        extra = self.overlay.get(term)
+        if extra is not None:
+            ids, tfs = np.concatenate([ids, extra[0]]), np.concatenate([tfs, extra[1]])
+        if len(ids) and self.n_live < len(self.live):
+            keep = self.live[ids]
+            ids, tfs = ids[keep], tfs[keep]
+        return ids, tfs
+
+    def _idf(self, df):
+        return math.log(1.0 + (self.n_live - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k, allowed=None):
+        """(row ids, scores, coverage) of the k best rows, best first.
+        coverage is the share of the query's keyword weight (idf) each row
+        contains; keywords found nowhere still count against it, so a typo
+        lowers it. allowed: sorted row ids to restrict to (a role's rows)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        empty = (np.zeros(0, np.int64), np.zeros(0, np.float32), np.zeros(0, np.float32))
+        if not terms or not self.n_live or (allowed is not None and not len(allowed)):
+            return empty
+
+        avgdl = self.total_len / self.n_live
+        all_ids, all_scores, all_weights, query_weight = [], [], [], 0.0
+        for term in terms:
+            ids, tfs = self._postings(term)
+            idf = self._idf(len(ids))
+            query_weight += idf
+            if not len(ids):
+                continue
+            if allowed is not None:
+                slots = np.minimum(np.searchsorted(allowed, ids), len(allowed) - 1)
+                keep = allowed[slots] == ids
+                ids, tfs = ids[keep], tfs[keep]
+            tf = tfs.astype(np.float32)
+            norm = K1 * (1.0 - B + B * self.doc_len[ids] / avgdl)
+            all_ids.append(ids)
+            all_scores.append(idf * tf * (K1 + 1.0) / (tf + norm))
+            all_weights.append(np.full(len(ids), idf, dtype=np.float32))
+        if not all_ids or not sum(len(ids) for ids in all_ids):
+            return empty
+
+        ids = np.concatenate(all_ids)
+        if len(ids) * 2 < len(self.live):
+            # Few postings: merge them by sorting
+            rows, inverse = np.unique(ids, return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(all_scores))
+            coverage = np.bincount(inverse, weights=np.concatenate(all_weights))
+        else:
+            # Long postings (common keywords): one dense accumulator per row
+            # is cheaper than sorting them
+            scores = np.bincount(ids, weights=np.concatenate(all_scores), minlength=len(self.live))
+            coverage = np.bincount(ids, weights=np.concatenate(all_weights), minlength=len(self.live))
+            rows = np.flatnonzero(coverage)  # every idf is > 0, so matched rows are non-zero
+            scores, coverage = scores[rows], coverage[rows]
+        coverage /= query_weight
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores, coverage = rows[top], scores[top], coverage[top]
+        order = np.lexsort((rows, -scores))  # ties: lower row id first
+        return rows[order].astype(np.int64), scores[order].astype(np.float32), coverage[order].astype(np.float32)
@@ -0,0 +1,109 @@
+# backend/check_embedding_backend.py
+#
+# Accuracy / speed check of an embedding backend against the fp32 torch
+# reference. Both index the dataset's questions; then the app's own queries
+# ("interview for <role>", role-filtered) and lightly edited dataset
+# questions are searched with each. Reports top-1 agreement, recall@k of the
+# reference results, cosine similarity of the two embeddings per question,
+# single-query encode latency, index-build time and model RAM. Exits
+# non-zero if agreement is below the thresholds, so it can run in CI.
+#
+#   python check_embedding_backend.py --backend onnx-int8
+#   python check_embedding_backend.py --backend torch-int8 --threads 2 --dataset data/big.jsonl
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from bench_rag import rss_mb
+from embedding_backends import BACKENDS, EMBED_THREADS, load_encoder
+from rag_engine import RAGEngine
+
+
+def build_engine(model_name, backend, threads, dataset):
+    """(engine, MB of RSS the model added, index build seconds)."""
+    before = rss_mb()
+    model = load_encoder(model_name, backend, threads)
+    model_mb = rss_mb() - before
+    rag = RAGEngine(model_name, model=model, backend=backend, search_mode="vector")
+    rag.load_data(dataset)
+    start = time.perf_counter()
+    rag.build_index()
+    return rag, model_mb, time.perf_counter() - start
+
+
+def encode_ms(rag, queries, warmup=5):
+    for q in queries[:warmup]:
+        rag.model.encode([q])
+    start = time.perf_counter()
+    for q in queries:
+        rag.model.encode([q])  # one query per call, as /get-question does
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def check_queries(rag, n, seed=0):
+    """(query, role) pairs: every role's app query plus edited dataset questions."""
+    rng = random.Random(seed)
+    queries = [(f"interview for {role}", role) for role in rag.roles]
+    for i in rng.sample(range(len(rag.questions)), min(n, len(rag.questions))):
+        queries.append((rag.questions[i].replace("would you", "do you", 1).rstrip("?"), None))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare an embedding backend with fp32 torch")
+    parser.add_argument("--backend", choices=BACKENDS[1:], default="onnx-int8")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--dataset", help="JSON / JSONL file (default: the app's dataset)")
+    parser.add_argument("--threads", type=int, default=EMBED_THREADS, help="intra-op threads (0 = default)")
+    parser.add_argument("--queries", type=int, default=500, help="edited dataset questions to search")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--min-top1", type=float, default=0.95, help="required top-1 agreement")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="required recall@k")
+    args = parser.parse_args()
+
+    # Candidate first, so its RAM delta isn't hidden by torch already being loaded
+    cand, cand_mb, cand_build = build_engine(args.model, args.backend, args.threads, args.dataset)
+    ref, ref_mb, ref_build = build_engine(args.model, "torch", args.threads, args.dataset)
+
+    queries = check_queries(ref, args.queries)
+    texts = [q for q, _ in queries]
+    roles = [r for _, r in queries]
+    expected = ref.search_batch(texts, k=args.k, roles=roles)
+    got = cand.search_batch(texts, k=args.k, roles=roles)
+    top1 = np.mean([bool(e) and bool(g) and e[0]["question"] == g[0]["question"] for e, g in zip(expected, got)])
+    recall = np.mean([
+        len({r["question"] for r in e} & {r["question"] for r in g}) / len(e) for e, g in zip(expected, got) if e
+    ])
+
+    a, b = np.asarray(ref.embeddings), np.asarray(cand.embeddings)
+    cosine = (a * b).sum(axis=1) / np.maximum(np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1), 1e-12)
+
+    ref_ms = encode_ms(ref, texts)
+    cand_ms = encode_ms(cand, texts)
+
+    print(f"{len(ref.questions)} questions, {len(queries)} queries (k={args.k})")
+    print(f"{'backend':<12} {'encode ms':>10} {'build s':>8} {'model MB':>9}")
+    print(f"{'torch':<12} {ref_ms:>10.2f} {ref_build:>8.1f} {ref_mb:>9.0f}")
+    print(f"{args.backend:<12} {cand_ms:>10.2f} {cand_build:>8.1f} {cand_mb:>9.0f}")
+    print(f"speed-up {ref_ms / max(cand_ms, 1e-9):.2f}x per query, {ref_build / max(cand_build, 1e-9):.2f}x per index build")
+    print(f"top-1 agreement {top1:.3f}, recall@{args.k} {recall:.3f}, "
+          f"embedding cosine mean {cosine.mean():.4f} / min {cosine.min():.4f}")
+
+    failed = False
+    if top1 < args.min_top1:
+        print(f"❌ Top-1 agreement below {args.min_top1}")
+        failed = True
+    if recall < args.min_recall:
+        print(f"❌ Recall@{args.k} below {args.min_recall}")
+        failed = True
+    if not failed:
+        print(f"✅ {args.backend} retrieves like fp32 torch")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# backend/conftest.py
+#
+# Backend modules import each other as top-level modules (they run from
+# backend/), so put this directory on the path for tests/.
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# A manual script that loads the real embedding model, not a test
+collect_ignore = ["test_rag.py"]
+
+
+@pytest.fixture
+def write_jsonl(tmp_path):
+    """write_jsonl(rows) -> path of a JSONL dataset file."""
+    def write(rows, name="dataset.jsonl"):
+        path = tmp_path / name
+        path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+        return str(path)
+    return write
@@ -0,0 +1,96 @@
+# backend/content_store.py
+#
+# Pre-generated LLM content (flashcards) keyed by a hash of kind + normalized
+# input. batch_pipeline.py fills it offline; the API reads it before falling
+# back to live generation.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from background_writer import connect
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DB = os.getenv("CAREERMATE_CONTENT_DB", os.path.join(BASE_DIR, "data", "content.db"))
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def content_hash(kind: str, text: str) -> str:
+    return hashlib.sha1(f"{kind}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class ContentStore:
+    def __init__(self, db_path=CONTENT_DB):
+        self.db_path = db_path
+        self._db = connect(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS generated ("
+            " hash TEXT PRIMARY KEY, kind TEXT NOT NULL, input TEXT NOT NULL,"
+            " output TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def has(self, key: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM generated WHERE hash = ?", (key,)).fetchone() is not None
+
+    def get(self, kind: str, text: str):
+        return self.get_many(kind, [text]).get(text)
+
+    def get_many(self, kind: str, texts) -> dict:
+        """{text: output} for the texts that have stored content. Texts that
+        normalize alike ("PCA", "pca") share one entry and all get it."""
+        keys = {}
+        for t in texts:
+            keys.setdefault(content_hash(kind, t), []).append(t)
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT hash, output FROM generated WHERE hash IN ({','.join('?' * len(keys))})",
+                list(keys),
+            ).fetchall()
+        found = {}
+        for key, output in rows:
+            for t in keys[key]:
+                found[t] = json.loads(output)  # one copy each, so callers can't alias
+        return found
+
+    def put(self, kind: str, text: str, output):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO generated (hash, kind, input, output, created_at) VALUES (?, ?, ?, ?, ?)",
+                (content_hash(kind, text), kind, text, json.dumps(output), time.time()),
+            )
+
+    def iter_kind(self, kind: str):
+        """(input, output) rows of one kind, for exports."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT input, output FROM generated WHERE kind = ? ORDER BY created_at", (kind,)
+            ).fetchall()
+        for text, output in rows:
+            yield text, json.loads(output)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT kind, COUNT(*) FROM generated GROUP BY kind").fetchall()
+        return dict(rows)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_content_store() -> ContentStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContentStore()
+    return _store
@@ -0,0 +1,89 @@
+# backend/curation_log.py
+#
+# Questions pushed through the admin API are applied to the live RAGEngine
+# and appended here, one JSON op per line. On startup the log is replayed
+# on top of the dataset (and its cached index), so curated content survives
+# restarts without re-embedding the whole corpus.
+#
+#   {"op": "upsert", "role": ..., "question": ..., "answer": ...}
+#   {"op": "remove", "question": ..., "role": null}
+
+import json
+import os
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CURATION_LOG = os.getenv("CAREERMATE_CURATION_LOG", os.path.join(BASE_DIR, "data", "curated_items.jsonl"))
+
+
+class CurationLog:
+    def __init__(self, path=CURATION_LOG):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, ops):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for op in ops:
+                    f.write(json.dumps(op, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write; everything before it is intact
+                    print(f"[⚠️ Curation] Skipping unreadable line {n} in {self.path}")
+
+    def replay(self, rag) -> int:
+        """Apply every logged op to rag in order; consecutive upserts (and
+        removes for the same role) go in as one batch. Returns ops applied."""
+        applied = 0
+        batch, batch_key = [], None
+
+        def flush():
+            if batch_key is None:
+                return
+            if batch_key[0] == "upsert":
+                rag.upsert(batch)
+            else:
+                rag.remove_items(batch, role=batch_key[1])
+
+        for op in self.read():
+            kind = op.get("op")
+            if kind == "upsert":
+                key, item = ("upsert",), op
+            elif kind == "remove":
+                key, item = ("remove", op.get("role")), op.get("question", "")
+            else:
+                continue
+            if key != batch_key:
+                flush()
+                batch, batch_key = [], key
+            batch.append(item)
+            applied += 1
+        flush()
+        if applied:
+            print(f"[🗂️ Curation] Replayed {applied} curated ops from {self.path}")
+        return applied
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_curation_log() -> CurationLog:
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = CurationLog()
+    return _log
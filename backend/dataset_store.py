@@ -0,0 +1,265 @@
+# backend/dataset_store.py
+#
+# One in-memory copy of data/careermate_full_dataset.json shared by the RAG
+# engine, the study planner and the AI tutor. The file is parsed once into a
+# read-only Dataset snapshot; a background watcher re-parses it when its
+# mtime changes and swaps the snapshot in, so handlers never touch disk.
+# Row texts live in TextStore buffers (about a byte per character) rather
+# than a Python string per row, and RAGEngine indexes them in place.
+
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+
+from text_store import TextStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "data", "careermate_full_dataset.json")
+RELOAD_INTERVAL = float(os.getenv("CAREERMATE_DATASET_RELOAD_INTERVAL", "2"))
+
+
+class Dataset:
+    """Immutable snapshot: parallel per-row arrays plus per-role row ids."""
+
+    def __init__(self, path, mtime, version, rows):
+        self.path = path
+        self.mtime = mtime
+        self.version = version
+        self.roles = []                   # interned role names
+        self.questions = TextStore()
+        self.answers = TextStore()        # empty when the dataset has no answer
+        self.questions_lower = TextStore()  # stripped + lowercased, for matching
+        self.role_index = array("I")      # row -> position in self.roles
+        self._rows_by_role = {}           # role -> array of row ids
+
+        role_pos = {}
+        for role, question, answer in rows:
+            role = sys.intern(role)
+            if role not in role_pos:
+                role_pos[role] = len(self.roles)
+                self.roles.append(role)
+                self._rows_by_role[role] = array("I")
+            self._rows_by_role[role].append(len(self.questions))
+            self.role_index.append(role_pos[role])
+            self.questions.append(question)
+            self.answers.append(answer or "")
+            self.questions_lower.append(question.strip().lower())
+
+    def __len__(self):
+        return len(self.questions)
+
+    def role_of(self, row):
+        return self.roles[self.role_index[row]]
+
+    def answer(self, row):
+        return self.answers[row] or None
+
+    def role_rows(self, role):
+        """Row ids for an exact role name, or None if the role is unknown."""
+        return self._rows_by_role.get(role)
+
+    def iter_rows(self):
+        """(role, question, answer) in file order."""
+        for row in range(len(self.questions)):
+            yield self.role_of(row), self.questions[row], self.answer(row)
+
+
+def parse_dataset(data):
+    """Yield (role, question, answer) from either dataset layout."""
+    if isinstance(data, list):
+        # Flat list format
+        for item in data:
+            yield from _flat_row(item)
+    else:
+        # Grouped by role
+        for role, qas in data.items():
+            for qa in qas:
+                yield from _grouped_row(role, qa)
+
+
+def _flat_row(item):
+    question = item.get("interview_question")
+    if question:
+        yield item.get("industry", "Unknown Role"), question, item.get("sample_response") or None
+
+
+def _grouped_row(role, qa):
+    if qa.get("question"):
+        yield role, qa["question"], qa.get("answer") or None
+
+
+def _jsonl_row(item):
+    # One row per line, with either layout's field names
+    question = item.get("question") or item.get("interview_question")
+    if question:
+        role = item.get("role") or item.get("industry") or "Unknown Role"
+        yield role, question, item.get("answer") or item.get("sample_response") or None
+
+
+class _JsonStream:
+    """Minimal pull parser over a JSON file: container punctuation is read by
+    hand and each element is decoded with raw_decode from a sliding buffer,
+    so only one element (plus a read chunk) is in memory at a time."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, self.pos = self.decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                # Element cut off by the end of the buffer: read more and retry
+                if not self._fill():
+                    raise
+
+    def array(self):
+        """Elements of the array starting here, one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+    def object_items(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_dataset_file(path, chunk_size=1 << 20):
+    """Stream (role, question, answer) rows from a dataset file without loading
+    it whole: JSONL (one row object per line), the flat list layout or the
+    grouped-by-role layout."""
+    with open(path, "r", encoding="utf-8") as f:
+        # A JSONL file's first line is a complete row; a (minified) JSON
+        # document's first line may parse too, but it isn't a row. Only a
+        # bounded prefix is read, in case the document is a single line.
+        first = f.readline(chunk_size)
+        try:
+            head = json.loads(first)
+        except ValueError:
+            head = None
+        is_row = isinstance(head, dict) and ("question" in head or "interview_question" in head)
+        if is_row or path.endswith((".jsonl", ".ndjson")):
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield from _jsonl_row(json.loads(line))
+            return
+
+        f.seek(0)
+        stream = _JsonStream(f, chunk_size)
+        if stream.peek() == "[":
+            for item in stream.array():
+                yield from _flat_row(item)
+        else:
+            # Grouped: each role's list is consumed before the next key is read
+            for role in stream.object_items():
+                for qa in stream.array():
+                    yield from _grouped_row(role, qa)
+
+
+def load_dataset_file(path, version=1):
+    mtime = os.path.getmtime(path)
+    return Dataset(path, mtime, version, iter_dataset_file(path))
+
+
+class DatasetStore:
+    def __init__(self, path=DATASET_PATH, reload_interval=RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._dataset = load_dataset_file(path)
+        self._listeners = []
+        if reload_interval > 0:
+            threading.Thread(target=self._watch, name="dataset-watcher", daemon=True).start()
+
+    def get(self) -> Dataset:
+        return self._dataset
+
+    def on_reload(self, callback):
+        """Call callback(dataset) after every hot reload."""
+        self._listeners.append(callback)
+
+    def reload(self):
+        current = self._dataset
+        fresh = load_dataset_file(self.path, current.version + 1)
+        self._dataset = fresh  # atomic swap; readers keep their old snapshot
+        print(f"[🔄 Dataset] Reloaded {self.path} ({len(fresh)} questions, v{fresh.version})")
+        for callback in self._listeners:
+            try:
+                callback(fresh)
+            except Exception as e:
+                print(f"[⚠️ Dataset] Reload listener failed: {e}")
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                if os.path.getmtime(self.path) != self._dataset.mtime:
+                    self.reload()
+            except (OSError, ValueError) as e:
+                # Missing or half-written file: keep serving the last good copy
+                print(f"[⚠️ Dataset] Reload skipped: {e}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DATASET_PATH) -> DatasetStore:
+    path = os.path.abspath(path)
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = DatasetStore(path)
+    return store
+
+
+def get_dataset(path=DATASET_PATH) -> Dataset:
+    return get_store(path).get()
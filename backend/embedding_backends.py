@@ -0,0 +1,93 @@
+# backend/embedding_backends.py
+#
+# Selectable CPU backends for the sentence-embedding model. All of them
+# return a SentenceTransformer, so RAGEngine calls encode() the same way:
+#   • torch       fp32 PyTorch (reference)
+#   • torch-int8  PyTorch with Linear layers dynamically quantized to int8
+#   • onnx        ONNX Runtime, fp32 graph
+#   • onnx-int8   ONNX Runtime, weights dynamically quantized to int8 for
+#                 this CPU's instruction set (avx2 / avx512 / avx512_vnni / arm64)
+# ONNX exports are written once under CAREERMATE_ONNX_DIR and reused.
+# Embeddings differ slightly between backends, so RAGEngine keys its index
+# cache by backend; check_embedding_backend.py compares retrieval with fp32.
+#
+# The ONNX backends need sentence-transformers >= 3.2 with the "onnx" extra
+# (optimum + onnxruntime): pip install -r requirements-onnx.txt
+
+import os
+import platform
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+EMBED_BACKEND = os.getenv("CAREERMATE_EMBED_BACKEND", "torch")
+# Intra-op threads for the embedding model (0 = library default). For the
+# torch backends this is process-wide, so it also applies to BERTScore.
+EMBED_THREADS = int(os.getenv("CAREERMATE_EMBED_THREADS", "0"))
+ONNX_DIR = os.getenv("CAREERMATE_ONNX_DIR", os.path.join(BASE_DIR, "data", "models"))
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    return backend
+
+
+def quantization_target():
+    """Dynamic-quantization preset for this CPU, strongest first."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            flags = next((line.split(":", 1)[1].split() for line in f if line.startswith("flags")), [])
+    except OSError:
+        flags = []
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+
+def load_encoder(model_name, backend=EMBED_BACKEND, threads=EMBED_THREADS, onnx_dir=ONNX_DIR):
+    """SentenceTransformer for model_name on the given backend (CPU)."""
+    check_backend(backend)
+    # Imported here: pulls in torch, which shouldn't slow down importing the app
+    from sentence_transformers import SentenceTransformer
+
+    if backend.startswith("torch"):
+        import torch
+
+        if threads:
+            torch.set_num_threads(threads)
+        model = SentenceTransformer(model_name, device="cpu")
+        if backend == "torch-int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+    model_kwargs = {"provider": "CPUExecutionProvider", "session_options": options}
+
+    export_dir = os.path.join(onnx_dir, model_name.replace("/", "__") + "-onnx")
+    if not os.path.exists(os.path.join(export_dir, "onnx", "model.onnx")):
+        # First use: export the fp32 graph once instead of on every start
+        print(f"[🧠 Embeddings] Exporting {model_name} to ONNX in {export_dir}")
+        SentenceTransformer(model_name, device="cpu", backend="onnx").save_pretrained(export_dir)
+
+    if backend == "onnx-int8":
+        target = quantization_target()
+        file_name = f"onnx/model_int8_{target}.onnx"
+        if not os.path.exists(os.path.join(export_dir, file_name)):
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+
+            print(f"[🧠 Embeddings] Quantizing {model_name} to int8 ({target})")
+            export_dynamic_quantized_onnx_model(
+                SentenceTransformer(export_dir, device="cpu", backend="onnx"),
+                quantization_config=target, model_name_or_path=export_dir, file_suffix=f"int8_{target}",
+            )
+        model_kwargs["file_name"] = file_name
+
+    return SentenceTransformer(export_dir, device="cpu", backend="onnx", model_kwargs=model_kwargs)
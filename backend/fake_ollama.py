@@ -0,0 +1,112 @@
+# backend/fake_ollama.py
+#
+# Minimal stand-in for Ollama's /api/generate, for exercising llm_client and
+# the LLM-backed endpoints without a model. Supports "stream": true (NDJSON).
+#
+#   python fake_ollama.py --port 11434 --delay-ms 200
+#   OLLAMA_URL=http://127.0.0.1:11434 uvicorn main:app
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_completion(prompt: str) -> str:
+    if "multiple-choice" in prompt.lower():
+        return json.dumps([
+            {"question": f"Sample question #{random.randint(1, 10**6)}?",
+             "options": ["Option A", "Option B", "Option C", "Option D"], "answer": "Option B"}
+            for _ in range(5)
+        ])
+    if "flashcard" in prompt.lower():
+        topic = prompt.split("'")[1] if "'" in prompt else "this topic"
+        return (f"Question: What is {topic}?\n"
+                f"Answer: {topic} is a core concept; know its definition, trade-offs and typical use cases.")
+    if "interview question" in prompt.lower():
+        return f"How would you design a system to handle case #{random.randint(1, 10**6)} at scale?"
+    return ("In my last project I owned the data pipeline, profiled the bottlenecks, "
+            "introduced caching and batching, and cut p95 latency by 40% while keeping accuracy stable.")
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    delay = 0.0         # seconds per completion
+    failure_rate = 0.0  # fraction of requests answered with HTTP 503
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/api/generate":
+            return self._send_json(404, {"error": "not found"})
+        if random.random() < self.failure_rate:
+            return self._send_json(503, {"error": "overloaded"})
+
+        text = fake_completion(request.get("prompt", ""))
+        tokens = text.split(" ")
+        base = {"model": request.get("model", "fake"), "prompt_eval_count": len(request.get("prompt", "").split())}
+
+        if not request.get("stream", True):
+            time.sleep(self.delay)
+            return self._send_json(200, {**base, "response": text, "done": True, "eval_count": len(tokens)})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, token in enumerate(tokens):
+                time.sleep(self.delay / len(tokens))
+                piece = token if i == 0 else " " + token
+                self._write_chunk(json.dumps({**base, "response": piece, "done": False}) + "\n")
+            self._write_chunk(json.dumps({**base, "response": "", "done": True, "eval_count": len(tokens)}) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away mid-stream
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_fake_ollama(host="127.0.0.1", port=0, delay_ms=0.0, failure_rate=0.0):
+    """Start the fake server on a background thread; returns (server, base_url)."""
+    handler = type("Handler", (FakeOllamaHandler,), {"delay": delay_ms / 1000.0, "failure_rate": failure_rate})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for local testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_fake_ollama(args.host, args.port, args.delay_ms, args.failure_rate)
+    print(f"🦙 Fake Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
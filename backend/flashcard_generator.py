@@ -1,7 +1,15 @@
 from typing import List
-import requests
+import asyncio
+import os
 import re
 
+from content_store import get_content_store
+from llm_client import get_llm_client
+from metrics import FLASHCARD_FALLBACKS, cache_samples, register_collector
+
+# Max LLM generations in flight for one flashcard request
+FLASHCARD_CONCURRENCY = int(os.getenv("CAREERMATE_FLASHCARD_CONCURRENCY", "4"))
+
 
 def generate_flashcard_prompt(tag: str) -> str:
     return f"""Create a single high-quality flashcard for the topic: '{tag}'.
@@ -12,16 +20,7 @@ Answer: [A clear, concise explanation with definition, importance, or usage.]"""
 
 def call_ollama(prompt: str, model: str = "llama2:7b"):
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": model, "prompt": prompt, "stream": False}
-        )
-        data = response.json()
-        if "response" in data:
-            return data["response"]
-        else:
-            print(f"[⚠️ Ollama Error] Response format unexpected: {data}")
-            raise ValueError("Missing 'response' in Ollama output")
+        return get_llm_client().generate_sync(prompt, model=model)
     except Exception as e:
         print(f"[🔥 Ollama Exception] {e}")
         raise
@@ -48,6 +47,73 @@ def generate_flashcards(tags: List[str]) -> List[dict]:
     return cards
 
 
+# Parallel mode: cards pre-generated by batch_pipeline.py are served from the
+# content store; the other tags fan out to the LLM with a concurrency cap. A
+# failed tag gets its static card instead of failing the batch, and order is
+# preserved
+
+async def generate_flashcard(tag: str, model: str = "llama2:7b") -> dict:
+    try:
+        raw = await get_llm_client().generate(generate_flashcard_prompt(tag), model=model)
+        return parse_flashcard(raw)
+    except Exception as e:
+        print(f"[❌ Flashcard Gen Failed for '{tag}', using template] {e}")
+        FLASHCARD_FALLBACKS.inc(reason="llm_error")
+        return generate_flashcards_from_tags([tag])[0]
+
+
+# Pre-generated card lookups, exported by /metrics (only touched on the event loop)
+store_stats = {"hits": 0, "misses": 0}
+register_collector(lambda: cache_samples("flashcard_store", store_stats))
+
+
+async def precomputed_flashcards(tags: List[str]) -> dict:
+    try:
+        stored = await asyncio.to_thread(get_content_store().get_many, "flashcard", tags)
+    except Exception as e:
+        print(f"[⚠️ Content Store Unavailable] {e}")
+        stored = {}
+    store_stats["hits"] += sum(tag in stored for tag in set(tags))
+    store_stats["misses"] += sum(tag not in stored for tag in set(tags))
+    return stored
+
+
+async def generate_flashcards_parallel(tags: List[str], concurrency: int = FLASHCARD_CONCURRENCY) -> List[dict]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stored = await precomputed_flashcards(tags)
+
+    async def bounded(tag):
+        if tag in stored:
+            return stored[tag]
+        async with semaphore:
+            return await generate_flashcard(tag)
+
+    return list(await asyncio.gather(*(bounded(tag) for tag in tags)))
+
+
+async def iter_flashcards_as_completed(tags: List[str], concurrency: int = FLASHCARD_CONCURRENCY):
+    """Yield (index, tag, card) as each card finishes, for streaming responses.
+
+    Closing the generator early cancels the generations still in flight.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stored = await precomputed_flashcards(tags)
+
+    async def bounded(index, tag):
+        if tag in stored:
+            return index, tag, stored[tag]
+        async with semaphore:
+            return index, tag, await generate_flashcard(tag)
+
+    tasks = [asyncio.create_task(bounded(i, tag)) for i, tag in enumerate(tags)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 # Fallback: static templates for development or offline mode
 
 def generate_flashcards_from_tags(tags: List[str]) -> List[dict]:
@@ -1,31 +1,100 @@
-from bert_score import score as bert_score
-import requests
+from bert_scorer import get_scorer
+from reference_store import ReferenceStore
+from llm_client import get_llm_client, LLMError
+from fastapi.concurrency import run_in_threadpool
+from inference_executor import get_inference_executor
+from metrics import register_collector
 import random
+import threading
+
+FALLBACK_REFERENCE = "I developed a machine learning model to improve customer retention by identifying high-risk churn users."
+
+def reference_prompt(question: str) -> str:
+    return f"Give a strong sample interview answer for:\n{question}"
+
+def request_reference_answer(question: str) -> str:
+    # Raw LLM call; raises on failure so errors are never cached as answers
+    return get_llm_client().generate_sync(reference_prompt(question), model="mistral").strip()
+
+_reference_store = None
+_reference_store_lock = threading.Lock()
+
+def get_reference_store() -> ReferenceStore:
+    global _reference_store
+    if _reference_store is None:
+        with _reference_store_lock:
+            if _reference_store is None:
+                _reference_store = ReferenceStore(request_reference_answer)
+    return _reference_store
+
+def _collect_metrics():
+    if _reference_store is None:
+        return []
+    return [("careermate_reference_answers_total", "counter", "Reference answers served, by source",
+             [({"source": source}, n) for source, n in _reference_store.hits.items()])]
+
+register_collector(_collect_metrics)
 
 def generate_reference_answer(question: str) -> str:
-    prompt = f"Give a strong sample interview answer for:\n{question}"
+    # Dataset answer -> cached LLM answer -> fresh LLM answer (then cached)
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "mistral", "prompt": prompt, "stream": False}
-        )
-        return response.json()["response"].strip()
+        return get_reference_store().get(question)
     except Exception as e:
-        return "I developed a machine learning model to improve customer retention by identifying high-risk churn users."
+        return FALLBACK_REFERENCE
 
-def generate_feedback(question: str, answer: str) -> str:
-    reference = generate_reference_answer(question)
+async def stream_reference_answer(question: str):
+    # Streaming variant: a known reference comes back in one piece, a new one
+    # is forwarded token by token from the LLM and cached once complete
+    store = get_reference_store()
+    known = await run_in_threadpool(store.lookup, question)
+    if known is not None:
+        yield known
+        return
+
+    parts = []
+    try:
+        async for piece in get_llm_client().stream(reference_prompt(question), model="mistral"):
+            parts.append(piece)
+            yield piece
+    except LLMError as e:
+        print(f"[⚠️ Reference Stream Failed] {e}")
+        if not parts:
+            yield FALLBACK_REFERENCE
+        return
+    await run_in_threadpool(store.put, question, "".join(parts).strip())
 
+def precheck_answer(answer: str):
+    # Answers rejected here are never scored (and need no reference answer)
     if not answer.strip():
         return "❌ You didn’t provide an answer. Try to write something!"
     elif len(answer.split()) < 20:
         return "⚠️ Your answer is too short. Try to elaborate with examples, tools used, or the outcome."
     elif any(phrase in answer.lower() for phrase in ["i don't know", "not sure", "can't say"]):
         return "⚠️ Avoid uncertainty. Interviewers expect confident, experience-based responses."
+    return None
+
+def generate_feedback(question: str, answer: str) -> str:
+    rejected = precheck_answer(answer)
+    if rejected:
+        return rejected
+
+    # Only answers that will actually be scored need a reference
+    reference = generate_reference_answer(question)
+    return score_feedback(answer, reference)
+
+async def generate_feedback_async(question: str, answer: str) -> str:
+    # Reference lookup/LLM call waits in the regular threadpool; only the
+    # BERTScore pass takes an inference slot (may raise InferenceOverloaded)
+    rejected = precheck_answer(answer)
+    if rejected:
+        return rejected
+
+    reference = await run_in_threadpool(generate_reference_answer, question)
+    return await get_inference_executor().run(score_feedback, answer, reference)
 
+def score_feedback(answer: str, reference: str) -> str:
     try:
-        P, R, F1 = bert_score([answer], [reference], lang="en", verbose=False, device="cpu")
-        f1, p, r = F1.item(), P.item(), R.item()
+        p, r, f1 = get_scorer().score(answer, reference)
 
         # 🎯 Intelligent coaching tips
         tips = [
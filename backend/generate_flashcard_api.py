@@ -1,25 +1,35 @@
 from fastapi import APIRouter, Request, HTTPException
-from flashcard_generator import generate_flashcards, generate_flashcards_from_tags
+from fastapi.responses import StreamingResponse
+from flashcard_generator import (
+    generate_flashcards_parallel, generate_flashcards_from_tags, iter_flashcards_as_completed
+)
+from metrics import FLASHCARD_FALLBACKS
+import json
 
 router = APIRouter()
 
+async def _read_tags(request: Request):
+    body = await request.json()
+    tags = body.get("topic_tags")
+
+    # Validate input
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise HTTPException(status_code=400, detail="`topic_tags` must be a list of strings.")
+    return tags
+
 @router.post("/generate-flashcards")
 async def generate_flashcards_endpoint(request: Request):
     try:
-        # Parse JSON body
-        body = await request.json()
-        tags = body.get("topic_tags")
-
-        # Validate input
-        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
-            raise HTTPException(status_code=400, detail="`topic_tags` must be a list of strings.")
+        # Parse + validate JSON body
+        tags = await _read_tags(request)
 
         try:
-            # 🧠 Try generating with Ollama
-            cards = generate_flashcards(tags)
+            # 🧠 Try generating with Ollama (tags in parallel, off the event loop)
+            cards = await generate_flashcards_parallel(tags)
         except Exception as e:
             print(f"[⚠️ Ollama Error Triggered Fallback] {e}")
             # ⛑️ Fallback to static generator
+            FLASHCARD_FALLBACKS.inc(len(tags), reason="batch_error")
             cards = generate_flashcards_from_tags(tags)
 
         return {"flashcards": cards}
@@ -27,3 +37,17 @@ async def generate_flashcards_endpoint(request: Request):
     except Exception as e:
         print(f"[🔥 API Error] {e}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+# Streaming variant: NDJSON, one line per flashcard as soon as it is ready
+# ({"index", "tag", "question", "answer"}), so the first card shows up after
+# one generation instead of all of them. A client disconnect cancels the rest.
+@router.post("/generate-flashcards/stream")
+async def stream_flashcards_endpoint(request: Request):
+    tags = await _read_tags(request)
+
+    async def lines():
+        async for index, tag, card in iter_flashcards_as_completed(tags):
+            yield json.dumps({"index": index, "tag": tag, **card}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
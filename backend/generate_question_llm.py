@@ -1,34 +1,29 @@
 # File: backend/generate_question_llm.py
 
-import requests
-import random
+from llm_client import get_llm_client
 
-# Store previously generated questions in memory (temp for this session)
-past_questions = set()
+FALLBACK_TEMPLATES = (
+    "What is the most complex challenge you faced as a {role}, and how did you solve it?",
+    "What would you improve in your previous {role} role?",
+)
 
-def generate_dynamic_question(role: str, model: str = "mistral", max_attempts: int = 5) -> str:
-    prompt_base = (
+def question_prompt(role: str) -> str:
+    return (
         f"Create a unique, intellectually challenging interview question for a {role}. "
         f"It should assess critical thinking, creativity, or domain-specific depth. "
         f"Do not use generic phrases like 'describe a time...'."
     )
 
-    for attempt in range(max_attempts):
-        try:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={"model": model, "prompt": prompt_base, "stream": False},
-                timeout=15
-            )
-            data = response.json()
-            question = data.get("response", "").strip()
+def generate_dynamic_question(role: str, model: str = "mistral") -> str:
+    # One raw LLM call; novelty checks and retries live in question_pool
+    return get_llm_client().generate_sync(question_prompt(role), model=model, timeout=15).strip()
 
-            if question and question not in past_questions:
-                past_questions.add(question)
-                return question
-        except Exception as e:
-            print(f"[⚠️ LLM Gen Error Attempt {attempt+1}] {e}")
+def fallback_questions(role: str) -> list:
+    # Used when the LLM fails or only produces repeats
+    return [template.format(role=role) for template in FALLBACK_TEMPLATES]
 
-    # Fallback if repeated or failed
-    fallback = f"What is the most complex challenge you faced as a {role}, and how did you solve it?"
-    return fallback if fallback not in past_questions else f"What would you improve in your previous {role} role?"
\ No newline at end of file
+async def stream_dynamic_question(role: str, model: str = "mistral"):
+    # Streaming variant: tokens are forwarded as they arrive, so there is no
+    # retry-on-repeat here; the finished question is still recorded as seen
+    async for piece in get_llm_client().stream(question_prompt(role), model=model, timeout=15):
+        yield piece
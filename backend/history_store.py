@@ -0,0 +1,232 @@
+# backend/history_store.py
+#
+# Saved test results, indexed in the session database instead of one
+# sessions/test_<date>.json file per result. Each result is one row in
+# test_results plus one row per answered question in test_answers (role and
+# date copied in), so listing, filtering and the per-question aggregates used
+# by /test-history and the study planner are index scans, not directory walks.
+#
+#   python history_store.py import sessions/    # one-off import of old test_*.json files
+
+import argparse
+import glob
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from background_writer import connect
+from session_store import SESSION_DB, get_writer
+
+WEAK_F1 = 0.7  # same threshold as study_plan_generator.extract_weak_topics
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS test_results ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, result_id TEXT NOT NULL UNIQUE, role TEXT,"
+    " taken_at REAL NOT NULL, avg_f1 REAL, payload TEXT NOT NULL, created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_test_results_taken ON test_results(taken_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_test_results_role ON test_results(role, taken_at, id)",
+    "CREATE TABLE IF NOT EXISTS test_answers ("
+    " result_id TEXT NOT NULL, role TEXT, taken_at REAL NOT NULL,"
+    " question_key TEXT NOT NULL, question TEXT NOT NULL, f1 REAL, precision REAL, recall REAL)",
+    "CREATE INDEX IF NOT EXISTS idx_test_answers_question ON test_answers(question_key)",
+    "CREATE INDEX IF NOT EXISTS idx_test_answers_role ON test_answers(role, taken_at)",
+    "CREATE INDEX IF NOT EXISTS idx_test_answers_taken ON test_answers(taken_at)",
+)
+
+
+def question_key(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def parse_date(value, end=False):
+    """ISO date/datetime -> epoch seconds (naive means UTC). With end=True a
+    bare date covers the whole day, so date_to=2025-07-01 includes that day."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if end and len(str(value).strip()) == 10:
+        parsed += timedelta(days=1)
+    return parsed.timestamp()
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class HistoryStore:
+    def __init__(self, db_path=SESSION_DB):
+        self.db_path = db_path
+        self.writer = get_writer(db_path)
+        self._db = connect(db_path)
+        self._lock = threading.Lock()
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+    # ─── Writes (queued, off the request path) ────────────────────────────────
+    def save(self, data: dict) -> str:
+        result_id = uuid.uuid4().hex
+        self.writer.submit_many(self._statements(result_id, data))
+        return result_id
+
+    def _statements(self, result_id, data):
+        try:
+            taken_at = parse_date(data.get("date")) or time.time()
+        except ValueError:
+            taken_at = time.time()
+        role = data.get("role") if isinstance(data.get("role"), str) else None
+        summary = data.get("summary") if isinstance(data.get("summary"), dict) else {}
+        answers = [q for q in data.get("questions") or [] if isinstance(q, dict) and isinstance(q.get("question"), str)]
+
+        avg_f1 = _number(summary.get("f1"))
+        if avg_f1 is None:
+            scores = [_number(q.get("f1")) for q in answers if _number(q.get("f1")) is not None]
+            avg_f1 = sum(scores) / len(scores) if scores else None
+
+        statements = [(
+            "INSERT INTO test_results (result_id, role, taken_at, avg_f1, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (result_id, role, taken_at, avg_f1, json.dumps(data), time.time()),
+        )]
+        for q in answers:
+            statements.append((
+                "INSERT INTO test_answers (result_id, role, taken_at, question_key, question, f1, precision, recall)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_id, role, taken_at, question_key(q["question"]), q["question"],
+                 _number(q.get("f1")), _number(q.get("precision")), _number(q.get("recall"))),
+            ))
+        return statements
+
+    # ─── Reads ─────────────────────────────────────────────────────────────────
+    def _query(self, sql, params):
+        # This worker's own queued results should be visible to its next read
+        if self.writer.busy():
+            self.writer.flush(timeout=2)
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(role, date_from, date_to):
+        clauses, params = [], []
+        if role:
+            clauses.append("role = ?")
+            params.append(role)
+        if date_from is not None:
+            clauses.append("taken_at >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("taken_at < ?")
+            params.append(date_to)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, role=None, date_from=None, date_to=None, limit=20, offset=0) -> dict:
+        """Newest first: {"total", "limit", "offset", "items": [saved payloads]}."""
+        where, params = self._where(role, date_from, date_to)
+        total = self._query(f"SELECT COUNT(*) FROM test_results{where}", params)[0][0]
+        rows = self._query(
+            f"SELECT result_id, payload FROM test_results{where} ORDER BY taken_at DESC, id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        items = [{"id": result_id, **json.loads(payload)} for result_id, payload in rows]
+        return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+    def question_stats(self, role=None, date_from=None, date_to=None, limit=50, max_f1=None) -> list:
+        """Per-question attempts and average F1, weakest first."""
+        where, params = self._where(role, date_from, date_to)
+        where += (" AND" if where else " WHERE") + " f1 IS NOT NULL"
+        having = ""
+        if max_f1 is not None:
+            having = " HAVING AVG(f1) < ?"
+            params = params + [max_f1]
+        rows = self._query(
+            f"SELECT MAX(question), COUNT(*), AVG(f1), MIN(f1), MAX(taken_at) FROM test_answers{where}"
+            f" GROUP BY question_key{having} ORDER BY AVG(f1) ASC, COUNT(*) DESC LIMIT ?",
+            params + [limit],
+        )
+        return [
+            {"question": question, "attempts": attempts, "avg_f1": round(avg, 4),
+             "min_f1": round(low, 4), "last_taken": last}
+            for question, attempts, avg, low, last in rows
+        ]
+
+    def weakest_topics(self, role=None, date_from=None, date_to=None, limit=20, threshold=WEAK_F1) -> list:
+        return self.question_stats(role, date_from, date_to, limit, max_f1=threshold)
+
+    def summary(self, role=None, date_from=None, date_to=None, limit=10) -> dict:
+        where, params = self._where(role, date_from, date_to)
+        tests, avg_f1 = self._query(f"SELECT COUNT(*), AVG(avg_f1) FROM test_results{where}", params)[0]
+        by_role = self._query(
+            f"SELECT role, COUNT(*), AVG(avg_f1) FROM test_results{where} GROUP BY role ORDER BY COUNT(*) DESC",
+            params,
+        )
+        return {
+            "tests": tests,
+            "avg_f1": round(avg_f1, 4) if avg_f1 is not None else None,
+            "by_role": [
+                {"role": r, "tests": n, "avg_f1": round(f, 4) if f is not None else None}
+                for r, n, f in by_role
+            ],
+            "weakest_topics": self.weakest_topics(role, date_from, date_to, limit),
+        }
+
+    def weak_score_data(self, role=None, date_from=None, date_to=None, limit=20) -> list:
+        """[{"question", "f1"}] in the shape extract_weak_topics expects."""
+        return [
+            {"question": item["question"], "f1": item["avg_f1"]}
+            for item in self.weakest_topics(role, date_from, date_to, limit)
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_test_history() -> HistoryStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore()
+    return _store
+
+
+def import_files(store: HistoryStore, directory):
+    """Load legacy sessions/test_*.json files into the store."""
+    imported = 0
+    for path in sorted(glob.glob(os.path.join(directory, "test_*.json"))):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[⚠️ Import Skipped] {path}: {e}")
+            continue
+        if isinstance(data, dict):
+            store.save(data)
+            imported += 1
+    store.writer.flush()
+    print(f"✅ Imported {imported} test results from {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test-history tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import old sessions/test_*.json files")
+    imp.add_argument("directory")
+    sub.add_parser("summary", help="show overall aggregates")
+    args = parser.parse_args()
+
+    store = get_test_history()
+    if args.command == "import":
+        import_files(store, args.directory)
+    else:
+        print(json.dumps(store.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
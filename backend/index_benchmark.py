@@ -0,0 +1,114 @@
+# backend/index_benchmark.py
+#
+# Recall-vs-latency report for the RAGEngine index backends, measured
+# against the exact flat index.
+#
+#   python index_benchmark.py --synthetic 200000          # clustered random vectors
+#   python index_benchmark.py --dataset data/careermate_full_dataset.json
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+import index_factory
+
+# (index_type, build params, list of query-time settings to sweep)
+DEFAULT_CONFIGS = [
+    ("ivf_flat", {}, [{"nprobe": 1}, {"nprobe": 8}, {"nprobe": 32}]),
+    ("ivf_pq", {"pq_m": 16}, [{"nprobe": 8}, {"nprobe": 32}]),
+    ("hnsw", {"hnsw_m": 32}, [{"ef_search": 16}, {"ef_search": 64}, {"ef_search": 128}]),
+]
+
+
+def synthetic_embeddings(n, dim=384, clusters=256, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype("float32")
+    points = centers[rng.integers(0, clusters, size=n)] + 0.3 * rng.normal(size=(n, dim)).astype("float32")
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def dataset_embeddings(path, model_name="all-MiniLM-L6-v2"):
+    from rag_engine import RAGEngine
+
+    rag = RAGEngine(model_name)
+    rag.load_data(path)
+    return np.array(rag.model.encode(list(rag.questions))).astype("float32")
+
+
+def index_size_mb(index):
+    return len(faiss.serialize_index(index)) / 1e6
+
+
+def timed_search(index, queries, k):
+    start = time.perf_counter()
+    _, ids = index.search(queries, k)
+    return ids, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def recall_at_k(ids, truth):
+    k = truth.shape[1]
+    hits = sum(len(set(row[row != -1]) & set(t)) for row, t in zip(ids, truth))
+    return hits / (len(truth) * k)
+
+
+def recall_report(embeddings, queries, k=10, configs=DEFAULT_CONFIGS):
+    """Build every configured backend and compare it with exact search."""
+    rows = []
+
+    start = time.perf_counter()
+    flat = index_factory.build_index(embeddings, "flat")
+    build_s = time.perf_counter() - start
+    truth, ms = timed_search(flat, queries, k)
+    rows.append({"index": "flat", "params": "", "build_s": build_s, "recall": 1.0,
+                 "ms_per_query": ms, "size_mb": index_size_mb(flat)})
+
+    for index_type, build_params, sweeps in configs:
+        start = time.perf_counter()
+        index = index_factory.build_index(embeddings, index_type, **build_params)
+        build_s = time.perf_counter() - start
+        size_mb = index_size_mb(index)
+        for search_params in sweeps:
+            index_factory.set_search_params(index, **search_params)
+            ids, ms = timed_search(index, queries, k)
+            params = ", ".join(f"{key}={value}" for key, value in {**build_params, **search_params}.items())
+            rows.append({"index": index_type, "params": params, "build_s": build_s,
+                         "recall": recall_at_k(ids, truth), "ms_per_query": ms, "size_mb": size_mb})
+    return rows
+
+
+def print_report(rows, k):
+    print(f"{'index':<10} {'params':<24} {'build s':>8} {f'recall@{k}':>10} {'ms/query':>9} {'size MB':>8}")
+    for r in rows:
+        print(f"{r['index']:<10} {r['params']:<24} {r['build_s']:>8.2f} {r['recall']:>10.3f} "
+              f"{r['ms_per_query']:>9.3f} {r['size_mb']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall-vs-latency report for RAGEngine index backends")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--synthetic", type=int, metavar="N", help="benchmark N clustered random vectors")
+    source.add_argument("--dataset", help="benchmark real MiniLM embeddings of a dataset file")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        embeddings = synthetic_embeddings(args.synthetic, args.dim)
+    else:
+        embeddings = dataset_embeddings(args.dataset)
+
+    # Queries are perturbed corpus rows, so every query has true neighbours
+    rng = np.random.default_rng(1)
+    picks = rng.choice(len(embeddings), min(args.queries, len(embeddings)), replace=False)
+    queries = embeddings[picks] + 0.05 * rng.normal(size=(len(picks), embeddings.shape[1])).astype("float32")
+    queries = np.ascontiguousarray(queries, dtype="float32")
+
+    k = min(args.k, len(embeddings))
+    print_report(recall_report(embeddings, queries, k), k)
+
+
+if __name__ == "__main__":
+    main()
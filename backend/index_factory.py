@@ -0,0 +1,105 @@
+# backend/index_factory.py
+
+import faiss
+import numpy as np
+
+# Supported RAGEngine index types. Anything else is passed to
+# faiss.index_factory verbatim (e.g. "IVF1024,SQ8").
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# FAISS warns below ~39 training points per IVF centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def default_nlist(n: int) -> int:
+    """Number of IVF cells for n vectors: ~4·√n, capped by the training size."""
+    return max(1, min(int(4 * np.sqrt(n)), n // MIN_POINTS_PER_CENTROID))
+
+
+def _pq_subquantizers(dim: int, m: int) -> int:
+    # PQ needs m to divide the vector dimension
+    m = max(1, min(m, dim))
+    while dim % m:
+        m -= 1
+    return m
+
+
+def factory_string(index_type: str, n: int, dim: int, nlist=None, pq_m=16, pq_nbits=8, hnsw_m=32) -> str:
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{hnsw_m}"
+    if index_type == "ivf_flat":
+        return f"IVF{nlist or default_nlist(n)},Flat"
+    if index_type == "ivf_pq":
+        return f"IVF{nlist or default_nlist(n)},PQ{_pq_subquantizers(dim, pq_m)}x{pq_nbits}"
+    return index_type
+
+
+def min_rows(index_type: str, nlist=None, pq_nbits=8) -> int:
+    """Smallest corpus that can train the given index type."""
+    if index_type == "ivf_flat":
+        return MIN_POINTS_PER_CENTROID * (nlist or 1)
+    if index_type == "ivf_pq":
+        return max(MIN_POINTS_PER_CENTROID * (nlist or 1), 2 ** pq_nbits)
+    return 0
+
+
+def build_index(embeddings, index_type="flat", nlist=None, pq_m=16, pq_nbits=8, hnsw_m=32,
+                ef_construction=200, train_size=50000, nprobe=None, ef_search=None, seed=0,
+                add_batch=65536, ids=None):
+    """Create, train (on a random sample) and fill a FAISS index.
+
+    Too-small corpora fall back to an exact flat index instead of training
+    a degenerate IVF/PQ quantizer. Vectors are added add_batch rows at a
+    time, so a memory-mapped matrix is never copied into RAM whole.
+
+    The index is ID-mapped, so rows can later be added with add_with_ids
+    and, except for HNSW, dropped with remove_ids. ids picks the rows of
+    embeddings to index, each under its row number (default: all rows).
+    """
+    ids = np.arange(len(embeddings), dtype="int64") if ids is None else np.asarray(ids, dtype="int64")
+    n, dim = len(ids), embeddings.shape[1]
+
+    if n < min_rows(index_type, nlist, pq_nbits):
+        print(f"[⚠️ Index] {n} rows is too few to train '{index_type}', using flat")
+        index_type = "flat"
+
+    index = faiss.index_factory(dim, factory_string(index_type, n, dim, nlist, pq_m, pq_nbits, hnsw_m))
+
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = ef_construction
+
+    if not index.is_trained:
+        rng = np.random.default_rng(seed)
+        sample = ids
+        if n > train_size:
+            sample = ids[np.sort(rng.choice(n, train_size, replace=False))]
+        index.train(np.ascontiguousarray(embeddings[sample], dtype="float32"))
+
+    # IVF stores ids natively; everything else gets an id map around it
+    if faiss.try_extract_index_ivf(index) is None:
+        index = faiss.IndexIDMap2(index)
+    for start in range(0, n, add_batch):
+        batch = ids[start:start + add_batch]
+        index.add_with_ids(np.ascontiguousarray(embeddings[batch], dtype="float32"), batch)
+    set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+    return index
+
+
+def unwrap(index):
+    """The index inside an IndexIDMap(2), or the index itself."""
+    if isinstance(index, faiss.IndexIDMap):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Apply query-time knobs; each one is ignored by index types it doesn't apply to."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if nprobe is not None and ivf is not None:
+        ivf.nprobe = min(int(nprobe), ivf.nlist)
+
+    inner = unwrap(index)
+    if ef_search is not None and isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = int(ef_search)
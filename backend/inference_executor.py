@@ -0,0 +1,134 @@
+# backend/inference_executor.py
+#
+# One bounded pool for CPU-heavy work (embedding search, BERTScore, fuzzy
+# topic matching), so async handlers never run it on the event loop and a
+# burst of scoring requests can't starve everything else. Work beyond the
+# queue limit is rejected up front with InferenceOverloaded, which main.py
+# turns into HTTP 503 + Retry-After.
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from metrics import register_collector
+
+INFERENCE_WORKERS = int(os.getenv("CAREERMATE_INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+INFERENCE_QUEUE = int(os.getenv("CAREERMATE_INFERENCE_QUEUE", "64"))
+
+
+class InferenceOverloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Thread pool with a cap on queued + running tasks.
+
+    Threads rather than processes: the models are process-wide singletons
+    and torch / faiss release the GIL while computing.
+    """
+
+    def __init__(self, workers=INFERENCE_WORKERS, max_pending=INFERENCE_QUEUE):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+        self.avg_seconds = 0.0  # moving average task time, for Retry-After
+
+    # ─── Admission ─────────────────────────────────────────────────────────────
+    def _acquire(self):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise InferenceOverloaded(self.retry_after())
+            self.pending += 1
+
+    def _release(self, seconds):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self.avg_seconds += (seconds - self.avg_seconds) * 0.1
+
+    def retry_after(self) -> int:
+        # Time to drain the current queue at the observed rate, at least 1s
+        return max(1, math.ceil(self.pending * self.avg_seconds / self.workers))
+
+    @contextmanager
+    def slot(self):
+        """Count work that runs elsewhere (e.g. the RAG search batcher) against
+        the same queue limit."""
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+
+    # ─── Execution ─────────────────────────────────────────────────────────────
+    def submit(self, fn, *args, **kwargs):
+        self._acquire()
+        started = []
+
+        def task():
+            started.append(time.perf_counter())
+            return fn(*args, **kwargs)
+
+        try:
+            future = self._pool.submit(task)
+        except BaseException:
+            self._release(0.0)
+            raise
+        # Released on completion or cancellation (a disconnected client's task
+        # that never started still frees its slot)
+        future.add_done_callback(
+            lambda _: self._release(time.perf_counter() - started[0] if started else 0.0)
+        )
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_task_s": round(self.avg_seconds, 4),
+            }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = InferenceExecutor()
+    return _executor
+
+
+def _collect_metrics():
+    if _executor is None:
+        return []
+    stats = _executor.stats()
+    return [
+        ("careermate_inference_pending", "gauge", "Inference tasks queued or running", [({}, stats["pending"])]),
+        ("careermate_inference_completed_total", "counter", "Inference tasks finished", [({}, stats["completed"])]),
+        ("careermate_inference_rejected_total", "counter", "Inference tasks rejected with 503", [({}, stats["rejected"])]),
+    ]
+
+register_collector(_collect_metrics)
@@ -1,22 +1,99 @@
 # File: backend/interview_api.py
 
-from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import uuid, re, json, os, random
+from typing import List, Optional
+import uuid, json, os, secrets, threading
 
 from rag_engine import RAGEngine
-from generate_feedback import generate_feedback
-from generate_question_llm import generate_dynamic_question  # LLM fallback
+from rag_batcher import SearchBatcher
+from generate_feedback import generate_feedback_async, precheck_answer, score_feedback, stream_reference_answer
+from generate_question_llm import (  # LLM fallback
+    generate_dynamic_question, stream_dynamic_question, fallback_questions
+)
+from question_pool import QuestionPool
+from llm_client import LLMError
+from session_store import get_session_store
+from history_store import get_test_history, parse_date
+from quiz_engine import QuizEngine
+from dataset_store import get_dataset, get_store
+from inference_executor import InferenceOverloaded, get_inference_executor
+from curation_log import get_curation_log
+from metrics import LLM_FALLBACKS, cache_samples, register_collector
 
 router = APIRouter()
 
-# ─── Initialize RAG ────────────────────────────────────────────────────────────
-rag = RAGEngine()
-rag.load_data("data/careermate_full_dataset.json")
-rag.build_index()
+# CPU-heavy work (search, scoring, test pools) is queued here, never run on the
+# event loop; a full queue raises InferenceOverloaded -> 503 (see main.py)
+inference = get_inference_executor()
 
-# In-memory session store
-SESSIONS: dict[str, dict] = {}
+# ─── Initialize RAG (lazily) ───────────────────────────────────────────────────
+# Loading the embedding model and index takes a while, so it happens on first
+# use or in main.py's startup warm-up, never at import
+_rag = None
+_search_batcher = None
+_rag_lock = threading.Lock()
+_curation_lock = threading.Lock()  # admin pushes vs. index swaps
+
+def _build_rag():
+    rag = RAGEngine(
+        cache_dir=os.path.join(os.path.dirname(__file__), "data", "index_cache"),
+        query_cache_size=int(os.getenv("CAREERMATE_RAG_QUERY_CACHE_SIZE", "1024")),
+        index_type=os.getenv("CAREERMATE_RAG_INDEX", "flat"),  # flat | ivf_flat | ivf_pq | hnsw
+        nprobe=int(os.getenv("CAREERMATE_RAG_NPROBE", "8")),
+        ef_search=int(os.getenv("CAREERMATE_RAG_EF_SEARCH", "64")),
+    )
+    rag.load_data()
+    rag.build_index()
+    return rag
+
+def _publish_rag(rag):
+    # Caller holds _curation_lock, so no admin push lands between the replay
+    # and the swap
+    global _rag, _search_batcher
+    # Questions pushed through the admin API since the dataset was built
+    get_curation_log().replay(rag)
+    _rag = rag
+    if _search_batcher is not None:
+        # The batcher reads .rag per batch, so queued searches just move over
+        _search_batcher.rag = rag
+        return
+    # Concurrent searches are coalesced into one encode + one index scan
+    _search_batcher = SearchBatcher(
+        rag,
+        max_batch_size=int(os.getenv("CAREERMATE_RAG_MAX_BATCH", "32")),
+        max_wait_ms=float(os.getenv("CAREERMATE_RAG_MAX_WAIT_MS", "5")),
+    )
+
+def get_rag() -> RAGEngine:
+    if _search_batcher is None:
+        with _rag_lock:
+            if _search_batcher is None:
+                rag = _build_rag()
+                with _curation_lock:
+                    _publish_rag(rag)
+    return _rag
+
+def rag_ready() -> bool:
+    return _search_batcher is not None
+
+async def search_async(query: str, k: int, role: str):
+    # Searches run on the batcher thread but hold an inference slot, so they
+    # share the executor's queue limit
+    with inference.slot():
+        # Builds the engine off the event loop if this is the very first search
+        if _search_batcher is None:
+            await run_in_threadpool(get_rag)
+        return await _search_batcher.search_async(query, k=k, role=role)
+
+# Pre-generated, de-duplicated LLM questions for roles the dataset lacks
+question_pool = QuestionPool(lambda texts: get_rag().embed(texts), generate_dynamic_question, fallback_questions)
+
+# Session store: bounded in-memory LRU or shared SQLite (CAREERMATE_SESSION_BACKEND)
+sessions = get_session_store()
+test_history = get_test_history()
 
 # ─── Request Models ─────────────────────────────────────────────────────────────
 class QuestionRequest(BaseModel):
@@ -29,49 +106,41 @@ class AnswerSubmission(BaseModel):
 
 # ─── 1) Get an interview question ───────────────────────────────────────────────
 @router.post("/get-question")
-def get_question(req: QuestionRequest):
+async def get_question(req: QuestionRequest):
     role = req.role
-    # Try RAG first
-    results = rag.search(f"interview for {role}", k=3)
-
-    # If RAG returns junk or empty, fall back to LLM
-    fallback = False
-    for r in results:
-        q = r["question"]
-        if "Profession" in q or "_26" in q:
-            fallback = True
-            break
-
-    if fallback or not results:
-        question_text = generate_dynamic_question(role)
+    # Try RAG first, restricted to this role's questions
+    results = await search_async(f"interview for {role}", k=3, role=role)
+
+    # Unknown role (no in-role questions) -> fall back to LLM
+    if not results:
+        LLM_FALLBACKS.inc(endpoint="/get-question")
+        question_text = await run_in_threadpool(question_pool.get, role)
         print(f"[⚠️ LLM Fallback] Generated question for '{role}': {question_text}")
     else:
         question_text = results[0]["question"]
 
     # Create new session
     session_id = str(uuid.uuid4())
-    SESSIONS[session_id] = {
-        "role": role,
-        "qa": [{"question": question_text}]
-    }
+    sessions.start(session_id, role, question_text)
 
     return {"session_id": session_id, "question": question_text}
 
 # ─── 2) Submit an answer ────────────────────────────────────────────────────────
 @router.post("/submit-answer")
 def submit_answer(data: AnswerSubmission):
-    session = SESSIONS.get(data.session_id)
+    session = sessions.get(data.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Store the candidate's answer
-    session["qa"][-1]["answer"] = data.answer
+    sessions.append(data.session_id, "answer", {"answer": data.answer})
     return {"message": "Answer saved. You can now call /get-feedback."}
 
 # ─── 3) Get feedback for the last answer ────────────────────────────────────────
 @router.get("/get-feedback")
-def get_feedback(session_id: str = Query(..., description="Session ID returned by /get-question")):
-    session = SESSIONS.get(session_id)
+async def get_feedback(session_id: str = Query(..., description="Session ID returned by /get-question")):
+    # A SQLite read; appends only queue for the background writer
+    session = await run_in_threadpool(sessions.get, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -79,48 +148,244 @@ def get_feedback(session_id: str = Query(..., description="Session ID returned b
     question = last["question"]
     answer = last.get("answer", "")
 
-    feedback = generate_feedback(question, answer)
-    last["feedback"] = feedback
-
-    # Persist session to disk
-    sessions_dir = os.path.join(os.path.dirname(__file__), "sessions")
-    os.makedirs(sessions_dir, exist_ok=True)
-    safe = re.sub(r"[^0-9A-Za-z_-]", "_", session_id)
-    with open(os.path.join(sessions_dir, f"{safe}.json"), "w") as f:
-        json.dump(session, f, indent=2)
+    feedback = await generate_feedback_async(question, answer)
+    sessions.append(session_id, "feedback", {"feedback": feedback})
 
     return {"feedback": feedback}
 
 # ─── 4) Generate a “test” of 5 random Q&A pairs ─────────────────────────────────
+# Pool per role: its 20 nearest in-role neighbors from RAG, searched once
+TEST_POOL_SIZE = 20
+TEST_LENGTH = 5
+
+def _test_pool(results):
+    return [{"question": qa["question"], "answer": qa["answer"]} for qa in results]
+
+test_engine = QuizEngine(
+    lambda role: _test_pool(get_rag().search(f"interview for {role}", k=TEST_POOL_SIZE, role=role))
+)
+
+def warm_test_pools():
+    # Every dataset role in one batched search, plus its seedless test variants
+    roles = get_dataset().roles
+    results = get_rag().search_batch([f"interview for {r}" for r in roles], k=TEST_POOL_SIZE, roles=roles)
+    test_engine.warm({role: _test_pool(hits) for role, hits in zip(roles, results)}, k=TEST_LENGTH)
+
+# ─── Dataset hot reload ─────────────────────────────────────────────────────────
+# Runs on the dataset watcher thread. The new index is built next to the old
+# one (searches keep using it meanwhile) and swapped in; then test pools and
+# LLM question pools for roles the new dataset covers are dropped.
+def _on_dataset_reload(dataset):
+    with _rag_lock:
+        if _search_batcher is None:
+            return  # not built yet; the first search loads the new snapshot
+        rag = _build_rag()
+        with _curation_lock:
+            _publish_rag(rag)
+    test_engine.pools.clear()
+    test_engine.tests.clear()
+    question_pool.forget(dataset.roles)
+    print(f"[🔄 RAG] Re-indexed dataset v{dataset.version} ({rag.live_count()} questions)")
+
+get_store().on_reload(_on_dataset_reload)
+
 @router.get("/generate-test")
-def generate_test(role: str = Query(..., description="Role name to pull questions for")):
-    # Grab up to 20 nearest neighbors from RAG, then sample 5
-    all_qas = rag.search(f"interview for {role}", k=20)
-    sample = random.sample(all_qas, min(5, len(all_qas)))
-
-    return {
-        "role": role,
-        "test": [
-            {"question": qa["question"], "answer": qa["answer"]}
-            for qa in sample
-        ]
-    }
+async def generate_test(
+    role: str = Query(..., description="Role name to pull questions for"),
+    seed: int = Query(None, description="Same seed -> same test"),
+):
+    seed, sample = await inference.run(test_engine.draw, role, TEST_LENGTH, seed)
+    return {"role": role, "test": sample, "seed": seed}
 
 # ─── 5) Save a completed test result ────────────────────────────────────────────
 @router.post("/save-test-result")
 def save_test_result(data: dict = Body(..., description="Arbitrary JSON payload with your test results")):
     try:
-        base = os.path.dirname(__file__)
-        sessions_dir = os.path.join(base, "sessions")
-        os.makedirs(sessions_dir, exist_ok=True)
+        # Queued for the background writer; the request doesn't wait on disk
+        test_history.save(data)
+        return {"message": "Test result saved successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Use provided timestamp or generate a UUID
-        ts = data.get("date", str(uuid.uuid4()))
-        safe = re.sub(r"[^0-9A-Za-z_-]", "_", ts)
+def _date_range(date_from, date_to):
+    try:
+        return parse_date(date_from), parse_date(date_to, end=True)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be ISO format, e.g. 2025-07-01")
 
-        with open(os.path.join(sessions_dir, f"test_{safe}.json"), "w") as f:
-            json.dump(data, f, indent=2)
+@router.get("/test-history")
+def get_test_history_page(
+    role: str = Query(None, description="Only tests for this role"),
+    date_from: str = Query(None, description="ISO date/datetime, inclusive"),
+    date_to: str = Query(None, description="ISO date/datetime; a bare date includes that day"),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    start, end = _date_range(date_from, date_to)
+    return test_history.page(role, start, end, limit, offset)
 
-        return {"message": "Test result saved successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+@router.get("/test-history/summary")
+def get_test_history_summary(
+    role: str = Query(None, description="Only tests for this role"),
+    date_from: str = Query(None, description="ISO date/datetime, inclusive"),
+    date_to: str = Query(None, description="ISO date/datetime; a bare date includes that day"),
+    limit: int = Query(10, ge=1, le=100, description="Weakest topics to return"),
+):
+    """Test count, average F1 overall and per role, and the questions with the
+    lowest average F1 across all saved attempts."""
+    start, end = _date_range(date_from, date_to)
+    return test_history.summary(role, start, end, limit)
+
+# ─── 6) Streaming variants (Server-Sent Events) ─────────────────────────────────
+# Text is forwarded as soon as the LLM produces it. If the client disconnects,
+# Starlette cancels the generator, which cancels the upstream Ollama request.
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/get-question/stream")
+async def get_question_stream(req: QuestionRequest):
+    """Events: `session` {session_id}, `token` (question text pieces), then
+    `done` {session_id, question} with the final question text."""
+    role = req.role
+    results = await search_async(f"interview for {role}", k=3, role=role)
+    session_id = str(uuid.uuid4())
+
+    async def events():
+        yield _sse("session", {"session_id": session_id})
+
+        if not results:
+            LLM_FALLBACKS.inc(endpoint="/get-question/stream")
+        if results:
+            question_text = results[0]["question"]
+            yield _sse("token", question_text)
+        elif (question_text := question_pool.take(role)) is not None:
+            yield _sse("token", question_text)
+        else:
+            # Cold pool: stream a fresh question while the pool refills
+            parts = []
+            try:
+                async for piece in stream_dynamic_question(role):
+                    parts.append(piece)
+                    yield _sse("token", piece)
+            except LLMError as e:
+                print(f"[⚠️ LLM Stream Error] {e}")
+            question_text = "".join(parts).strip()
+            if question_text:
+                await run_in_threadpool(question_pool.remember, role, question_text)
+                print(f"[⚠️ LLM Fallback] Streamed question for '{role}': {question_text}")
+            else:
+                question_text = await run_in_threadpool(question_pool.fallback, role)
+                yield _sse("token", question_text)
+
+        # The session only exists once the question is complete
+        sessions.start(session_id, role, question_text)
+        yield _sse("done", {"session_id": session_id, "question": question_text})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@router.get("/get-feedback/stream")
+async def get_feedback_stream(session_id: str = Query(..., description="Session ID returned by /get-question")):
+    """Events: `status` updates, `reference` (sample answer pieces, streamed
+    when it has to be generated), then `feedback` with the final text (or
+    `error` {detail, retry_after} if scoring is overloaded)."""
+    session = await run_in_threadpool(sessions.get, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    last = session["qa"][-1]
+    question = last["question"]
+    answer = last.get("answer", "")
+
+    async def events():
+        feedback = precheck_answer(answer)
+        if feedback is None:
+            yield _sse("status", "Preparing a reference answer…")
+            parts = []
+            async for piece in stream_reference_answer(question):
+                parts.append(piece)
+                yield _sse("reference", piece)
+
+            yield _sse("status", "Scoring your answer…")
+            try:
+                feedback = await inference.run(score_feedback, answer, "".join(parts).strip())
+            except InferenceOverloaded as e:
+                # Headers are already sent, so report it in-stream; the
+                # reference is cached, which makes the retry cheap
+                yield _sse("error", {"detail": str(e), "retry_after": e.retry_after})
+                return
+
+        sessions.append(session_id, "feedback", {"feedback": feedback})
+        yield _sse("feedback", feedback)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+# ─── 7) Admin: live question curation ───────────────────────────────────────────
+# Adds / replaces / removes questions in the running index without a re-embed
+# or redeploy. Changes are logged (curation_log.py) and replayed at startup.
+# Each worker process applies only its own pushes; others pick them up on restart.
+ADMIN_TOKEN = os.getenv("CAREERMATE_ADMIN_TOKEN", "")
+
+class CuratedItem(BaseModel):
+    role: str
+    question: str
+    answer: str
+
+class CurationRequest(BaseModel):
+    items: List[CuratedItem]
+
+class RemovalRequest(BaseModel):
+    questions: List[str]
+    role: Optional[str] = None
+
+def _check_admin(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not token or not secrets.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def _curate(ops, apply):
+    get_rag()
+    with _curation_lock:  # log order == apply order, so a replay ends in the same state
+        rag = _rag  # read under the lock: a dataset reload may have swapped it
+        result = apply(rag)
+        get_curation_log().append(ops)
+    # Test pools were drawn from the old index
+    test_engine.pools.clear()
+    test_engine.tests.clear()
+    return result, rag.live_count()
+
+@router.post("/admin/questions")
+async def admin_upsert_questions(req: CurationRequest, x_admin_token: str = Header(None)):
+    """Add questions; an existing question with the same role and text is replaced."""
+    _check_admin(x_admin_token)
+    items = [{"role": i.role, "question": i.question, "answer": i.answer} for i in req.items]
+    ops = [{"op": "upsert", **item} for item in items]
+    try:
+        (ids, replaced), total = await inference.run(_curate, ops, lambda rag: rag.upsert(items))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"added": len(ids), "replaced": replaced, "questions": total}
+
+@router.post("/admin/questions/remove")
+async def admin_remove_questions(req: RemovalRequest, x_admin_token: str = Header(None)):
+    """Remove questions by exact text (only within `role`, if given)."""
+    _check_admin(x_admin_token)
+    ops = [{"op": "remove", "question": q, "role": req.role} for q in req.questions]
+    removed, total = await inference.run(_curate, ops, lambda rag: rag.remove_items(req.questions, role=req.role))
+    return {"removed": removed, "questions": total}
+
+# ─── Metrics (read at scrape time) ──────────────────────────────────────────────
+def _collect_metrics():
+    rows = cache_samples("test_pools", test_engine.pools.stats()) + cache_samples("test_variants", test_engine.tests.stats())
+    rag = _rag
+    if rag is not None:
+        rows += cache_samples("rag_query_embeddings", rag.query_embeddings.stats())
+        rows += cache_samples("rag_query_results", rag.query_results.stats())
+        rows.append(("careermate_rag_hybrid_searches_total", "counter", "Hybrid-mode searches by path",
+                     [({"path": "lexical_only"}, rag.lexical_only), ({"path": "fused"}, rag.fused)]))
+        rows.append(("careermate_rag_questions", "gauge", "Live questions in the RAG index", [({}, rag.live_count())]))
+    rows.append(("careermate_question_pool_ready", "gauge", "Pre-generated LLM questions waiting",
+                 [({}, question_pool.stats()["ready"])]))
+    return rows
+
+register_collector(_collect_metrics)
@@ -0,0 +1,248 @@
+# backend/llm_client.py
+#
+# Single pooled client for the local Ollama server. All LLM traffic goes
+# through one httpx.AsyncClient (keep-alive connection pool) that lives on a
+# dedicated background event loop, so async handlers, sync helpers and
+# worker threads all share the same pool, concurrency limit and metrics.
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+import httpx
+
+from metrics import STAGE_LATENCY, register_collector
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+DEFAULT_TIMEOUT = float(os.getenv("CAREERMATE_LLM_TIMEOUT", "60"))
+MAX_CONCURRENCY = int(os.getenv("CAREERMATE_LLM_CONCURRENCY", "4"))
+MAX_RETRIES = int(os.getenv("CAREERMATE_LLM_RETRIES", "2"))
+
+# 429 / 5xx are worth retrying; other 4xx mean the request itself is wrong
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, latency, data=None, failed=False):
+        with self._lock:
+            self.calls += 1
+            self.failures += int(failed)
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if data:
+                self.prompt_tokens += int(data.get("prompt_eval_count") or 0)
+                self.completion_tokens += int(data.get("eval_count") or 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "avg_latency_s": self.latency_total / self.calls if self.calls else 0.0,
+                "max_latency_s": self.latency_max,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+class OllamaClient:
+    def __init__(self, base_url=OLLAMA_URL, timeout=DEFAULT_TIMEOUT, max_concurrency=MAX_CONCURRENCY,
+                 max_retries=MAX_RETRIES, backoff=0.5, max_connections=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_connections = max_connections or self.max_concurrency * 2
+        self.metrics = LLMMetrics()
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+
+    # ─── Event loop plumbing ───────────────────────────────────────────────────
+    def _ensure_started(self):
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _setup(self):
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=60,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    # ─── Public API ────────────────────────────────────────────────────────────
+    async def generate(self, prompt: str, model: str = "mistral", timeout=None, options=None) -> str:
+        """Non-streaming completion; awaitable from any event loop."""
+        return await asyncio.wrap_future(self._submit(self._generate(prompt, model, timeout, options)))
+
+    def generate_sync(self, prompt: str, model: str = "mistral", timeout=None, options=None) -> str:
+        """Blocking variant for sync code paths and worker threads."""
+        return self._submit(self._generate(prompt, model, timeout, options)).result()
+
+    async def stream(self, prompt: str, model: str = "mistral", timeout=None, options=None):
+        """Async iterator over generated text pieces (Ollama "stream": true).
+
+        Closing the iterator early (e.g. the HTTP client disconnected) cancels
+        the upstream request, so Ollama stops generating.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def push(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        future = self._submit(self._stream(prompt, model, timeout, options, push))
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "token":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    # ─── Implementation (runs on the client loop) ──────────────────────────────
+    def _record(self, latency, data=None, failed=False):
+        self.metrics.record(latency, data, failed)
+        STAGE_LATENCY.observe(latency, stage="ollama_call")
+
+    async def _generate(self, prompt, model, timeout, options):
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                start = time.perf_counter()
+                try:
+                    response = await self._client.post(
+                        "/api/generate", json=payload, timeout=timeout or self.timeout
+                    )
+                    response.raise_for_status()
+                    data = response.json()
+                    if "response" not in data:
+                        self._record(time.perf_counter() - start, failed=True)
+                        raise LLMError(f"Missing 'response' in Ollama output: {data}")
+                    self._record(time.perf_counter() - start, data)
+                    return data["response"]
+                except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                    self._record(time.perf_counter() - start, failed=True)
+                    status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                    if attempt == self.max_retries or (status is not None and status not in RETRYABLE_STATUS):
+                        raise LLMError(f"Ollama request failed: {e}") from e
+                    self.metrics.retries += 1
+                    # Exponential backoff with jitter so retries don't stampede
+                    await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+                except ValueError as e:
+                    self._record(time.perf_counter() - start, failed=True)
+                    raise LLMError(f"Invalid Ollama response: {e}") from e
+
+
+    async def _stream(self, prompt, model, timeout, options, push):
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+
+        # No retries here: tokens already forwarded can't be taken back
+        async with self._semaphore:
+            start = time.perf_counter()
+            final = None
+            try:
+                async with self._client.stream(
+                    "POST", "/api/generate", json=payload, timeout=timeout or self.timeout
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        data = json.loads(line)
+                        if data.get("error"):
+                            raise LLMError(f"Ollama error: {data['error']}")
+                        if data.get("response"):
+                            push(("token", data["response"]))
+                        if data.get("done"):
+                            final = data
+                            break
+            except asyncio.CancelledError:
+                self._record(time.perf_counter() - start, failed=True)
+                raise
+            except Exception as e:
+                self._record(time.perf_counter() - start, failed=True)
+                push(("error", e if isinstance(e, LLMError) else LLMError(f"Ollama stream failed: {e}")))
+                return
+            self._record(time.perf_counter() - start, final)
+            push(("done", None))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> OllamaClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient()
+    return _client
+
+
+def _collect_metrics():
+    if _client is None:
+        return []
+    m = _client.metrics.snapshot()
+    return [
+        ("careermate_llm_calls_total", "counter", "Ollama calls (each retry counts)", [({}, m["calls"])]),
+        ("careermate_llm_failures_total", "counter", "Failed Ollama calls", [({}, m["failures"])]),
+        ("careermate_llm_retries_total", "counter", "Retried Ollama calls", [({}, m["retries"])]),
+        ("careermate_llm_tokens_total", "counter", "Tokens processed by Ollama",
+         [({"kind": "prompt"}, m["prompt_tokens"]), ({"kind": "completion"}, m["completion_tokens"])]),
+    ]
+
+
+register_collector(_collect_metrics)
@@ -1,19 +1,64 @@
 # backend/main.py
 
-from fastapi import FastAPI, Request
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-# Import routers and utilities
+# Import routers and utilities (light: models and indexes load on first use)
 from ai_tutor_api import router as ai_tutor_router
-from interview_api import router as interview_router
+from interview_api import router as interview_router, get_rag, warm_test_pools
 from generate_flashcard_api import router as flashcard_router
 from generate_test_api import router as test_router
 
 # Import fuzzy extractor + study planner
-from study_plan_generator import extract_weak_topics, generate_study_plan
+from study_plan_generator import extract_weak_topics, generate_study_plan, get_topic_index
+from bert_scorer import get_scorer
+from history_store import get_test_history, parse_date
+from inference_executor import InferenceOverloaded, get_inference_executor
+import metrics
+
+# ─── Startup warm-up ───────────────────────────────────────────────────────────
+# Heavy components load in a background thread after the server starts, so
+# liveness checks and pure-Python routes answer immediately; /readyz reports
+# when everything is loaded. CAREERMATE_WARMUP=0 loads purely on demand (and
+# /readyz then reports ready straight away).
+WARMUP_STEPS = (
+    ("rag_index", get_rag),
+    ("test_pools", warm_test_pools),
+    ("topic_index", get_topic_index),
+    ("feedback_scorer", get_scorer),
+)
+warmup_status = {name: "pending" for name, _ in WARMUP_STEPS}
+
+def warm_up():
+    for name, step in WARMUP_STEPS:
+        warmup_status[name] = "loading"
+        start = time.perf_counter()
+        try:
+            step()
+            warmup_status[name] = "ready"
+            print(f"[🔥 Warm-up] {name} ready in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            # Stays unready; the component is retried on first use
+            warmup_status[name] = f"failed: {e}"
+            print(f"[⚠️ Warm-up] {name} failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("CAREERMATE_WARMUP", "1") != "0":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    else:
+        warmup_status.update((name, "on demand") for name in warmup_status)
+    yield
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS (allow all origins during development)
 app.add_middleware(
@@ -24,6 +69,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ⏱️ Per-route latency histograms and status counts, served at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Saturated inference queue -> 503 with a drain-time estimate
+@app.exception_handler(InferenceOverloaded)
+async def inference_overloaded_handler(request: Request, exc: InferenceOverloaded):
+    print(f"[🚦 Overloaded] {request.url.path}: {exc}")
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Include all API routers
 app.include_router(interview_router)
 app.include_router(flashcard_router)
@@ -35,9 +91,38 @@ app.include_router(ai_tutor_router)
 async def read_root():
     return {"message": "CareerMate backend is running!"}
 
-# Study plan generator endpoint
+# Liveness: the process is up and serving
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+# Readiness: models and indexes are loaded (503 while warming up)
+@app.get("/readyz")
+async def readyz():
+    ready = all(state in ("ready", "on demand") for state in warmup_status.values())
+    return JSONResponse({"ready": ready, "components": warmup_status}, status_code=200 if ready else 503)
+
+# Prometheus scrape endpoint (text exposition format), per worker process
+@app.get("/metrics")
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Study plan generator endpoint. Body: a list of {"question", "f1"} scores, or
+# {"role", "date_from", "date_to"} to plan from the saved test history
 @app.post("/generate-study-plan")
 async def generate_study_plan_endpoint(request: Request):
     score_data = await request.json()
+    if isinstance(score_data, dict):
+        try:
+            date_from = parse_date(score_data.get("date_from"))
+            date_to = parse_date(score_data.get("date_to"), end=True)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be ISO format, e.g. 2025-07-01")
+        score_data = await run_in_threadpool(
+            get_test_history().weak_score_data, score_data.get("role"), date_from, date_to
+        )
+    return await get_inference_executor().run(study_plan_for, score_data)
+
+def study_plan_for(score_data):
     weak_topics = extract_weak_topics(score_data)  # 🧠 uses fuzzy matching
     return generate_study_plan(weak_topics)
@@ -0,0 +1,188 @@
+# backend/metrics.py
+#
+# In-process metrics, served by main.py at /metrics in the Prometheus text
+# format (no client library needed):
+#   • careermate_http_request_duration_seconds{method,route}  per-route latency
+#     (until the last body byte, so streaming responses count in full)
+#   • careermate_stage_duration_seconds{stage}  internal stages: embed_encode,
+#     faiss_search, bm25_search, index_build, ollama_call, bertscore, session_write
+#   • counters for LLM / flashcard fallbacks, plus cache hit / miss counts and
+#     inference queue state read from the components' own stats at scrape time
+# Every uvicorn worker keeps its own numbers; scrape each worker (or run one
+# per container) to see them all.
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; spans sub-millisecond index lookups to multi-second LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_metrics = []
+_collectors = []
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{n}="' + str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for n, v in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, description, labelnames=()):
+        self.name, self.description, self.labelnames = name, description, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(n, "") for n in self.labelnames), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, key)} {_number(v)}" for key, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.description, self.labelnames = name, description, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, seconds, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[slot] += 1
+            series[-1] += seconds
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(tuple(labels.get(n, "") for n in self.labelnames))
+        return sum(series[:-1]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        names = self.labelnames + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(names, key + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def register_collector(collect):
+    """collect() -> [(name, type, description, [(labels dict, value), ...]), ...],
+    called on every scrape: for numbers a component already keeps."""
+    _collectors.append(collect)
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines += metric.render()
+    families = {}
+    for collect in _collectors:
+        try:
+            for name, kind, description, samples in collect():
+                families.setdefault(name, (kind, description, []))[2].extend(samples)
+        except Exception as e:
+            print(f"[⚠️ Metrics] Collector {getattr(collect, '__name__', collect)} failed: {e}")
+    for name, (kind, description, samples) in families.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}" for labels, value in samples]
+    return "\n".join(lines) + "\n"
+
+
+# ─── Metrics ───────────────────────────────────────────────────────────────────
+REQUEST_LATENCY = Histogram(
+    "careermate_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+REQUESTS = Counter("careermate_http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+STAGE_LATENCY = Histogram("careermate_stage_duration_seconds", "Time spent in internal stages", ("stage",))
+LLM_FALLBACKS = Counter(
+    "careermate_llm_fallbacks_total", "Questions generated by the LLM because RAG had none for the role", ("endpoint",)
+)
+FLASHCARD_FALLBACKS = Counter(
+    "careermate_flashcard_fallbacks_total", "Flashcards served from the static template instead of the LLM", ("reason",)
+)
+
+
+def stage(name):
+    """Context manager timing one internal stage."""
+    return STAGE_LATENCY.time(stage=name)
+
+
+def cache_samples(name, stats):
+    """Collector rows for a cache's {"hits", "misses", "size"} stats."""
+    rows = [("careermate_cache_hits_total", "counter", "Cache hits", [({"cache": name}, stats["hits"])]),
+            ("careermate_cache_misses_total", "counter", "Cache misses", [({"cache": name}, stats["misses"])])]
+    if "size" in stats:
+        rows.append(("careermate_cache_entries", "gauge", "Entries held by the cache", [({"cache": name}, stats["size"])]))
+    return rows
+
+
+# ─── HTTP middleware ───────────────────────────────────────────────────────────
+class MetricsMiddleware:
+    """ASGI middleware recording REQUEST_LATENCY / REQUESTS. Routes are
+    labelled by their path template (/test-history, not the raw URL), and
+    unknown paths share one label, so label counts stay bounded."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            method = scope.get("method", "")
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method=method, route=path)
+            REQUESTS.inc(method=method, route=path, status=status[0])
@@ -0,0 +1,189 @@
+# backend/question_pool.py
+#
+# Ready-made LLM interview questions for roles the dataset doesn't cover.
+# Each role keeps a few generated questions in reserve; /get-question pops
+# one and a background worker tops the pool back up, so the request never
+# waits on the LLM unless the pool is cold. A candidate is only accepted if
+# its embedding (RAG model) isn't too close to the role's recent questions,
+# which also catches near-duplicates that differ by a word. Memory is
+# bounded: a fixed-size embedding ring per role and at most MAX_ROLES pools.
+# Roles are client strings, so case and spacing variants share a pool, and
+# a new role only takes a slot from a pool that has gone idle; arbitrary
+# role names can't each start background LLM refills.
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+POOL_SIZE = int(os.getenv("CAREERMATE_QUESTION_POOL_SIZE", "3"))
+SIMILARITY_THRESHOLD = float(os.getenv("CAREERMATE_QUESTION_SIMILARITY", "0.9"))
+HISTORY_SIZE = 256  # recent questions remembered per role
+MAX_ROLES = int(os.getenv("CAREERMATE_QUESTION_POOL_ROLES", "64"))
+ROLE_IDLE_SECONDS = 3600  # an unused pool this old gives its slot to a new role
+
+
+def role_key(role) -> str:
+    return " ".join(role.split()).casefold()
+
+
+class RecentQuestions:
+    """Ring buffer of normalized embeddings."""
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self.vectors = None
+        self.count = 0
+        self.next = 0
+
+    def max_similarity(self, vec) -> float:
+        if not self.count:
+            return -1.0
+        return float((self.vectors[:self.count] @ vec).max())
+
+    def add(self, vec):
+        if self.vectors is None:
+            self.vectors = np.zeros((self.size, vec.shape[0]), dtype="float32")
+        self.vectors[self.next] = vec
+        self.next = (self.next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+
+class _RoleState:
+    def __init__(self, role, history):
+        self.role = role  # first spelling seen, used for generation
+        self.ready = deque()
+        self.recent = RecentQuestions(history)
+        self.refilling = False
+        self.used_at = time.monotonic()
+
+
+class QuestionPool:
+    def __init__(self, embed, generate, fallbacks, size=POOL_SIZE, threshold=SIMILARITY_THRESHOLD,
+                 history=HISTORY_SIZE, max_roles=MAX_ROLES, idle_seconds=ROLE_IDLE_SECONDS, workers=2):
+        self.embed = embed            # [text] -> normalized vectors
+        self.generate = generate      # role -> question text (raises on failure)
+        self.fallbacks = fallbacks    # role -> [template questions]
+        self.size = size
+        self.threshold = threshold
+        self.history = history
+        self.max_roles = max_roles
+        self.idle_seconds = idle_seconds
+        self._roles = OrderedDict()   # role_key -> _RoleState, least recently used first
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-pool")
+
+    def _state(self, role):
+        # Caller holds the lock. None if every slot belongs to a recently
+        # used role: that request is served without a pool
+        key = role_key(role)
+        state = self._roles.get(key)
+        now = time.monotonic()
+        if state is None:
+            if len(self._roles) >= self.max_roles:
+                oldest = next(iter(self._roles.values()))
+                if now - oldest.used_at < self.idle_seconds:
+                    return None
+                self._roles.popitem(last=False)
+            state = self._roles[key] = _RoleState(" ".join(role.split()), self.history)
+        state.used_at = now
+        self._roles.move_to_end(key)
+        return state
+
+    def take(self, role):
+        """A ready question, or None if the pool is empty. Schedules a refill."""
+        with self._lock:
+            state = self._state(role)
+            question = state.ready.popleft() if state and state.ready else None
+        if state is not None:
+            self.refill(role)
+        return question
+
+    def get(self, role) -> str:
+        """A novel question for role: from the pool, else one live LLM call,
+        else a template."""
+        question = self.take(role)
+        if question is None:
+            try:
+                candidate = self.generate(role).strip()
+                if candidate and self.accept(role, candidate):
+                    question = candidate
+            except Exception as e:
+                print(f"[⚠️ LLM Gen Error] {e}")
+        if question is None:
+            question = self.fallback(role)
+        return question
+
+    def accept(self, role, question) -> bool:
+        """Remember question if it isn't a near-duplicate of a recent one."""
+        vec = self.embed([question])[0]
+        with self._lock:
+            state = self._state(role)
+            if state is None:
+                return True  # no pool, so no history to compare against
+            if state.recent.max_similarity(vec) >= self.threshold:
+                return False
+            state.recent.add(vec)
+        return True
+
+    def remember(self, role, question):
+        """Record a question served some other way (e.g. streamed)."""
+        vec = self.embed([question])[0]
+        with self._lock:
+            state = self._state(role)
+            if state is not None:
+                state.recent.add(vec)
+
+    def fallback(self, role) -> str:
+        templates = self.fallbacks(role)
+        for template in templates:
+            if self.accept(role, template):
+                return template
+        return templates[0]
+
+    def refill(self, role):
+        with self._lock:
+            state = self._state(role)
+            if state is None or state.refilling or len(state.ready) >= self.size:
+                return
+            state.refilling = True
+        self._executor.submit(self._refill, state)
+
+    def _refill(self, state):
+        role = state.role
+        failures = 0
+        try:
+            # Give up after a few duplicates/errors; the next request retries
+            while len(state.ready) < self.size and failures < self.size * 2:
+                try:
+                    candidate = self.generate(role).strip()
+                except Exception as e:
+                    print(f"[⚠️ Question Pool] Generation failed for '{role}': {e}")
+                    failures += 1
+                    continue
+                if candidate and self.accept(role, candidate):
+                    with self._lock:
+                        state.ready.append(candidate)
+                else:
+                    failures += 1
+        finally:
+            with self._lock:
+                state.refilling = False
+
+    def forget(self, roles):
+        """Drop the pools of these roles (case-insensitive), e.g. once the
+        dataset covers them."""
+        with self._lock:
+            for key in {role_key(role) for role in roles}:
+                self._roles.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "roles": len(self._roles),
+                "ready": sum(len(s.ready) for s in self._roles.values()),
+                "refilling": sum(s.refilling for s in self._roles.values()),
+            }
@@ -0,0 +1,237 @@
+# backend/quiz_engine.py
+#
+# Test generation without per-request work. Each role gets a question pool,
+# built once and cached; a test is a seeded draw without replacement from it,
+# and drawn tests are cached too. A request without a seed picks one of a few
+# fixed variants, so repeat requests are served straight from the cache.
+# LLM-written multiple-choice questions are generated offline into
+# data/mcq_bank.json; serving a test never calls a model.
+#
+#   python quiz_engine.py pregenerate --per-role 20      # all dataset roles
+#   python quiz_engine.py pregenerate --roles "Data Scientist" "AI Engineer"
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+
+from llm_client import get_llm_client
+from ttl_cache import TTLCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MCQ_BANK_PATH = os.path.join(BASE_DIR, "data", "mcq_bank.json")
+TEST_VARIANTS = int(os.getenv("CAREERMATE_TEST_VARIANTS", "8"))
+
+# Built-in questions every role's MCQ pool starts with; "{role}" is filled in
+GENERIC_MCQS = (
+    {
+        "question": "What are key skills for a {role}?",
+        "options": ["Python", "SQL", "Machine Learning", "All of the above"],
+        "answer": "All of the above"
+    },
+    {
+        "question": "What is overfitting in ML?",
+        "options": ["High bias", "High variance", "Perfect accuracy", "Low recall"],
+        "answer": "High variance"
+    },
+    {
+        "question": "Which algorithm is suitable for classification tasks?",
+        "options": ["K-Means", "Linear Regression", "Decision Tree", "PCA"],
+        "answer": "Decision Tree"
+    },
+    {
+        "question": "What is the purpose of cross-validation?",
+        "options": [
+            "Reduce overfitting", "Improve GPU usage", "Tune epochs", "None of the above"
+        ],
+        "answer": "Reduce overfitting"
+    },
+    {
+        "question": "What does the 'dropout' layer prevent in neural networks?",
+        "options": ["Underfitting", "Overfitting", "Bias", "Noise"],
+        "answer": "Overfitting"
+    },
+    {
+        "question": "Which metric is best for imbalanced classification?",
+        "options": ["Accuracy", "Precision", "Recall", "F1-score"],
+        "answer": "F1-score"
+    },
+    {
+        "question": "What is the purpose of a confusion matrix?",
+        "options": [
+            "Show training speed", "Visualize model errors", "Optimize GPU", "Track logs"
+        ],
+        "answer": "Visualize model errors"
+    },
+    {
+        "question": "What does PCA stand for?",
+        "options": [
+            "Principal Component Analysis", "Partial Classification Approach",
+            "Python Coded Algorithm", "Primary Clustering Algorithm"
+        ],
+        "answer": "Principal Component Analysis"
+    },
+    {
+        "question": "What is a hyperparameter in ML?",
+        "options": [
+            "Trainable layer weight", "Optimizer result", "Pre-set tuning value", "Loss function output"
+        ],
+        "answer": "Pre-set tuning value"
+    },
+    {
+        "question": "What’s the key idea behind gradient descent?",
+        "options": [
+            "Climbing hill", "Gradient increase", "Loss minimization", "Accuracy boosting"
+        ],
+        "answer": "Loss minimization"
+    },
+)
+
+
+class QuizEngine:
+    def __init__(self, build_pool, variants=TEST_VARIANTS, cache_size=1024):
+        self.build_pool = build_pool  # role -> tuple of questions
+        self.variants = max(1, variants)
+        self.pools = TTLCache(cache_size)
+        self.tests = TTLCache(cache_size * self.variants)
+
+    def pool(self, role):
+        pool = self.pools.get(role)
+        if pool is None:
+            pool = tuple(self.build_pool(role))
+            self.pools.put(role, pool)
+        return pool
+
+    def draw(self, role, k, seed=None):
+        """(seed, questions): up to k distinct questions, reproducible per seed."""
+        if seed is None:
+            seed = random.randrange(self.variants)
+        key = (role, k, seed)
+        test = self.tests.get(key)
+        if test is None:
+            pool = self.pool(role)
+            rng = random.Random(f"{role}|{seed}")  # str seeds hash the same in every worker
+            test = tuple(rng.sample(pool, min(k, len(pool))))
+            self.tests.put(key, test)
+        return seed, list(test)
+
+    def warm(self, pools, k=None):
+        """Install prebuilt pools ({role: questions}); with k, also draw every
+        seedless variant of a k-question test."""
+        for role, questions in pools.items():
+            self.pools.put(role, tuple(questions))
+            if k:
+                for seed in range(self.variants):
+                    self.draw(role, k, seed)
+
+    def stats(self) -> dict:
+        return {"pools": self.pools.stats(), "tests": self.tests.stats()}
+
+
+# ─── MCQ bank ──────────────────────────────────────────────────────────────────
+def load_mcq_bank(path=MCQ_BANK_PATH) -> dict:
+    """{role: [mcq, ...]} written by `pregenerate`; empty if not generated yet."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print(f"[⚠️ MCQ Bank] Ignoring unreadable {path}: {e}")
+        return {}
+
+
+def mcq_pool(role, bank):
+    seen = set()
+    pool = []
+    generic = ({**mcq, "question": mcq["question"].format(role=role)} for mcq in GENERIC_MCQS)
+    for mcq in [*bank.get(role, ()), *generic]:
+        key = mcq["question"].strip().lower()
+        if key not in seen:
+            seen.add(key)
+            pool.append(mcq)
+    return pool
+
+
+# ─── Offline generation ────────────────────────────────────────────────────────
+def mcq_prompt(role, n, avoid):
+    prompt = (
+        f"Write {n} multiple-choice questions that test knowledge a {role} needs in job interviews.\n"
+        f'Return only a JSON list; each item: {{"question": "...", "options": ["...", "...", "...", "..."], '
+        f'"answer": "<exactly one of the options>"}}.'
+    )
+    if avoid:
+        prompt += "\nDo not repeat these questions:\n" + "\n".join(f"- {q}" for q in avoid[-20:])
+    return prompt
+
+
+def parse_mcqs(raw):
+    match = re.search(r"\[.*\]", raw, re.DOTALL)
+    try:
+        items = json.loads(match.group(0)) if match else []
+    except ValueError:
+        return []
+    valid = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        question, options, answer = item.get("question"), item.get("options"), item.get("answer")
+        if (isinstance(question, str) and question.strip() and isinstance(options, list)
+                and len(options) == 4 and all(isinstance(o, str) for o in options) and answer in options):
+            valid.append({"question": question.strip(), "options": options, "answer": answer})
+    return valid
+
+
+async def generate_role_mcqs(role, count, existing=(), per_call=5, max_calls=None, model="mistral"):
+    mcqs = list(existing)
+    seen = {m["question"].strip().lower() for m in mcqs}
+    for _ in range(max_calls or 2 * count // per_call + 2):
+        if len(mcqs) >= count:
+            break
+        try:
+            raw = await get_llm_client().generate(mcq_prompt(role, per_call, [m["question"] for m in mcqs]), model=model)
+        except Exception as e:
+            print(f"[⚠️ MCQ Gen Failed for '{role}'] {e}")
+            continue
+        for mcq in parse_mcqs(raw):
+            key = mcq["question"].lower()
+            if key not in seen and len(mcqs) < count:
+                seen.add(key)
+                mcqs.append(mcq)
+    return role, mcqs
+
+
+async def pregenerate(roles, count, path=MCQ_BANK_PATH):
+    bank = load_mcq_bank(path)
+    # Roles run concurrently; the shared LLM client caps requests in flight
+    results = await asyncio.gather(*(generate_role_mcqs(role, count, bank.get(role, ())) for role in roles))
+    for role, mcqs in results:
+        bank[role] = mcqs
+        print(f"✅ {role}: {len(mcqs)} questions")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(bank, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)  # the API never sees a half-written bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MCQ generation for /generate-test")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("pregenerate", help="generate MCQs with the LLM into data/mcq_bank.json")
+    gen.add_argument("--roles", nargs="+", help="defaults to every role in the dataset")
+    gen.add_argument("--per-role", type=int, default=20)
+    args = parser.parse_args()
+
+    roles = args.roles
+    if not roles:
+        from dataset_store import get_dataset
+        roles = get_dataset().roles
+    asyncio.run(pregenerate(roles, args.per_role))
+
+
+if __name__ == "__main__":
+    main()
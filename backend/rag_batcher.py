@@ -0,0 +1,83 @@
+# backend/rag_batcher.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+
+
+class SearchBatcher:
+    """Micro-batching front for RAGEngine.search.
+
+    Concurrent queries are collected for up to `max_wait_ms` (or until
+    `max_batch_size` are waiting), encoded in a single model.encode call and
+    answered by one multi-row index.search. Each caller gets its own future.
+    """
+
+    def __init__(self, rag, max_batch_size=32, max_wait_ms=5.0):
+        self.rag = rag
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._run, name="rag-batcher", daemon=True)
+        self._thread.start()
+
+    # ─── Public API ────────────────────────────────────────────────────────────
+    def submit(self, query, k=3, role=None) -> Future:
+        future = Future()
+        self._queue.put((query, k, role, future))
+        return future
+
+    def search(self, query, k=3, role=None):
+        return self.submit(query, k, role).result()
+
+    async def search_async(self, query, k=3, role=None):
+        return await asyncio.wrap_future(self.submit(query, k, role))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    # ─── Worker loop ───────────────────────────────────────────────────────────
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+
+            # Keep collecting until the batch is full or the wait window closes
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        # Drop requests whose caller already gave up (e.g. cancelled handler)
+        batch = [item for item in batch if item[-1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            max_k = max(k for _, k, _, _ in batch)
+            results = self.rag.search_batch(
+                [q for q, _, _, _ in batch], k=max_k, roles=[r for _, _, r, _ in batch]
+            )
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+        for (_, k, _, future), rows in zip(batch, results):
+            future.set_result(rows[:k])
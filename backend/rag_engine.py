@@ -1,55 +1,699 @@
 # backend/rag_engine.py
 
-from sentence_transformers import SentenceTransformer
 import faiss
+import hashlib
 import json
+import os
+import threading
+from array import array
 import numpy as np
 
+import index_factory
+from bm25_index import BM25Index
+from embedding_backends import EMBED_BACKEND, check_backend, load_encoder
+from metrics import stage
+from dataset_store import get_dataset, iter_dataset_file
+from text_store import TextStore, TextView
+from ttl_cache import TTLCache
+
+# Roles at or below this size are filtered with a direct NumPy scan of their
+# rows, which beats building an ID selector for the whole index
+EXACT_ROLE_SCAN_ROWS = 2048
+
+# Rows per model.encode call (and per index.add) when building, so peak memory
+# doesn't grow with the corpus beyond the embedding matrix itself
+ENCODE_BATCH = int(os.getenv("CAREERMATE_RAG_ENCODE_BATCH", "4096"))
+
+# 🔤 "vector" (embeddings only) or "hybrid" (BM25 + embeddings, fused by
+# reciprocal rank). In hybrid mode a query whose best keyword hit contains at
+# least LEXICAL_CONFIDENCE of its keyword weight, and that matches at least k
+# rows, is answered by BM25 alone without encoding it (set it above 1 to
+# always fuse)
+SEARCH_MODE = os.getenv("CAREERMATE_RAG_SEARCH_MODE", "vector")
+LEXICAL_CONFIDENCE = float(os.getenv("CAREERMATE_RAG_LEXICAL_CONFIDENCE", "1.0"))
+RRF_K = 60          # reciprocal-rank fusion constant: score = Σ 1 / (RRF_K + rank)
+HYBRID_DEPTH = 20   # candidates taken from each ranking before fusing
+
+# Template rows in scraped datasets ("<Profession>", "..._26") are not real questions
+PLACEHOLDER_MARKERS = ("Profession", "_26")
+
+
+def is_placeholder(question):
+    return any(marker in question for marker in PLACEHOLDER_MARKERS)
+
+
+class _SearchState:
+    """Everything a search reads, replaced as a whole on every change: a
+    search holds one snapshot, so it never sees a half-applied update."""
+
+    __slots__ = ("index", "embeddings", "role_ids", "role_selectors", "lexical", "version")
+
+    def __init__(self, index=None, embeddings=None, role_ids=None, lexical=None, version=0):
+        self.index = index
+        self.embeddings = embeddings
+        self.role_ids = role_ids or {}
+        # role -> FAISS IDSelectorBatch, built lazily. Selectors are read-only
+        # and safe to share; the SearchParameters around them are not (an
+        # IDMap index swaps params.sel during a search), so those are per call
+        self.role_selectors = {}
+        self.lexical = lexical  # BM25Index in hybrid mode, else None
+        self.version = version
+
+
 class RAGEngine:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
-        self.index = None
-        self.questions = []
-        self.answers = []
-        self.metadata = []
-
-    def load_data(self, path="/home/w202201111/carrer-mate/backend/data/careermate_full_dataset.json"):
-        with open(path, 'r') as f:
-            data = json.load(f)
-
-        # Handle flat list format
-        if isinstance(data, list):
-            for item in data:
-                question = item.get("interview_question")
-                answer = item.get("sample_response")
-                role = item.get("industry", "Unknown Role")
-                if question and answer:
-                    self.questions.append(question)
-                    self.answers.append(answer)
-                    self.metadata.append({"role": role})
+    def __init__(self, model_name="all-MiniLM-L6-v2", cache_dir=None,
+                 query_cache_size=1024, query_cache_ttl=None,
+                 index_type="flat", nprobe=8, ef_search=64, model=None, text_dir=None,
+                 encode_batch=ENCODE_BATCH, search_mode=SEARCH_MODE,
+                 lexical_confidence=LEXICAL_CONFIDENCE, backend=EMBED_BACKEND, **index_params):
+        self.model_name = model_name
+        # ⚙️ "torch" (fp32), "torch-int8", "onnx" or "onnx-int8" (embedding_backends.py)
+        self.backend = check_backend(backend)
+        if model is None:
+            model = load_encoder(model_name, backend)
+        # Anything with SentenceTransformer's encode() and
+        # get_sentence_embedding_dimension() (benchmarks pass a stub)
+        self.model = model
+        self.cache_dir = cache_dir  # 💾 on-disk index + embedding cache (None = disabled)
+        # 🗂️ "flat" (exact), "ivf_flat", "ivf_pq" or "hnsw"; extra build
+        # options (nlist, pq_m, pq_nbits, hnsw_m, ...) go to index_factory
+        self.index_type = index_type
+        self.index_params = index_params
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        # 🔁 Hot query strings ("interview for <role>") skip the forward pass
+        # and, while the index is unchanged, the FAISS scan as well
+        self.query_embeddings = TTLCache(query_cache_size, query_cache_ttl)
+        self.query_results = TTLCache(query_cache_size, query_cache_ttl)
+        self.encode_batch = max(1, encode_batch)
+        if search_mode not in ("vector", "hybrid"):
+            raise ValueError(f"Unknown search mode {search_mode!r} (expected 'vector' or 'hybrid')")
+        self.search_mode = search_mode
+        self.lexical_confidence = lexical_confidence
+        self.lexical_only = 0  # hybrid searches answered without the model
+        self.fused = 0         # hybrid searches that needed the vector side too
+        self._state = _SearchState()
+        self._embeddings_tmp = None
+        # 📦 Row texts in contiguous buffers (files under text_dir, if given)
+        # instead of a Python string per row, or views of the shared dataset's
+        # buffers (load_data() without a path); roles as an index into self.roles
+        self.questions = TextStore(text_dir and os.path.join(text_dir, "questions.txt"))
+        self.answers = TextStore(text_dir and os.path.join(text_dir, "answers.txt"))
+        self.roles = []
+        self.role_index = array("I")
+        self._role_pos = {}
+        # Incremental updates (add_items / remove_items / upsert)
+        self._write_lock = threading.Lock()
+        self._removed = set()          # row ids deleted since the last build
+        self._rows_by_question = None  # sha1(question) -> live row ids, built on first update
+
+    # Current snapshot's parts, for callers outside the search path
+    @property
+    def index(self):
+        return self._state.index
+
+    @property
+    def embeddings(self):
+        return self._state.embeddings
+
+    @property
+    def role_ids(self):
+        return self._state.role_ids
+
+    def load_data(self, path=None):
+        # Rows come from the shared dataset store (parsed once per process);
+        # an explicit path (JSON or JSONL) is streamed row by row, so large
+        # corpora never exist as one parsed document
+        if path is None:
+            dataset = get_dataset()
+            if not len(self.questions) and self.questions.path is None:
+                return self._load_shared(dataset)
+            rows = dataset.iter_rows()
         else:
-            # Fallback if JSON is grouped by role
-            for role, qas in data.items():
-                for qa in qas:
-                    self.questions.append(qa["question"])
-                    self.answers.append(qa["answer"])
-                    self.metadata.append({"role": role})
+            rows = iter_dataset_file(path)
+        for role, question, answer in rows:
+            if answer and not is_placeholder(question):
+                self._append_row(role, question, answer)
+
+    def _load_shared(self, dataset):
+        # Index the dataset's own text buffers in place (only row ids are
+        # kept), so the server holds the corpus text once. Rows added later
+        # go to the views' private tails; the dataset is never modified.
+        picked = array("I")
+        for row in range(len(dataset)):
+            question = dataset.questions[row]
+            if dataset.answer(row) and not is_placeholder(question):
+                picked.append(row)
+                self.role_index.append(self._role_position(dataset.role_of(row)))
+        self.questions = TextView(dataset.questions, picked)
+        self.answers = TextView(dataset.answers, picked)
+
+    def _append_row(self, role, question, answer):
+        self.questions.append(question)
+        self.answers.append(answer)
+        self.role_index.append(self._role_position(role))
+
+    def _role_position(self, role):
+        pos = self._role_pos.get(role)
+        if pos is None:
+            pos = self._role_pos[role] = len(self.roles)
+            self.roles.append(role)
+        return pos
+
+    def role_of(self, row):
+        return self.roles[self.role_index[row]]
 
     def build_index(self):
-        embeddings = self.model.encode(self.questions, convert_to_tensor=False)
-        embeddings = np.array(embeddings).astype("float32")
-        dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dim)
-        self.index.add(embeddings)
-
-    def search(self, query, k=3):
-        query_vec = self.model.encode([query])
-        query_vec = np.array(query_vec).astype("float32")
-        D, I = self.index.search(query_vec, k)
+        with self._write_lock, stage("index_build"):
+            # Rows removed by earlier updates keep their ids but stay out of
+            # the index, the role map and BM25
+            live = self._live_rows()
+            index, embeddings = self._build_index(live)
+            lexical = self._build_lexical() if self.search_mode == "hybrid" else None
+            self._rows_by_question = None  # rows loaded since the last update
+            self._publish(index, embeddings, self._build_role_map(live), lexical)
+        # Cached result ids point into the old index; embeddings only depend
+        # on the model, so those stay valid
+        self.query_results.clear()
+
+    def _publish(self, index, embeddings, role_ids, lexical):
+        # One attribute assignment: readers see the old snapshot or the new one
+        self._state = _SearchState(index, embeddings, role_ids, lexical, self._state.version + 1)
+
+    def _live_rows(self):
+        """Row ids not removed, or None if every row is live."""
+        if not self._removed:
+            return None
+        return np.setdiff1d(np.arange(len(self.questions)), np.fromiter(self._removed, dtype="int64"))
+
+    def _build_index(self, live=None):
+        row_hashes = self._row_hashes()
+        dataset_hash = self._dataset_hash(row_hashes, live)
+
+        # ⚡ Fast path: the cached index was built from exactly this dataset
+        if self.cache_dir:
+            cached = self._load_cached_index(dataset_hash, live)
+            if cached:
+                return cached
+
+        embeddings, filled = self._encode_with_cache(row_hashes, live)
+        index = index_factory.build_index(
+            embeddings, self.index_type, ids=live, nprobe=self.nprobe, ef_search=self.ef_search, **self.index_params
+        )
+
+        if self.cache_dir:
+            # Removed rows that weren't cached were never encoded: don't let
+            # their zero vectors be reused for that text later
+            saved_hashes = row_hashes if filled is None else np.where(filled[:, None], row_hashes, 0).astype(np.uint8)
+            self._save_cache(dataset_hash, saved_hashes, index, embeddings)
+        return index, embeddings
+
+    def _build_lexical(self):
+        # Removed rows are indexed as empty text and masked out, so BM25 row
+        # ids still line up with the text stores
+        removed = self._removed
+        lexical = BM25Index(
+            ("" if row in removed else self.questions[row] for row in range(len(self.questions))),
+            ("" if row in removed else self.answers[row] for row in range(len(self.answers))),
+        )
+        return lexical.updated(removed=sorted(removed)) if removed else lexical
+
+    def set_search_params(self, nprobe=None, ef_search=None):
+        # Trade recall for speed at query time without rebuilding
+        self.nprobe = nprobe if nprobe is not None else self.nprobe
+        self.ef_search = ef_search if ef_search is not None else self.ef_search
+        state = self._state
+        index_factory.set_search_params(state.index, nprobe=self.nprobe, ef_search=self.ef_search)
+        self.query_results.clear()
+
+    def search(self, query, k=3, role=None):
+        return self.search_batch([query], k, roles=[role])[0]
+
+    def search_batch(self, queries, k=3, roles=None):
+        state = self._state
+        queries = list(queries)
+        roles = roles or [None] * len(queries)
+        # Keyed by snapshot version, so results from before an update are never reused
+        keys = [(q, k, self.role_key(r), state.version) for q, r in zip(queries, roles)]
+        hits = [self.query_results.get(key) for key in keys]
+        pending = list(dict.fromkeys(key for key, ids in zip(keys, hits) if ids is None))
+
+        if pending:
+            fresh = {}
+            lexical = {}
+            if state.lexical is not None:
+                # Keyword pass first: confident queries never reach the model,
+                # as long as BM25 alone found k rows (else the vector side
+                # fills the rest)
+                depth = max(k, HYBRID_DEPTH)
+                for key in pending:
+                    query, _, role, _ = key
+                    rows, _, coverage = self._lexical_search(state, query, depth, role)
+                    if len(rows) >= k and coverage[0] >= self.lexical_confidence - 1e-6:
+                        fresh[key] = tuple(int(i) for i in rows[:k])
+                        self.lexical_only += 1
+                    else:
+                        lexical[key] = rows
+                pending = [key for key in pending if key not in fresh]
+
+            if pending:
+                # One forward pass for all misses, then one FAISS scan per role
+                depth = max(k, HYBRID_DEPTH) if state.lexical is not None else k
+                vecs = self.encode_queries([q for q, _, _, _ in pending])
+                groups = {}
+                for row, (_, _, role, _) in enumerate(pending):
+                    groups.setdefault(role, []).append(row)
+                for role, rows in groups.items():
+                    with stage("faiss_search"):
+                        found = self._search_vectors(state, vecs[rows], depth, role)
+                    for row, ids in zip(rows, found):
+                        key = pending[row]
+                        if key in lexical:
+                            ids = self._fuse(ids, lexical[key], k)
+                            self.fused += 1
+                        fresh[key] = ids
+            for key, ids in fresh.items():
+                self.query_results.put(key, ids)
+            hits = [fresh[key] if ids is None else ids for key, ids in zip(keys, hits)]
+
+        return [self._rows(ids) for ids in hits]
+
+    @staticmethod
+    def role_key(role):
+        return role.strip().lower() if role and role.strip() else None
+
+    def _build_role_map(self, live=None):
+        # Inverted role -> row ids map (live rows only); searches build a
+        # reusable FAISS ID selector per role from it, so filtered searches
+        # only consider that role's vectors
+        positions = np.frombuffer(self.role_index, dtype=np.uint32) if self.role_index else np.zeros(0, np.uint32)
+        rows = np.arange(len(positions), dtype="int64") if live is None else live
+        positions = positions[rows]
+        order = rows[np.argsort(positions, kind="stable")]
+        bounds = np.cumsum(np.bincount(positions, minlength=len(self.roles)))
+        grouped = {}
+        for pos, role in enumerate(self.roles):
+            ids = order[bounds[pos - 1] if pos else 0:bounds[pos]]
+            grouped.setdefault(self.role_key(role), []).append(ids)
+        role_ids = {role: np.sort(np.concatenate(parts)) for role, parts in grouped.items() if role}
+        return {role: ids for role, ids in role_ids.items() if len(ids)}
+
+    def _role_search_params(self, state, role):
+        sel = state.role_selectors.get(role)
+        if sel is None:
+            # Two threads may both build one; setdefault keeps a single winner
+            sel = state.role_selectors.setdefault(role, faiss.IDSelectorBatch(state.role_ids[role]))
+        if faiss.try_extract_index_ivf(state.index) is not None:
+            params = faiss.SearchParametersIVF(sel=sel, nprobe=self.nprobe)
+        elif isinstance(index_factory.unwrap(state.index), faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=sel, efSearch=self.ef_search)
+        else:
+            params = faiss.SearchParameters(sel=sel)
+        params.sel_ref = sel  # keep the selector alive as long as the params
+        return params
+
+    def _search_vectors(self, state, vecs, k, role):
+        if role is None:
+            D, I = state.index.search(vecs, k)
+            return [tuple(int(i) for i in ids if i != -1) for ids in I]
+
+        ids = state.role_ids.get(role)
+        if ids is None:
+            return [()] * len(vecs)
+        if len(ids) <= max(k, EXACT_ROLE_SCAN_ROWS):
+            return [self._exact_search(state, vec, k, ids) for vec in vecs]
+
+        D, I = state.index.search(vecs, k, params=self._role_search_params(state, role))
+        results = []
+        for vec, row in zip(vecs, I):
+            found = tuple(int(i) for i in row if i != -1)
+            # Approximate indexes can come back short on a selective filter;
+            # an exact scan of the role's rows guarantees k in-role results
+            results.append(found if len(found) == k else self._exact_search(state, vec, k, ids))
+        return results
+
+    def _lexical_search(self, state, query, k, role):
+        ids = state.role_ids.get(role) if role is not None else None
+        if role is not None and ids is None:  # unknown role: no rows to match
+            query = ""
+        with stage("bm25_search"):
+            return state.lexical.search(query, k, allowed=ids)
+
+    @staticmethod
+    def _fuse(vector_ids, lexical_ids, k):
+        """Reciprocal-rank fusion of two best-first id lists; rows found by
+        both rank above rows found by one. Ties keep the vector order."""
+        scores = {}
+        for ranking in (vector_ids, lexical_ids):
+            for rank, row in enumerate(ranking):
+                scores[int(row)] = scores.get(int(row), 0.0) + 1.0 / (RRF_K + rank + 1)
+        order = sorted(scores, key=scores.get, reverse=True)  # stable: vector ids were inserted first
+        return tuple(order[:k])
+
+    def _exact_search(self, state, vec, k, ids):
+        dists = ((np.asarray(state.embeddings[ids]) - vec) ** 2).sum(axis=1)
+        top = np.argsort(dists)[:k]
+        return tuple(int(ids[j]) for j in top)
+
+    # ─── Incremental updates ───────────────────────────────────────────────────
+    # A change encodes only its new rows, is applied to a copy of the index and
+    # published as a new snapshot. Copying the index is O(corpus) but far
+    # cheaper than re-encoding it, so push changes in batches. Row ids are
+    # positions in the append-only text stores: removed rows keep their slot
+    # and new rows always get fresh ids. A later build_index() starts over
+    # from the live rows.
+
+    def add_items(self, items):
+        """Add (role, question, answer) tuples or {"role", "question", "answer"}
+        dicts; returns their row ids."""
+        with self._write_lock:
+            return self._apply(self._normalize(items), [])
+
+    def remove_items(self, questions, role=None):
+        """Remove every row with one of these question texts (only within
+        role, if given); returns how many rows were removed."""
+        with self._write_lock:
+            rows = self._find_rows(questions, role)
+            if rows:
+                self._apply([], rows)
+            return len(rows)
+
+    def upsert(self, items):
+        """Add items, replacing rows with the same role and question, in one
+        snapshot. Returns (new row ids, number of rows replaced)."""
+        with self._write_lock:
+            # Within the batch the last item for a role + question wins
+            latest = {(self.role_key(role), self._question_key(question)): (role, question, answer)
+                      for role, question, answer in self._normalize(items)}
+            items = list(latest.values())
+            rows = sorted({row for role, question, _ in items for row in self._find_rows([question], role)})
+            return self._apply(items, rows), len(rows)
+
+    def live_count(self):
+        return len(self.questions) - len(self._removed)
+
+    @staticmethod
+    def _normalize(items):
+        rows = []
+        for item in items:
+            if isinstance(item, dict):
+                item = (item.get("role"), item.get("question"), item.get("answer"))
+            role, question, answer = ("" if v is None else str(v).strip() for v in item)
+            if not (role and question and answer):
+                raise ValueError(f"Each item needs a non-empty role, question and answer: {item!r}")
+            rows.append((role, question, answer))
+        return rows
+
+    @staticmethod
+    def _question_key(question):
+        return hashlib.sha1(question.strip().encode("utf-8")).digest()
+
+    def _question_rows(self):
+        # Caller holds the write lock
+        if self._rows_by_question is None:
+            by_question = {}
+            for row, question in enumerate(self.questions):
+                if row not in self._removed:
+                    by_question.setdefault(self._question_key(question), []).append(row)
+            self._rows_by_question = by_question
+        return self._rows_by_question
+
+    def _find_rows(self, questions, role=None):
+        by_question = self._question_rows()
+        key = self.role_key(role)
+        return sorted({
+            row for question in questions for row in by_question.get(self._question_key(question), ())
+            if key is None or self.role_key(self.role_of(row)) == key
+        })
+
+    def _apply(self, items, remove_rows):
+        # Caller holds the write lock
+        state = self._state
+        if state.index is None:
+            raise RuntimeError("build_index() must run before incremental updates")
+
+        # Encode first: nothing is appended if the model fails
+        vecs = None
+        if items:
+            parts = [
+                np.asarray(self.model.encode([q for _, q, _ in items[i:i + self.encode_batch]],
+                                             convert_to_tensor=False), dtype="float32")
+                for i in range(0, len(items), self.encode_batch)
+            ]
+            vecs = np.ascontiguousarray(np.concatenate(parts))
+
+        by_question = self._question_rows()
+        index = faiss.clone_index(state.index)
+        embeddings = state.embeddings
+        changed = {}  # role key -> (added ids, removed ids)
+
+        if remove_rows:
+            drop = np.asarray(remove_rows, dtype="int64")
+            if isinstance(index_factory.unwrap(index), faiss.IndexHNSW):
+                index = None  # HNSW can't delete in place: rebuilt below from stored vectors
+            else:
+                index.remove_ids(drop)
+            for row in remove_rows:
+                self._removed.add(row)
+                by_question[self._question_key(self.questions[row])].remove(row)
+                changed.setdefault(self.role_key(self.role_of(row)), ([], []))[1].append(row)
+
+        new_ids = []
+        if items:
+            start = len(self.questions)
+            new_ids = list(range(start, start + len(items)))
+            for row, (role, question, answer) in zip(new_ids, items):
+                self._append_row(role, question, answer)
+                by_question.setdefault(self._question_key(question), []).append(row)
+                changed.setdefault(self.role_key(role), ([], []))[0].append(row)
+            embeddings = np.concatenate([np.asarray(embeddings), vecs])
+            if index is not None:
+                index.add_with_ids(vecs, np.asarray(new_ids, dtype="int64"))
+
+        if index is None:
+            index = index_factory.build_index(
+                embeddings, self.index_type, ids=self._live_rows(),
+                nprobe=self.nprobe, ef_search=self.ef_search, **self.index_params
+            )
+
+        role_ids = dict(state.role_ids)
+        for key, (added, removed) in changed.items():
+            if key is None:
+                continue
+            ids = role_ids.get(key, np.zeros(0, dtype="int64"))
+            if removed:
+                ids = ids[~np.isin(ids, removed)]
+            if added:
+                ids = np.concatenate([ids, np.asarray(added, dtype="int64")])  # new ids are the largest
+            if len(ids):
+                role_ids[key] = ids
+            else:
+                role_ids.pop(key, None)
+
+        lexical = state.lexical
+        if lexical is not None:
+            lexical = lexical.updated(added=[(row, q, a) for row, (_, q, a) in zip(new_ids, items)],
+                                      removed=remove_rows)
+
+        self._publish(index, embeddings, role_ids, lexical)
+        return new_ids
+
+    def embed(self, texts):
+        """Uncached, L2-normalized embeddings (dot product = cosine similarity)."""
+        with stage("embed_encode"):
+            vecs = np.array(self.model.encode(list(texts))).astype("float32")
+        return vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+
+    def encode_queries(self, queries):
+        vecs = [self.query_embeddings.get(q) for q in queries]
+        missing = list(dict.fromkeys(q for q, v in zip(queries, vecs) if v is None))
+        if missing:
+            with stage("embed_encode"):
+                encoded = np.array(self.model.encode(missing)).astype("float32")
+            for q, vec in zip(missing, encoded):
+                self.query_embeddings.put(q, vec)
+            fresh = dict(zip(missing, encoded))
+            vecs = [fresh[q] if v is None else v for q, v in zip(queries, vecs)]
+        return np.stack(vecs)
+
+    def cache_stats(self):
+        return {
+            "query_embeddings": self.query_embeddings.stats(),
+            "query_results": self.query_results.stats(),
+            "search_mode": self.search_mode,
+            "lexical_only": self.lexical_only,
+            "fused": self.fused,
+        }
+
+    def _rows(self, ids):
         return [
             {
                 "question": self.questions[i],
                 "answer": self.answers[i],
-                "role": self.metadata[i]["role"]
-            } for i in I[0]
-        ]
\ No newline at end of file
+                "role": self.role_of(i)
+            } for i in ids
+        ]
+
+    # ─── On-disk cache ─────────────────────────────────────────────────────────
+    # Layout of cache_dir:
+    #   manifest.json   model name (+ embedding backend), embedding dim and
+    #                   dataset hash (which also covers the index type, so
+    #                   switching index types rebuilds)
+    #   embeddings.npy  float32 (n, dim) matrix, memory-mapped on load
+    #   hashes.npy      uint8 (n, 20) SHA-1 of each question, row-aligned
+    #   index.faiss     serialized FAISS index
+
+    @property
+    def model_key(self):
+        # Backends produce slightly different vectors: switching one re-encodes
+        # rather than mixing them. fp32 torch keeps the bare model name, so
+        # existing caches stay valid
+        return self.model_name if self.backend == "torch" else f"{self.model_name}@{self.backend}"
+
+    def _row_hashes(self):
+        hashes = np.zeros((len(self.questions), 20), dtype=np.uint8)
+        for i, question in enumerate(self.questions.iter_raw()):  # stored as UTF-8 already
+            hashes[i] = np.frombuffer(hashlib.sha1(question).digest(), dtype=np.uint8)
+        return hashes
+
+    def _dataset_hash(self, row_hashes, live=None):
+        h = hashlib.sha1(self.model_key.encode("utf-8"))
+        h.update(json.dumps([self.index_type, self.index_params], sort_keys=True).encode("utf-8"))
+        h.update(row_hashes.tobytes())
+        if live is not None:
+            h.update(live.astype("int64").tobytes())
+        return h.hexdigest()
+
+    def _cache_path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _read_manifest(self):
+        try:
+            with open(self._cache_path("manifest.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_cached_index(self, dataset_hash, live=None):
+        """(index, embeddings) from the cache, or None if it doesn't match."""
+        manifest = self._read_manifest()
+        if not manifest or manifest.get("dataset_hash") != dataset_hash:
+            return None
+        try:
+            index = faiss.read_index(self._cache_path("index.faiss"))
+            index_factory.set_search_params(index, nprobe=self.nprobe, ef_search=self.ef_search)
+            embeddings = np.load(self._cache_path("embeddings.npy"), mmap_mode="r")
+        except Exception as e:
+            print(f"[⚠️ RAG Cache] Could not load cached index, rebuilding: {e}")
+            return None
+        if index.ntotal != (len(self.questions) if live is None else len(live)):
+            return None
+        return index, embeddings
+
+    @staticmethod
+    def _hash_keys(hashes):
+        # (n, 20) uint8 -> n comparable/sortable 20-byte keys
+        return np.ascontiguousarray(hashes).view(np.dtype((np.void, 20))).ravel()
+
+    def _encode_with_cache(self, row_hashes, live=None):
+        """Return the (n, dim) embedding matrix, re-encoding only live rows
+        whose question text is not already in the on-disk cache, plus a mask
+        of the rows it filled (None: all of them). With a cache dir the
+        matrix is written straight to a memory-mapped file (renamed into
+        place by _save_cache) rather than held in RAM."""
+        n = len(self.questions)
+        dim = self.model.get_sentence_embedding_dimension()
+        self._embeddings_tmp = None
+        if self.cache_dir and n:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._embeddings_tmp = self._cache_path(f".embeddings.{os.getpid()}.tmp")
+            embeddings = np.lib.format.open_memmap(self._embeddings_tmp, mode="w+", dtype="float32", shape=(n, dim))
+        else:
+            embeddings = np.zeros((n, dim), dtype="float32")
+        wanted = np.ones(n, dtype=bool)
+        if live is not None:
+            wanted[:] = False
+            wanted[live] = True
+        found = np.zeros(n, dtype=bool)
+
+        manifest = self._read_manifest() if self.cache_dir else None
+        if manifest and manifest.get("model") == self.model_key and manifest.get("dim") == dim:
+            try:
+                cached = np.load(self._cache_path("embeddings.npy"), mmap_mode="r")
+                cached_hashes = np.load(self._cache_path("hashes.npy"))
+                if len(cached) != len(cached_hashes):
+                    raise ValueError("embeddings.npy and hashes.npy are out of sync")
+                # Match rows to cached rows by question hash with a sorted
+                # lookup (no per-row Python dict)
+                cached_keys = self._hash_keys(cached_hashes)
+                keys = self._hash_keys(row_hashes)
+                found = np.zeros(n, dtype=bool)
+                if len(cached_keys):
+                    order = np.argsort(cached_keys)
+                    slots = np.minimum(np.searchsorted(cached_keys[order], keys), len(order) - 1)
+                    source = order[slots]
+                    found = cached_keys[source] == keys
+                hits = np.flatnonzero(found)
+                for start in range(0, len(hits), self.encode_batch):
+                    rows = hits[start:start + self.encode_batch]
+                    embeddings[rows] = cached[source[rows]]
+            except Exception as e:
+                print(f"[⚠️ RAG Cache] Ignoring unreadable embedding cache: {e}")
+                found = np.zeros(n, dtype=bool)
+
+        missing = np.flatnonzero(wanted & ~found)
+        if len(missing):
+            print(f"[🧠 RAG] Encoding {len(missing)} of {n} questions")
+            for start in range(0, len(missing), self.encode_batch):
+                rows = missing[start:start + self.encode_batch]
+                encoded = self.model.encode([self.questions[i] for i in rows], convert_to_tensor=False)
+                embeddings[rows] = np.asarray(encoded, dtype="float32")
+        return embeddings, None if live is None else (wanted | found)
+
+    def _save_cache(self, dataset_hash, row_hashes, index, embeddings):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write each file under a temp name and swap it in, so a crash (or a
+        # concurrent worker) never leaves a torn file behind. The manifest goes
+        # last: it is what marks the cache as valid.
+        def replace(name, write):
+            tmp = self._cache_path(f".{name}.{os.getpid()}.tmp")
+            write(tmp)
+            os.replace(tmp, self._cache_path(name))
+
+        def write_npy(array):
+            def write(tmp):
+                with open(tmp, "wb") as f:
+                    np.save(f, array)
+            return write
+
+        def write_manifest(tmp):
+            with open(tmp, "w") as f:
+                json.dump({
+                    "model": self.model_key,
+                    "dim": int(embeddings.shape[1]),
+                    "rows": len(self.questions),
+                    "dataset_hash": dataset_hash,
+                }, f)
+
+        def write_embeddings(tmp):
+            if self._embeddings_tmp:
+                # Already on disk as a memory-mapped .npy: just flush it
+                embeddings.flush()
+                os.replace(self._embeddings_tmp, tmp)
+                self._embeddings_tmp = None
+            else:
+                write_npy(np.ascontiguousarray(embeddings))(tmp)
+
+        try:
+            replace("embeddings.npy", write_embeddings)
+            replace("hashes.npy", write_npy(row_hashes))
+            replace("index.faiss", lambda tmp: faiss.write_index(index, tmp))
+            replace("manifest.json", write_manifest)
+        except Exception as e:
+            print(f"[⚠️ RAG Cache] Failed to persist index: {e}")
+        finally:
+            if self._embeddings_tmp:
+                # Unlinked only: the mapping stays valid for this process
+                os.remove(self._embeddings_tmp)
+                self._embeddings_tmp = None
@@ -0,0 +1,156 @@
+# backend/reference_store.py
+#
+# Reference answers for feedback scoring, keyed by normalized question text.
+# Dataset answers are used as-is; LLM-generated ones are persisted in a small
+# SQLite cache (LRU eviction) so each new question hits the LLM only once.
+#
+#   python reference_store.py prewarm                  # dataset questions without an answer
+#   python reference_store.py prewarm --questions q.txt
+#   python reference_store.py stats
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from dataset_store import BASE_DIR, DATASET_PATH, get_dataset
+
+DB_PATH = os.getenv("CAREERMATE_REFERENCE_DB", os.path.join(BASE_DIR, "data", "reference_cache.db"))
+MAX_ENTRIES = int(os.getenv("CAREERMATE_REFERENCE_CACHE_SIZE", "20000"))
+
+
+def normalize_question(text: str) -> str:
+    # Case, punctuation and spacing differences shouldn't cost an LLM call
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def load_dataset_questions(path=DATASET_PATH):
+    """Yield (question, answer-or-None) from the shared dataset store."""
+    for _, question, answer in get_dataset(path).iter_rows():
+        yield question, answer
+
+
+class ReferenceStore:
+    def __init__(self, generate, db_path=DB_PATH, dataset_path=DATASET_PATH, max_entries=MAX_ENTRIES):
+        self.generate = generate  # question -> answer; raises on failure
+        self.max_entries = max_entries
+        self.dataset_path = dataset_path
+        self.dataset_version = None
+        self.dataset_answers = {}
+        self._refresh_dataset_answers()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reference_answers ("
+            " key TEXT PRIMARY KEY, question TEXT NOT NULL, answer TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_reference_last_used ON reference_answers(last_used)")
+        self._lock = threading.Lock()
+        self.hits = {"dataset": 0, "cache": 0, "llm": 0}
+
+    def _refresh_dataset_answers(self):
+        # Rebuilt only when the dataset store has hot-reloaded the file
+        dataset = get_dataset(self.dataset_path)
+        if dataset.version == self.dataset_version:
+            return
+        answers = {}
+        for _, question, answer in dataset.iter_rows():
+            if answer:
+                answers[normalize_question(question)] = answer
+        self.dataset_answers = answers
+        self.dataset_version = dataset.version
+
+    def lookup(self, question: str):
+        """Known reference for a question, or None. Never calls the LLM."""
+        self._refresh_dataset_answers()
+        key = normalize_question(question)
+        answer = self.dataset_answers.get(key)
+        if answer is not None:
+            self.hits["dataset"] += 1
+            return answer
+        with self._lock:
+            row = self._db.execute("SELECT answer FROM reference_answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE reference_answers SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.hits["cache"] += 1
+        return row[0]
+
+    def get(self, question: str) -> str:
+        answer = self.lookup(question)
+        if answer is None:
+            answer = self.generate(question)
+            self.put(question, answer)
+            self.hits["llm"] += 1
+        return answer
+
+    def put(self, question: str, answer: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reference_answers (key, question, answer, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (normalize_question(question), question, answer, now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM reference_answers").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM reference_answers WHERE key IN"
+                " (SELECT key FROM reference_answers ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            (cached,) = self._db.execute("SELECT COUNT(*) FROM reference_answers").fetchone()
+        return {"dataset_answers": len(self.dataset_answers), "cached_answers": cached, "hits": dict(self.hits)}
+
+
+def prewarm(store: ReferenceStore, questions):
+    generated = failed = 0
+    for question in questions:
+        if store.lookup(question) is not None:
+            continue
+        try:
+            store.get(question)
+            generated += 1
+        except Exception as e:
+            failed += 1
+            print(f"[⚠️ Prewarm Failed] {question[:60]!r}: {e}")
+    print(f"✅ Prewarm done: {generated} generated, {failed} failed")
+
+
+def main():
+    from generate_feedback import request_reference_answer
+
+    parser = argparse.ArgumentParser(description="Reference-answer cache tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("prewarm", help="generate and cache references ahead of time")
+    warm.add_argument("--questions", help="extra file with one question per line")
+    sub.add_parser("stats", help="show cache size")
+    args = parser.parse_args()
+
+    store = ReferenceStore(request_reference_answer)
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+        return
+
+    questions = [q for q, answer in load_dataset_questions() if not answer]
+    if args.questions:
+        with open(args.questions, "r") as f:
+            questions.extend(line.strip() for line in f if line.strip())
+    prewarm(store, questions)
+
+
+if __name__ == "__main__":
+    main()
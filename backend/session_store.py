@@ -0,0 +1,185 @@
+# backend/session_store.py
+#
+# Interview sessions as append-only event logs: a session is rebuilt by
+# replaying its events ("start", "answer", "feedback"), so a write never
+# rewrites earlier state. Two backends (CAREERMATE_SESSION_BACKEND):
+#   • memory  bounded LRU/TTL cache, process-local (the old SESSIONS dict)
+#   • sqlite  shared WAL database; events are committed in batches by a
+#             BackgroundWriter, so all uvicorn workers see the same sessions
+#             and requests never wait on disk
+
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+
+from background_writer import BackgroundWriter, connect
+from metrics import register_collector
+from ttl_cache import TTLCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SESSION_BACKEND = os.getenv("CAREERMATE_SESSION_BACKEND", "sqlite")
+SESSION_DB = os.getenv("CAREERMATE_SESSION_DB", os.path.join(BASE_DIR, "data", "sessions.db"))
+SESSION_MAX = int(os.getenv("CAREERMATE_SESSION_MAX", "10000"))
+SESSION_TTL = float(os.getenv("CAREERMATE_SESSION_TTL", "86400"))  # seconds, 0 = keep forever
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS session_events ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, event_id TEXT NOT NULL UNIQUE,"
+    " session_id TEXT NOT NULL, kind TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_session_events_session ON session_events(session_id, id)",
+)
+
+
+def apply_event(session, kind, payload):
+    """Fold one event into a session dict ({"role", "qa": [...]})."""
+    if kind == "start":
+        return {"role": payload["role"], "qa": [{"question": payload["question"]}]}
+    if session is None:
+        return None
+    last = session["qa"][-1]
+    if kind == "answer":
+        last["answer"] = payload["answer"]
+    elif kind == "feedback":
+        last["feedback"] = payload["feedback"]
+    return session
+
+
+class MemorySessionStore:
+    def __init__(self, maxsize=SESSION_MAX, ttl=SESSION_TTL):
+        self._sessions = TTLCache(maxsize, ttl or None)
+        self._lock = threading.Lock()
+
+    def start(self, session_id, role, question):
+        self.append(session_id, "start", {"role": role, "question": question})
+
+    def get(self, session_id):
+        session = self._sessions.get(session_id)
+        return copy.deepcopy(session) if session is not None else None
+
+    def append(self, session_id, kind, payload) -> bool:
+        with self._lock:
+            current = None if kind == "start" else self._sessions.get(session_id)
+            session = apply_event(current, kind, payload)
+            if session is None:
+                return False
+            self._sessions.put(session_id, session)
+        return True
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._sessions.stats()}
+
+
+class SQLiteSessionStore:
+    def __init__(self, db_path=SESSION_DB, ttl=SESSION_TTL):
+        self.db_path = db_path
+        self.writer = get_writer(db_path)
+        self._db = connect(db_path)
+        self._lock = threading.Lock()
+        # Events queued but not yet committed, so this worker reads its own writes
+        self._pending = {}  # session_id -> [(event_id, kind, payload)]
+        if ttl:
+            self.writer.submit(
+                "DELETE FROM session_events WHERE session_id IN ("
+                " SELECT session_id FROM session_events WHERE kind = 'start' AND created_at < ?)",
+                (time.time() - ttl,),
+            )
+
+    def start(self, session_id, role, question):
+        self.append(session_id, "start", {"role": role, "question": question})
+
+    def append(self, session_id, kind, payload) -> bool:
+        event = (uuid.uuid4().hex, kind, payload)
+        with self._lock:
+            self._pending.setdefault(session_id, []).append(event)
+        self.writer.submit(
+            "INSERT INTO session_events (event_id, session_id, kind, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+            (event[0], session_id, kind, json.dumps(payload), time.time()),
+            on_done=lambda: self._committed(session_id, event),
+        )
+        return True
+
+    def _committed(self, session_id, event):
+        with self._lock:
+            events = self._pending.get(session_id)
+            if events is not None:
+                events.remove(event)
+                if not events:
+                    del self._pending[session_id]
+
+    def get(self, session_id):
+        # Snapshot pending events first: anything committed in between shows
+        # up in both and is skipped by event id
+        with self._lock:
+            pending = list(self._pending.get(session_id, ()))
+            rows = self._db.execute(
+                "SELECT event_id, kind, payload FROM session_events WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        committed = {event_id for event_id, _, _ in rows}
+        events = [(kind, json.loads(payload)) for _, kind, payload in rows]
+        events += [(kind, payload) for event_id, kind, payload in pending if event_id not in committed]
+
+        session = None
+        for kind, payload in events:
+            session = apply_event(session, kind, payload)
+        return session
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = self._db.execute(
+                "SELECT COUNT(*) FROM session_events WHERE kind = 'start'"
+            ).fetchone()[0]
+        return {"backend": "sqlite", "sessions": sessions, "writer": self.writer.stats()}
+
+
+# ─── Shared writer ─────────────────────────────────────────────────────────────
+# One writer thread per database file, shared by everything stored in it
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path=SESSION_DB) -> BackgroundWriter:
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            db = connect(db_path)
+            for statement in SCHEMA:
+                db.execute(statement)
+            db.close()
+            writer = _writers[db_path] = BackgroundWriter(db_path)
+    return writer
+
+
+def _collect_metrics():
+    with _writers_lock:
+        writers = list(_writers.items())
+    stats = [({"db": os.path.basename(path)}, writer.stats()) for path, writer in writers]
+    return [
+        ("careermate_db_writes_pending", "gauge", "Queued background DB writes", [(l, s["pending"]) for l, s in stats]),
+        ("careermate_db_writes_total", "counter", "Committed background DB statements", [(l, s["written"]) for l, s in stats]),
+        ("careermate_db_writes_failed_total", "counter", "Dropped background DB statements", [(l, s["failed"]) for l, s in stats]),
+    ]
+
+
+register_collector(_collect_metrics)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if SESSION_BACKEND == "memory":
+                    _store = MemorySessionStore()
+                elif SESSION_BACKEND == "sqlite":
+                    _store = SQLiteSessionStore()
+                else:
+                    raise ValueError(f"Unknown CAREERMATE_SESSION_BACKEND: {SESSION_BACKEND!r}")
+    return _store
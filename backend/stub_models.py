@@ -0,0 +1,81 @@
+# backend/stub_models.py
+#
+# Deterministic, dependency-free stand-ins for the embedding model and the
+# BERTScore scorer, for benchmarks that should measure the app rather than
+# torch (and run without downloading models):
+#   • StubEncoder: hashed bag-of-words vectors, same interface as
+#     SentenceTransformer.encode (similar texts -> similar vectors)
+#   • StubScorer:  token-overlap precision / recall / F1, same interface as
+#     bert_scorer.FeedbackScorer
+# install_stub_models() swaps them into the app before its first request.
+
+import re
+import time
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class StubEncoder:
+    def __init__(self, dim=384, encode_ms=0.0):
+        self.dim = dim
+        self.encode_ms = encode_ms  # optional simulated cost per call
+        self._buckets = {}
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def _bucket(self, token):
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            bucket = self._buckets[token] = zlib.crc32(token.encode("utf-8")) % self.dim
+        return bucket
+
+    def encode(self, texts, convert_to_tensor=False, **kwargs):
+        if isinstance(texts, str):
+            return self.encode([texts])[0]
+        if self.encode_ms:
+            time.sleep(self.encode_ms / 1000.0)
+        rows, cols = [], []
+        for i, text in enumerate(texts):
+            for token in TOKEN_RE.findall(str(text).lower()):
+                rows.append(i)
+                cols.append(self._bucket(token))
+        vecs = np.zeros((len(texts), self.dim), dtype="float32")
+        np.add.at(vecs, (rows, cols), 1.0)
+        return vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+
+
+class StubScorer:
+    def score_pairs(self, pairs):
+        results = []
+        for answer, reference in pairs:
+            a = set(TOKEN_RE.findall(answer.lower()))
+            r = set(TOKEN_RE.findall(reference.lower()))
+            common = len(a & r)
+            p = common / len(a) if a else 0.0
+            rec = common / len(r) if r else 0.0
+            results.append((p, rec, 2 * p * rec / (p + rec) if p + rec else 0.0))
+        return results
+
+    def score(self, answer, reference):
+        return self.score_pairs([(answer, reference)])[0]
+
+
+def install_stub_models(encode_ms=0.0):
+    """Make the API use the stubs (call before the first request / warm-up)."""
+    import bert_scorer
+    import interview_api
+    import rag_engine
+
+    encoder = StubEncoder(encode_ms=encode_ms)
+
+    def stub_engine(*args, **kwargs):
+        # No on-disk cache: stub vectors must never replace the real index
+        kwargs.update(model_name="stub-hashing", model=encoder, cache_dir=None)
+        return rag_engine.RAGEngine(**kwargs)
+
+    bert_scorer._scorer = StubScorer()
+    interview_api.RAGEngine = stub_engine
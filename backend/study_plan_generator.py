@@ -1,44 +1,41 @@
-import json
-import os
 import re
 import urllib.parse
-import difflib
+import threading
 
-# Load dataset
-def load_question_data(filepath=None):
-    if filepath is None:
-        filepath = os.path.join(os.path.dirname(__file__), "data", "careermate_full_dataset.json")
-    with open(filepath, "r") as f:
-        return json.load(f)
+from dataset_store import get_dataset
+from metrics import cache_samples, register_collector
+from topic_index import TopicIndex
+
+# Coursera course slugs by keyword (also the topic list for batch_pipeline.py)
+COURSERA_COURSES = {
+    "overfitting": "regularization-in-machine-learning",
+    "missing data": "data-cleaning",
+    "neural network": "neural-networks-deep-learning",
+    "gradient descent": "machine-learning",
+    "bias variance": "intro-to-machine-learning",
+    "classification": "classification-models",
+    "clustering": "unsupervised-learning",
+    "decision tree": "intro-to-decision-trees",
+    "support vector machine": "machine-learning-svm",
+    "deep learning": "deep-learning-specialization",
+    "feature engineering": "feature-engineering",
+    "regression": "regression-models",
+    "recommendation system": "recommender-systems",
+    "nlp": "natural-language-processing",
+    "time series": "time-series-forecasting",
+    "computer vision": "computer-vision-basics",
+    "data pipeline": "data-science-methodology",
+    "data visualization": "data-visualization",
+    "pca": "dimensionality-reduction",
+    "eda": "data-analysis-with-python",
+    "imbalanced dataset": "machine-learning-data-imbalance"
+}
 
 # Coursera direct course mapper + fallback
 def get_direct_coursera_course(query: str) -> str:
     base = "https://www.coursera.org/learn/"
-    mapping = {
-        "overfitting": "regularization-in-machine-learning",
-        "missing data": "data-cleaning",
-        "neural network": "neural-networks-deep-learning",
-        "gradient descent": "machine-learning",
-        "bias variance": "intro-to-machine-learning",
-        "classification": "classification-models",
-        "clustering": "unsupervised-learning",
-        "decision tree": "intro-to-decision-trees",
-        "support vector machine": "machine-learning-svm",
-        "deep learning": "deep-learning-specialization",
-        "feature engineering": "feature-engineering",
-        "regression": "regression-models",
-        "recommendation system": "recommender-systems",
-        "nlp": "natural-language-processing",
-        "time series": "time-series-forecasting",
-        "computer vision": "computer-vision-basics",
-        "data pipeline": "data-science-methodology",
-        "data visualization": "data-visualization",
-        "pca": "dimensionality-reduction",
-        "eda": "data-analysis-with-python",
-        "imbalanced dataset": "machine-learning-data-imbalance"
-    }
 
-    for keyword, slug in mapping.items():
+    for keyword, slug in COURSERA_COURSES.items():
         if keyword in query.lower():
             return f"{base}{slug}"
 
@@ -57,8 +54,32 @@ def suggest_flashcard_or_demo(question: str) -> str:
         return "Demo Q: What methods address class imbalance in classification problems?"
     return "Answer a related interview question or flashcard."
 
+# Weak-topic matching index over the shared dataset, built once (at startup or
+# first use) and rebuilt only when the dataset is hot-reloaded
+_topic_index = None  # (dataset snapshot, TopicIndex over it)
+_topic_index_lock = threading.Lock()
+
+def get_topic_index():
+    global _topic_index
+    dataset = get_dataset()
+    current = _topic_index
+    if current is None or current[0].version != dataset.version:
+        with _topic_index_lock:
+            current = _topic_index
+            if current is None or current[0].version != dataset.version:
+                current = _topic_index = (dataset, TopicIndex(dataset.questions_lower))
+    return current
+
+def _collect_metrics():
+    current = _topic_index
+    return cache_samples("weak_topic_keywords", current[1].keyword_cache.stats()) if current else []
+
+register_collector(_collect_metrics)
+
 # 🔍 Fuzzy topic extractor
-def extract_weak_topics(score_data, threshold=0.7):
+def extract_weak_topics(score_data, threshold=0.7, topic_index=None):
+    # topic_index: (dataset, TopicIndex) to match against; defaults to the
+    # shared one over the live dataset
     keywords = [
         item["question"].strip().lower()
         for item in score_data
@@ -68,22 +89,29 @@ def extract_weak_topics(score_data, threshold=0.7):
         and item.get("f1", 1.0) < threshold
     ]
 
-    dataset = load_question_data()
+    # F1 reported for a keyword: the first entry whose question it contains
+    entries = [
+        (entry["question"].strip().lower(), entry.get("f1", 0.0))
+        for entry in score_data
+        if isinstance(entry, dict) and isinstance(entry.get("question"), str)
+    ]
+    keyword_f1 = {
+        keyword: next((f1 for question, f1 in entries if question in keyword), 0.0)
+        for keyword in set(keywords)
+    }
+
+    dataset, index = topic_index or get_topic_index()
     weak_topics = []
 
-    for role, qas in dataset.items():
-        for item in qas:
-            question_text = item.get("question", "").strip().lower()
-            for keyword in keywords:
-                sim_score = difflib.SequenceMatcher(None, keyword, question_text).ratio()
-                if keyword in question_text or question_text in keyword or sim_score > 0.75:
-                    weak_topics.append({
-                        "question": item["question"],
-                        "answer": item["answer"],
-                        "role": role,
-                        "f1": next((entry["f1"] for entry in score_data if entry["question"].strip().lower() in keyword), 0.0)
-                    })
-                    break
+    # Substring or difflib ratio > 0.75, same as a full scan, but only
+    # candidate rows surviving the index's bounds are actually compared
+    for row, pos in index.match(keywords):
+        weak_topics.append({
+            "question": dataset.questions[row],
+            "answer": dataset.answer(row),
+            "role": dataset.role_of(row),
+            "f1": keyword_f1[keywords[pos]]
+        })
 
     # 🛑 Fallback if nothing matched
     if not weak_topics:
@@ -4,7 +4,7 @@ from rag_engine import RAGEngine
 
 # Initialize RAG engine
 rag = RAGEngine()
-rag.load_data("data/questions_by_role.json")
+rag.load_data()  # data/careermate_full_dataset.json
 rag.build_index()
 
 # Sample query
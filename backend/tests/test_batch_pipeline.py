@@ -0,0 +1,104 @@
+# backend/tests/test_batch_pipeline.py
+
+import asyncio
+import json
+
+import pytest
+
+import batch_pipeline
+from batch_pipeline import Checkpoint, Pipeline
+from content_store import ContentStore
+
+
+class FakeLLM:
+    def __init__(self, fail=()):
+        self.fail = set(fail)  # topics whose generation raises
+        self.calls = []
+
+    async def generate(self, prompt, model=None):
+        topic = next(t for t in TOPICS if f"'{t}'" in prompt or t in prompt)
+        self.calls.append(topic)
+        if topic in self.fail:
+            raise RuntimeError("LLM unavailable")
+        return f"Question: What is {topic}?\nAnswer: {topic} explained."
+
+
+TOPICS = [f"topic {i:02d}" for i in range(10)]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ContentStore(str(tmp_path / "content.db"))
+    monkeypatch.setattr(batch_pipeline, "get_content_store", lambda: store)
+    monkeypatch.setattr(batch_pipeline, "get_reference_store", lambda: None)  # flashcards only
+    return store
+
+
+def _run(monkeypatch, llm, checkpoint_path, concurrency=3):
+    monkeypatch.setattr(batch_pipeline, "get_llm_client", lambda: llm)
+    pipeline = Pipeline(concurrency)
+    checkpoint = Checkpoint(str(checkpoint_path), "inputs.jsonl")
+    items = ({"kind": "flashcard", "text": topic} for topic in TOPICS)
+    asyncio.run(pipeline.run(items, checkpoint))
+    return pipeline, checkpoint
+
+
+def test_failed_items_are_retried_on_resume(store, monkeypatch, tmp_path):
+    checkpoint_path = tmp_path / "inputs.ckpt"
+    pipeline, checkpoint = _run(monkeypatch, FakeLLM(fail=TOPICS), checkpoint_path)
+    assert pipeline.counts == {"generated": 0, "skipped": 0, "failed": 10}
+    assert store.stats() == {}
+    assert json.loads(checkpoint_path.read_text())["failed"] == list(range(10))
+
+    llm = FakeLLM()
+    pipeline, checkpoint = _run(monkeypatch, llm, checkpoint_path)
+    assert pipeline.counts["generated"] == 10
+    assert sorted(llm.calls) == TOPICS
+    assert store.stats() == {"flashcard": 10}
+    assert checkpoint.failed == set()
+
+
+def test_resume_skips_finished_items_and_retries_only_failures(store, monkeypatch, tmp_path):
+    checkpoint_path = tmp_path / "inputs.ckpt"
+    _run(monkeypatch, FakeLLM(fail={"topic 03", "topic 07"}), checkpoint_path)
+    assert json.loads(checkpoint_path.read_text()) == {"source": "inputs.jsonl", "done": 10, "failed": [3, 7]}
+
+    llm = FakeLLM()
+    pipeline, _ = _run(monkeypatch, llm, checkpoint_path)
+    assert sorted(llm.calls) == ["topic 03", "topic 07"]
+    assert pipeline.counts == {"generated": 2, "skipped": 0, "failed": 0}
+    assert json.loads(checkpoint_path.read_text())["failed"] == []
+
+
+def test_error_outside_generation_fails_the_item_and_keeps_draining(store, monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_pipeline, "get_llm_client", lambda: FakeLLM())
+    pipeline = Pipeline(concurrency=1)  # one dead worker would block the producer for good
+    is_done = pipeline.is_done
+
+    def flaky_is_done(kind, text):
+        if text == "topic 03":
+            raise OSError("database is locked")
+        return is_done(kind, text)
+
+    pipeline.is_done = flaky_is_done
+    checkpoint = Checkpoint(str(tmp_path / "inputs.ckpt"), "inputs.jsonl")
+    items = ({"kind": "flashcard", "text": topic} for topic in TOPICS)
+    asyncio.run(asyncio.wait_for(pipeline.run(items, checkpoint), timeout=10))
+    assert pipeline.counts == {"generated": 9, "skipped": 0, "failed": 1}
+    assert (checkpoint.done, checkpoint.failed) == (10, {3})
+
+
+def test_checkpoint_of_another_source_is_ignored(tmp_path):
+    path = tmp_path / "inputs.ckpt"
+    path.write_text(json.dumps({"source": "old.jsonl", "done": 5, "failed": [1]}))
+    checkpoint = Checkpoint(str(path), "inputs.jsonl")
+    assert (checkpoint.done, checkpoint.failed) == (0, set())
+
+
+def test_content_store_get_many_fans_out_alike_texts(tmp_path):
+    store = ContentStore(str(tmp_path / "content.db"))
+    store.put("flashcard", "PCA", {"question": "What is PCA?", "answer": "Projection."})
+    found = store.get_many("flashcard", ["PCA", "pca", "  Pca ", "t-SNE"])
+    assert set(found) == {"PCA", "pca", "  Pca "}
+    assert found["pca"] == found["PCA"] == {"question": "What is PCA?", "answer": "Projection."}
+    assert store.get("reference", "PCA") is None  # kinds don't share entries
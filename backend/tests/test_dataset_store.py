@@ -0,0 +1,95 @@
+# backend/tests/test_dataset_store.py
+
+import json
+
+import pytest
+
+from dataset_store import DatasetStore, iter_dataset_file, load_dataset_file
+
+ROWS = [
+    ("Data Scientist", "What is overfitting?", "Fitting noise."),
+    ("Data Scientist", "Explain PCA.", None),
+    ("Backend Developer", "What is an index?", "A lookup structure."),
+]
+
+
+def _jsonl_rows(rows):
+    return [{"role": r, "question": q, "answer": a} for r, q, a in rows]
+
+
+def _flat(rows):
+    return [{"industry": r, "interview_question": q, "sample_response": a or ""} for r, q, a in rows]
+
+
+def _grouped(rows):
+    data = {}
+    for r, q, a in rows:
+        data.setdefault(r, []).append({"question": q, "answer": a or ""})
+    return data
+
+
+def test_dataset_snapshot(write_jsonl):
+    dataset = load_dataset_file(write_jsonl(_jsonl_rows(ROWS)))
+    assert len(dataset) == 3
+    assert list(dataset.iter_rows()) == ROWS
+    assert dataset.answer(1) is None
+    assert list(dataset.role_rows("Data Scientist")) == [0, 1]
+    assert dataset.role_rows("Unknown") is None
+    assert dataset.questions_lower[1] == "explain pca."
+
+
+def test_reload_swaps_snapshot_and_notifies_listeners(write_jsonl):
+    path = write_jsonl(_jsonl_rows(ROWS[:1]))
+    store = DatasetStore(path, reload_interval=0)
+    old = store.get()
+    seen = []
+
+    def broken(dataset):
+        raise RuntimeError("listener bug")
+
+    store.on_reload(broken)
+    store.on_reload(seen.append)
+    write_jsonl(_jsonl_rows(ROWS))
+    store.reload()
+
+    # A failing listener doesn't keep the others from running
+    assert seen == [store.get()]
+    assert store.get().version == old.version + 1
+    assert len(store.get()) == 3
+    # Readers holding the old snapshot keep a consistent copy
+    assert len(old) == 1
+
+
+# ─── Streaming parser ─────────────────────────────────────────────────────────
+@pytest.mark.parametrize("layout", ["flat", "grouped"])
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_streams_json_layouts(tmp_path, layout, indent, chunk_size):
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps(_flat(ROWS) if layout == "flat" else _grouped(ROWS), indent=indent))
+    # A tiny chunk size makes every element straddle buffer refills
+    assert list(iter_dataset_file(str(path), chunk_size=chunk_size)) == ROWS
+
+
+def test_streams_jsonl_with_either_field_names(write_jsonl):
+    path = write_jsonl([
+        {"role": "Data Scientist", "question": "What is overfitting?", "answer": "Fitting noise."},
+        {"industry": "Data Scientist", "interview_question": "Explain PCA."},
+        {"role": "Backend Developer", "question": "What is an index?", "sample_response": "A lookup structure."},
+        {"role": "Skipped", "answer": "no question"},
+    ])
+    assert list(iter_dataset_file(path)) == ROWS
+
+
+def test_empty_containers(tmp_path):
+    for text in ("[]", "{}", '{"Role": []}'):
+        path = tmp_path / "empty.json"
+        path.write_text(text)
+        assert list(iter_dataset_file(str(path))) == []
+
+
+def test_truncated_json_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps(_flat(ROWS))[:-20])
+    with pytest.raises(ValueError):
+        list(iter_dataset_file(str(path), chunk_size=16))
@@ -0,0 +1,30 @@
+# backend/tests/test_history_store.py
+
+from history_store import HistoryStore, parse_date
+
+
+def _result(role, date, scores):
+    return {
+        "role": role, "date": date,
+        "questions": [{"question": q, "f1": f1, "precision": f1, "recall": f1} for q, f1 in scores],
+    }
+
+
+def test_history_round_trip(tmp_path):
+    history = HistoryStore(str(tmp_path / "sessions.db"))
+    history.save(_result("Data Scientist", "2025-07-01T10:00:00", [("What is PCA?", 0.4), ("What is SQL?", 0.9)]))
+    history.save(_result("Data Scientist", "2025-07-02T10:00:00", [("what is pca", 0.6)]))
+    history.save(_result("Backend Developer", "2025-07-03T10:00:00", [("What is an index?", 0.5)]))
+
+    page = history.page(limit=2)
+    assert page["total"] == 3 and [item["date"] for item in page["items"]] == ["2025-07-03T10:00:00", "2025-07-02T10:00:00"]
+    assert history.page(role="Data Scientist", date_to=parse_date("2025-07-01", end=True))["total"] == 1
+
+    stats = history.question_stats(role="Data Scientist")
+    assert [(s["attempts"], s["avg_f1"]) for s in stats] == [(2, 0.5), (1, 0.9)]  # "PCA" variants share a key
+    assert [s["question"].lower().rstrip("?") for s in history.weakest_topics()] == ["what is pca", "what is an index"]
+
+    summary = history.summary()
+    assert summary["tests"] == 3
+    assert {r["role"]: r["tests"] for r in summary["by_role"]} == {"Data Scientist": 2, "Backend Developer": 1}
+    assert history.weak_score_data(role="Backend Developer") == [{"question": "What is an index?", "f1": 0.5}]
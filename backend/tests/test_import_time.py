@@ -0,0 +1,45 @@
+# backend/tests/test_import_time.py
+#
+# Import-time budget for the app: `import main` must stay fast and must not
+# pull in the heavy ML stacks, which are loaded lazily / during warm-up.
+# Each run is a fresh interpreter; the best of three is compared with the
+# budget (CAREERMATE_IMPORT_BUDGET, default 3 s).
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = float(os.getenv("CAREERMATE_IMPORT_BUDGET", "3.0"))
+RUNS = 3
+
+# Modules that must only load on first use of a model
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers", "bert_score")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _import_main():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (HEAVY_MODULES,)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_import_main_is_fast_and_skips_heavy_modules():
+    results = [_import_main() for _ in range(RUNS)]
+    loaded = sorted({m for r in results for m in r["loaded"]})
+    assert not loaded, f"heavy modules imported eagerly: {', '.join(loaded)}"
+    seconds = min(r["seconds"] for r in results)
+    assert seconds <= BUDGET, (
+        f"import main took {seconds:.2f}s (budget {BUDGET:.2f}s): "
+        "something heavy is being imported or built at import time"
+    )
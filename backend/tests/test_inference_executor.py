@@ -0,0 +1,49 @@
+# backend/tests/test_inference_executor.py
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import interview_api
+import main
+from inference_executor import InferenceExecutor, InferenceOverloaded
+
+
+@pytest.fixture
+def busy_executor():
+    """One worker, one slot, and that slot taken until the test ends."""
+    executor = InferenceExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    yield executor
+    release.set()
+
+
+def test_full_queue_rejects_until_a_slot_frees_up(busy_executor):
+    with pytest.raises(InferenceOverloaded) as e:
+        busy_executor.submit(lambda: None)
+    assert e.value.retry_after >= 1
+    with pytest.raises(InferenceOverloaded):
+        with busy_executor.slot():
+            pass
+    assert busy_executor.stats()["rejected"] == 2
+
+
+def test_cancelled_task_frees_its_slot():
+    executor = InferenceExecutor(workers=1, max_pending=2)
+    release = threading.Event()
+    executor.submit(release.wait)
+    queued = executor.submit(lambda: None)
+    assert queued.cancel()
+    assert executor.stats()["pending"] == 1
+    release.set()
+
+
+def test_full_queue_returns_503_with_retry_after(busy_executor, monkeypatch):
+    monkeypatch.setattr(interview_api, "inference", busy_executor)
+    # No `with`: the model warm-up in the app's lifespan doesn't run
+    response = TestClient(main.app).get("/generate-test", params={"role": "Data Scientist"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert "retry in" in response.json()["detail"]
@@ -0,0 +1,76 @@
+# backend/tests/test_interview_api.py
+#
+# The interview router's wiring, with a StubEncoder engine in place of the
+# real model and a temporary curation log.
+
+import pytest
+
+import interview_api
+from curation_log import CurationLog
+from dataset_store import load_dataset_file
+from rag_engine import RAGEngine
+from stub_models import StubEncoder
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path, write_jsonl):
+    """Point interview_api at a dataset file; returns write(rows) -> Dataset."""
+    path = write_jsonl([])
+
+    def build():
+        rag = RAGEngine(model=StubEncoder(dim=64))
+        rag.load_data(path)
+        rag.build_index()
+        return rag
+
+    def write(rows):
+        write_jsonl([{"role": r, "question": q, "answer": "An answer."} for r, q in rows])
+        return load_dataset_file(path)
+
+    log = CurationLog(str(tmp_path / "curated.jsonl"))
+    monkeypatch.setattr(interview_api, "_build_rag", build)
+    monkeypatch.setattr(interview_api, "get_curation_log", lambda: log)
+    monkeypatch.setattr(interview_api, "_rag", None)
+    monkeypatch.setattr(interview_api, "_search_batcher", None)
+    yield write
+    interview_api.test_engine.pools.clear()
+    interview_api.test_engine.tests.clear()
+    interview_api.question_pool.forget(list(interview_api.question_pool._roles))
+
+
+# ─── Dataset hot reload ───────────────────────────────────────────────────────
+def test_dataset_reload_reindexes_and_drops_derived_pools(api):
+    api([("Data Scientist", "What is overfitting?")])
+    rag = interview_api.get_rag()
+    batcher = interview_api._search_batcher
+    assert interview_api.test_engine.pool("Data Scientist")
+    # An LLM question pool for a role the dataset doesn't cover yet
+    interview_api.question_pool.remember("backend developer", "How do you version an API?")
+    assert batcher.search("index", k=3, role="Backend Developer") == []
+
+    dataset = api([("Data Scientist", "What is overfitting?"), ("Backend Developer", "What is an index?")])
+    interview_api._on_dataset_reload(dataset)
+
+    assert interview_api.get_rag() is not rag
+    # Searches already routed through the batcher now see the new rows
+    assert interview_api._search_batcher is batcher
+    assert [r["question"] for r in batcher.search("index", k=3, role="Backend Developer")] == ["What is an index?"]
+    assert len(interview_api.test_engine.pools) == 0
+    assert interview_api.question_pool.stats()["roles"] == 0
+
+
+def test_dataset_reload_before_first_search_builds_nothing(api):
+    dataset = api([("Data Scientist", "What is overfitting?")])
+    interview_api._on_dataset_reload(dataset)
+    assert not interview_api.rag_ready()
+
+
+def test_admin_pushes_survive_a_reload(api):
+    api([("Data Scientist", "What is overfitting?")])
+    interview_api._curate(
+        [{"op": "upsert", "role": "Data Scientist", "question": "What is bagging?", "answer": "Bootstrap."}],
+        lambda rag: rag.upsert([{"role": "Data Scientist", "question": "What is bagging?", "answer": "Bootstrap."}]),
+    )
+    dataset = api([("Data Scientist", "What is overfitting?"), ("Data Scientist", "What is a p-value?")])
+    interview_api._on_dataset_reload(dataset)
+    assert interview_api.get_rag().live_count() == 3
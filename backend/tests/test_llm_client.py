@@ -0,0 +1,121 @@
+# backend/tests/test_llm_client.py
+#
+# OllamaClient against fake_ollama.py's server on a local port.
+
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from fake_ollama import FakeOllamaHandler
+from llm_client import LLMError, OllamaClient
+
+
+def _serve(**attrs):
+    """Fake Ollama with handler attributes overridden; returns (server, url, handler class)."""
+    handler = type("Handler", (TestHandler,), {"requests": 0, "fail_first": 0, "streams": [], **attrs})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", handler
+
+
+class TestHandler(FakeOllamaHandler):
+    __test__ = False  # not a pytest class
+
+    def do_POST(self):
+        cls = type(self)
+        cls.requests += 1
+        if cls.requests <= cls.fail_first:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            return self._send_json(503, {"error": "overloaded"})
+        self.chunks = 0
+        start = time.monotonic()
+        super().do_POST()
+        cls.streams.append((self.chunks, time.monotonic() - start))
+
+    def _write_chunk(self, text):
+        super()._write_chunk(text)
+        self.chunks += 1
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**attrs):
+        server, url, handler = _serve(**attrs)
+        servers.append(server)
+        return url, handler
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_retries_503_then_succeeds(serve):
+    url, handler = serve(fail_first=2)
+    client = OllamaClient(url, max_retries=2, backoff=0.01)
+    try:
+        text = client.generate_sync("Give an interview answer")
+    finally:
+        client.close()
+    assert "data pipeline" in text
+    assert handler.requests == 3
+    assert client.metrics.retries == 2
+
+
+def test_gives_up_after_max_retries(serve):
+    url, handler = serve(fail_first=10)
+    client = OllamaClient(url, max_retries=1, backoff=0.01)
+    try:
+        with pytest.raises(LLMError, match="503"):
+            client.generate_sync("Give an interview answer")
+    finally:
+        client.close()
+    assert handler.requests == 2
+
+
+def test_timeout_raises_llm_error(serve):
+    url, _ = serve(delay=2.0)
+    client = OllamaClient(url, timeout=0.2, max_retries=0)
+    start = time.monotonic()
+    try:
+        with pytest.raises(LLMError):
+            client.generate_sync("Give an interview answer")
+    finally:
+        client.close()
+    assert time.monotonic() - start < 1.5
+
+
+def test_closing_a_stream_early_cancels_the_upstream_request(serve):
+    url, handler = serve(delay=3.0)  # ~25 tokens, ~120 ms apart
+    client = OllamaClient(url, max_retries=0)
+
+    async def read_two_and_wait():
+        tokens = []
+        stream = client.stream("Give an interview answer")
+        async for token in stream:
+            tokens.append(token)
+            if len(tokens) == 2:
+                break
+        await stream.aclose()
+        # Wait with this loop still running (and before close()), so only
+        # the stream's own cancellation can end the upstream request
+        deadline = time.monotonic() + 1.5
+        while not handler.streams and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        return tokens
+
+    try:
+        assert len(asyncio.run(read_two_and_wait())) == 2
+        # The fake stops writing once the connection is gone, long before
+        # its ~25 tokens (3 s) would have been sent
+        assert handler.streams, "upstream request still running"
+        chunks, seconds = handler.streams[0]
+        assert chunks < 10 and seconds < 1.5
+    finally:
+        client.close()
@@ -0,0 +1,92 @@
+# backend/tests/test_metrics.py
+
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main
+import metrics
+from metrics import Counter, Histogram, MetricsMiddleware
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Metrics created in a test are dropped from the global registry after it."""
+    monkeypatch.setattr(metrics, "_metrics", list(metrics._metrics))
+    monkeypatch.setattr(metrics, "_collectors", list(metrics._collectors))
+
+
+def _samples(text, name):
+    """{labels string: value} for one metric's sample lines."""
+    return {m.group(1) or "": float(m.group(2)) for m in re.finditer(rf"^{name}(\{{.*\}})? (\S+)$", text, re.M)}
+
+
+# ─── Exposition format ────────────────────────────────────────────────────────
+def test_histogram_renders_cumulative_buckets_sum_and_count(registry):
+    hist = Histogram("careermate_test_seconds", "Test latency", ("stage",), buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.5, 5.0):
+        hist.observe(seconds, stage="encode")
+    text = metrics.render()
+
+    assert "# HELP careermate_test_seconds Test latency\n# TYPE careermate_test_seconds histogram\n" in text
+    assert _samples(text, "careermate_test_seconds_bucket") == {
+        '{stage="encode",le="0.1"}': 1,
+        '{stage="encode",le="1.0"}': 3,
+        '{stage="encode",le="+Inf"}': 4,
+    }
+    assert _samples(text, "careermate_test_seconds_sum") == {'{stage="encode"}': 6.05}
+    assert _samples(text, "careermate_test_seconds_count") == {'{stage="encode"}': 4}
+    assert text.endswith("\n")
+
+
+def test_counter_and_collector_samples_escape_label_values(registry):
+    counter = Counter("careermate_test_total", "Test events", ("reason",))
+    counter.inc(reason='bad "quote"\nline')
+    counter.inc(2, reason='bad "quote"\nline')
+    metrics.register_collector(lambda: metrics.cache_samples("test", {"hits": 3, "misses": 1, "size": 2}))
+
+    def broken():
+        raise RuntimeError("collector bug")
+
+    metrics.register_collector(broken)
+    text = metrics.render()  # a failing collector doesn't break the scrape
+
+    assert "# TYPE careermate_test_total counter" in text
+    assert _samples(text, "careermate_test_total") == {'{reason="bad \\"quote\\"\\nline"}': 3}
+    assert _samples(text, "careermate_cache_hits_total")['{cache="test"}'] == 3
+    assert "# TYPE careermate_cache_entries gauge" in text
+
+
+# ─── Per-route HTTP metrics ───────────────────────────────────────────────────
+def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/sessions/{session_id}")
+    async def session(session_id: str):
+        return {"id": session_id}
+
+    client = TestClient(app)
+    before = metrics.REQUEST_LATENCY.count(method="GET", route="/sessions/{session_id}")
+    for session_id in ("a", "b", "c"):
+        assert client.get(f"/sessions/{session_id}").status_code == 200
+    client.get("/no-such-page")
+
+    # One series for every session id, and one for all unknown paths
+    assert metrics.REQUEST_LATENCY.count(method="GET", route="/sessions/{session_id}") == before + 3
+    assert metrics.REQUESTS.value(method="GET", route="<unmatched>", status=404) >= 1
+    assert 'route="/sessions/a"' not in metrics.render()
+
+
+def test_metrics_endpoint_serves_the_app_route_histograms():
+    client = TestClient(main.app)
+    assert client.get("/healthz").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text, "careermate_http_request_duration_seconds_count")
+    assert samples['{method="GET",route="/healthz"}'] >= 1
+    assert _samples(response.text, "careermate_http_requests_total")['{method="GET",route="/healthz",status="200"}'] >= 1
@@ -0,0 +1,112 @@
+# backend/tests/test_question_pool.py
+
+import threading
+import time
+
+import pytest
+
+from question_pool import QuestionPool
+from stub_models import StubEncoder
+
+FALLBACKS = ["Tell me about a project you are proud of.", "How do you keep your skills current?"]
+
+
+class FakeGenerator:
+    """role -> the next scripted question; raises once the script runs out."""
+
+    def __init__(self, questions):
+        self.questions = list(questions)
+        self.roles = []
+        self._lock = threading.Lock()
+
+    def __call__(self, role):
+        with self._lock:
+            self.roles.append(role)
+            if not self.questions:
+                raise RuntimeError("LLM unavailable")
+            return self.questions.pop(0)
+
+
+def _pool(generate, **kwargs):
+    encoder = StubEncoder(dim=256)
+    return QuestionPool(lambda texts: encoder.encode(texts), generate, lambda role: FALLBACKS, **kwargs)
+
+
+def _wait_for_refills(pool, timeout=5):
+    deadline = time.monotonic() + timeout
+    while pool.stats()["refilling"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not pool.stats()["refilling"]
+
+
+def test_take_refills_the_pool_in_the_background():
+    generate = FakeGenerator([f"How would you design system number {i}?" for i in range(10)])
+    pool = _pool(generate, size=3)
+    assert pool.take("Game Designer") is None  # cold
+    _wait_for_refills(pool)
+    assert pool.stats()["ready"] == 3
+
+    question = pool.take("Game Designer")
+    assert question == "How would you design system number 0?"
+    _wait_for_refills(pool)
+    assert pool.stats()["ready"] == 3
+    assert len(generate.roles) == 4
+
+
+def test_near_duplicates_are_rejected():
+    pool = _pool(FakeGenerator([]))
+    assert pool.accept("Game Designer", "What makes a level fun to play?")
+    # Same words in another case and order: same stub embedding
+    assert not pool.accept("Game Designer", "what makes a LEVEL fun to play")
+    assert pool.accept("Game Designer", "How do you balance an in-game economy?")
+    # Novelty is tracked per role
+    assert pool.accept("Sound Engineer", "What makes a level fun to play?")
+
+
+def test_refill_skips_duplicates_and_gives_up_after_repeated_failures():
+    generate = FakeGenerator(["What makes a level fun?"] * 20)
+    pool = _pool(generate, size=3)
+    pool.refill("Game Designer")
+    _wait_for_refills(pool)
+    assert pool.stats()["ready"] == 1
+    assert len(generate.roles) == 7  # one accepted, then size * 2 rejects
+
+
+def test_get_falls_back_to_an_unused_template():
+    pool = _pool(FakeGenerator([]), size=0)
+    assert pool.get("Game Designer") == FALLBACKS[0]
+    assert pool.get("Game Designer") == FALLBACKS[1]
+    assert pool.get("Game Designer") == FALLBACKS[0]  # all used: repeat rather than fail
+
+
+def test_role_spellings_share_one_pool():
+    generate = FakeGenerator([f"How would you design system number {i}?" for i in range(10)])
+    pool = _pool(generate, size=2)
+    pool.take("  game   DESIGNER ")
+    _wait_for_refills(pool)
+    assert pool.take("Game Designer") is not None
+    assert pool.stats()["roles"] == 1
+    assert set(generate.roles) == {"game DESIGNER"}
+
+
+@pytest.mark.parametrize("idle_seconds, admitted", [(3600, False), (0, True)])
+def test_new_roles_wait_for_an_idle_slot(idle_seconds, admitted):
+    generate = FakeGenerator([f"How would you design system number {i}?" for i in range(10)])
+    pool = _pool(generate, size=1, max_roles=2, idle_seconds=idle_seconds)
+    for role in ("Game Designer", "Sound Engineer"):
+        pool.take(role)
+    _wait_for_refills(pool)
+    calls = len(generate.roles)
+
+    assert pool.take("Random Role 123") is None
+    _wait_for_refills(pool)
+    assert pool.stats()["roles"] == 2
+    # Without a free slot the role gets no pool, so nothing is generated for it
+    assert (len(generate.roles) > calls) == admitted
+
+
+def test_forget_drops_pools_for_covered_roles():
+    pool = _pool(FakeGenerator([]))
+    pool.remember("game designer", "What makes a level fun to play?")
+    pool.forget(["Game Designer"])
+    assert pool.stats()["roles"] == 0
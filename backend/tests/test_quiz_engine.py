@@ -0,0 +1,79 @@
+# backend/tests/test_quiz_engine.py
+
+import json
+import os
+import subprocess
+import sys
+
+from quiz_engine import GENERIC_MCQS, QuizEngine, mcq_pool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POOL = [f"Question {i}" for i in range(20)]
+
+
+class CountingPools:
+    def __init__(self, pool=POOL):
+        self.pool = pool
+        self.built = []
+
+    def __call__(self, role):
+        self.built.append(role)
+        return self.pool
+
+
+def test_same_seed_draws_the_same_test_in_every_engine():
+    seed, first = QuizEngine(CountingPools()).draw("Data Scientist", 5, seed=42)
+    assert seed == 42
+    assert len(first) == len(set(first)) == 5
+    assert QuizEngine(CountingPools()).draw("Data Scientist", 5, seed=42) == (42, first)
+    assert QuizEngine(CountingPools()).draw("Data Scientist", 5, seed=43)[1] != first
+
+
+def test_seed_draws_match_across_hash_seeds():
+    # Each uvicorn worker has its own PYTHONHASHSEED; a seed must mean the same test in all of them
+    code = (
+        "import json; from quiz_engine import QuizEngine; "
+        f"print(json.dumps(QuizEngine(lambda role: {POOL!r}).draw('Data Scientist', 5, seed=7)[1]))"
+    )
+    draws = {
+        subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": hash_seed},
+        ).stdout
+        for hash_seed in ("1", "2")
+    }
+    assert len(draws) == 1
+    assert json.loads(draws.pop()) == QuizEngine(lambda role: POOL).draw("Data Scientist", 5, seed=7)[1]
+
+
+def test_pools_and_tests_are_built_once():
+    pools = CountingPools()
+    engine = QuizEngine(pools, variants=2)
+    for _ in range(10):
+        seed, _ = engine.draw("Data Scientist", 5)
+        assert seed in (0, 1)
+    engine.draw("Data Scientist", 5, seed=99)
+    assert pools.built == ["Data Scientist"]
+    assert engine.stats()["tests"]["size"] <= 3
+
+
+def test_short_pool_gives_a_shorter_test_without_repeats():
+    _, test = QuizEngine(CountingPools(POOL[:3])).draw("Data Scientist", 5, seed=1)
+    assert sorted(test) == POOL[:3]
+
+
+def test_warm_installs_pools_and_variants():
+    pools = CountingPools()
+    engine = QuizEngine(pools, variants=3)
+    engine.warm({"Data Scientist": POOL}, k=5)
+    assert engine.stats()["tests"]["size"] == 3
+    engine.draw("Data Scientist", 5)
+    assert pools.built == []
+
+
+def test_mcq_pool_puts_bank_first_and_drops_duplicates():
+    banked = {"question": "What does PCA stand for?", "options": ["a", "b", "c", "d"], "answer": "a"}
+    pool = mcq_pool("Data Scientist", {"Data Scientist": [banked]})
+    assert pool[0] is banked
+    assert len(pool) == len(GENERIC_MCQS)  # the generic PCA question is a duplicate
+    assert pool[1]["question"] == "What are key skills for a Data Scientist?"
@@ -0,0 +1,84 @@
+# backend/tests/test_rag_batcher.py
+
+import threading
+
+import pytest
+
+from rag_batcher import SearchBatcher
+
+
+class RecordingRAG:
+    """search_batch stand-in: one row per query naming the query and rank."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+
+    def search_batch(self, queries, k=3, roles=None):
+        self.release.wait(5)
+        self.calls.append((list(queries), k, list(roles)))
+        if self.fail:
+            raise RuntimeError("index unavailable")
+        return [[{"question": f"{q}#{rank}", "role": role} for rank in range(k)] for q, role in zip(queries, roles)]
+
+
+def test_concurrent_searches_share_one_batch_and_get_their_own_rows():
+    rag = RecordingRAG()
+    batcher = SearchBatcher(rag, max_batch_size=8, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(f"q{i}", k=i % 3 + 1, role=f"r{i}") for i in range(8)]
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.close()
+
+    assert len(rag.calls) == 1  # full batch dispatched as one search_batch
+    queries, k, roles = rag.calls[0]
+    assert queries == [f"q{i}" for i in range(8)] and roles == [f"r{i}" for i in range(8)]
+    assert k == 3  # the largest k asked for
+    for i, rows in enumerate(results):
+        assert [r["question"] for r in rows] == [f"q{i}#{rank}" for rank in range(i % 3 + 1)]
+        assert {r["role"] for r in rows} == {f"r{i}"}
+
+
+def test_batches_are_capped_at_max_batch_size():
+    rag = RecordingRAG()
+    rag.release.clear()  # hold the first dispatch so the rest queue up
+    batcher = SearchBatcher(rag, max_batch_size=3, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(f"q{i}") for i in range(7)]
+        rag.release.set()
+        for f in futures:
+            f.result(timeout=5)
+    finally:
+        batcher.close()
+    assert all(len(queries) <= 3 for queries, _, _ in rag.calls)
+    assert [q for queries, _, _ in rag.calls for q in queries] == [f"q{i}" for i in range(7)]
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    batcher = SearchBatcher(RecordingRAG(fail=True), max_batch_size=4, max_wait_ms=100)
+    try:
+        futures = [batcher.submit(f"q{i}") for i in range(4)]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="index unavailable"):
+                f.result(timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_cancelled_requests_are_dropped():
+    rag = RecordingRAG()
+    rag.release.clear()
+    batcher = SearchBatcher(rag, max_batch_size=1, max_wait_ms=0)
+    try:
+        first = batcher.submit("first")
+        cancelled = batcher.submit("cancelled")
+        assert cancelled.cancel()
+        rag.release.set()
+        first.result(timeout=5)
+        assert batcher.search("last", k=1)[0]["question"] == "last#0"
+    finally:
+        batcher.close()
+    assert [queries for queries, _, _ in rag.calls] == [["first"], ["last"]]
@@ -0,0 +1,220 @@
+# backend/tests/test_rag_engine.py
+#
+# RAGEngine with the dependency-free StubEncoder (hashed bag of words), so
+# these run without downloading a model.
+
+import threading
+
+import pytest
+
+import rag_engine
+from rag_engine import RAGEngine
+from stub_models import StubEncoder
+
+ROLES = ("Data Scientist", "Backend Developer", "Product Manager")
+
+
+def _rows(n=300):
+    return [
+        {"role": ROLES[i % len(ROLES)], "question": f"How would you approach topic {i} in {ROLES[i % len(ROLES)]} work?",
+         "answer": f"Answer {i}."}
+        for i in range(n)
+    ]
+
+
+def _engine(path, **kwargs):
+    rag = RAGEngine(model=StubEncoder(dim=64), **kwargs)
+    rag.load_data(path)
+    rag.build_index()
+    return rag
+
+
+def _questions(results):
+    return [r["question"] for r in results]
+
+
+class CountingEncoder(StubEncoder):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend([texts] if isinstance(texts, str) else texts)
+        return super().encode(texts, **kwargs)
+
+
+# ─── Query cache ──────────────────────────────────────────────────────────────
+def test_repeated_query_skips_encode_and_search(write_jsonl):
+    rag = RAGEngine(model=CountingEncoder(dim=64))
+    rag.load_data(write_jsonl(_rows(30)))
+    rag.build_index()
+    rag.model.encoded.clear()
+
+    first = rag.search("approach topic 4", k=3)
+    assert rag.search("approach topic 4", k=3) == first
+    assert rag.model.encoded == ["approach topic 4"]
+    assert rag.query_results.stats()["hits"] == 1
+
+
+def test_index_changes_invalidate_cached_results_but_not_embeddings(write_jsonl):
+    rag = RAGEngine(model=CountingEncoder(dim=64))
+    rag.load_data(write_jsonl(_rows(30)))
+    rag.build_index()
+    rag.model.encoded.clear()
+    query = "How would you approach a brand new topic?"
+    assert query not in _questions(rag.search(query, k=3))
+
+    # add_items bumps the snapshot version: the cached ids must not be reused
+    rag.add_items([("Data Scientist", query, "Fresh answer.")])
+    assert _questions(rag.search(query, k=3))[0] == query
+    # ...while the query's embedding still is (only the new row was encoded)
+    assert rag.model.encoded == [query, query]  # the first search, then the new row
+
+    rag.build_index()
+    assert rag.query_results.stats()["size"] == 0
+    assert _questions(rag.search(query, k=1)) == [query]
+
+
+# ─── Role-filtered search ─────────────────────────────────────────────────────
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+@pytest.mark.parametrize("exact_scan_rows", [0, rag_engine.EXACT_ROLE_SCAN_ROWS])
+def test_role_filter_returns_k_in_role_rows(write_jsonl, monkeypatch, index_type, exact_scan_rows):
+    # 0 forces the FAISS selector path instead of the small-role NumPy scan
+    monkeypatch.setattr(rag_engine, "EXACT_ROLE_SCAN_ROWS", exact_scan_rows)
+    rag = _engine(write_jsonl(_rows()), index_type=index_type, nlist=4)
+    for role in ROLES:
+        results = rag.search("approach topic 7", k=20, role=role)
+        assert len(results) == 20
+        assert {r["role"] for r in results} == {role}
+
+
+def test_role_filter_is_case_insensitive_and_unknown_roles_are_empty(write_jsonl):
+    rag = _engine(write_jsonl(_rows(30)))
+    assert {r["role"] for r in rag.search("topic", k=5, role="  data scientist ")} == {"Data Scientist"}
+    assert rag.search("topic", k=5, role="Astronaut") == []
+    assert len(rag.search("topic", k=5, role=None)) == 5
+
+
+def test_search_params_change_keeps_role_filter(write_jsonl, monkeypatch):
+    monkeypatch.setattr(rag_engine, "EXACT_ROLE_SCAN_ROWS", 0)
+    rag = _engine(write_jsonl(_rows()), index_type="ivf_flat", nlist=4, nprobe=1)
+    rag.set_search_params(nprobe=4)
+    results = rag.search("approach topic 8", k=10, role="Product Manager")
+    assert len(results) == 10 and {r["role"] for r in results} == {"Product Manager"}
+
+
+def test_concurrent_role_filtered_searches(write_jsonl, monkeypatch):
+    # Regression: FAISS search params were shared between threads, and an
+    # IDMap index swaps params.sel during a search, so this crashed
+    monkeypatch.setattr(rag_engine, "EXACT_ROLE_SCAN_ROWS", 0)
+    rag = _engine(write_jsonl(_rows(3000)), query_cache_size=0)
+    errors = []
+
+    def search(worker):
+        # One role, so every thread uses that role's selector at once
+        try:
+            for i in range(300):
+                results = rag.search(f"approach topic {worker * 1000 + i}", k=5, role="Data Scientist")
+                assert len(results) == 5 and {r["role"] for r in results} == {"Data Scientist"}
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=search, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+# ─── Incremental updates ──────────────────────────────────────────────────────
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+@pytest.mark.parametrize("search_mode", ["vector", "hybrid"])
+def test_updates_survive_rebuild(write_jsonl, tmp_path, index_type, search_mode):
+    rows = _rows()
+    # ef_search above the corpus size, so HNSW can list every row
+    rag = _engine(write_jsonl(rows), index_type=index_type, nlist=4, nprobe=4, ef_search=512,
+                  search_mode=search_mode, cache_dir=str(tmp_path / "cache"))
+    replaced, removed = rows[0], rows[1]
+
+    new_ids = rag.add_items([("Data Scientist", "What is a feature store?", "A shared feature table.")])
+    assert _questions(rag.search("What is a feature store?", k=1)) == ["What is a feature store?"]
+    assert rag.upsert([{**replaced, "answer": "Updated answer."}]) == ([new_ids[0] + 1], 1)
+    assert rag.remove_items([removed["question"]]) == 1
+    assert rag.live_count() == len(rows)
+
+    for _ in range(2):  # the second rebuild reuses the on-disk cache
+        rag.build_index()
+        assert rag.live_count() == len(rows)
+        assert rag.index.ntotal == len(rows)
+        everything = rag.search(replaced["question"], k=len(rows) + 5)
+        assert len(everything) == len(rows)
+        assert _questions(everything).count(replaced["question"]) == 1
+        assert removed["question"] not in _questions(everything)
+        hit = rag.search(replaced["question"], k=1, role=replaced["role"])[0]
+        assert (hit["question"], hit["answer"]) == (replaced["question"], "Updated answer.")
+        assert "What is a feature store?" in _questions(rag.search("feature store", k=3, role="Data Scientist"))
+
+
+def test_upsert_keeps_last_item_per_question(write_jsonl):
+    rag = _engine(write_jsonl(_rows(30)))
+    rag.upsert([("Data Scientist", "New question?", "first"), ("Data Scientist", "New question?", "second")])
+    results = [r for r in rag.search("New question?", k=30) if r["question"] == "New question?"]
+    assert [r["answer"] for r in results] == ["second"]
+
+
+def test_invalid_items_are_rejected(write_jsonl):
+    rag = _engine(write_jsonl(_rows(30)))
+    with pytest.raises(ValueError):
+        rag.add_items([("Data Scientist", "", "answer")])
+    assert rag.live_count() == 30
+
+
+# ─── Hybrid retrieval ─────────────────────────────────────────────────────────
+def test_confident_keyword_query_skips_the_model(write_jsonl):
+    rag = _engine(write_jsonl(_rows()), search_mode="hybrid")
+    encoded = []
+    encode = rag.model.encode
+    rag.model.encode = lambda texts, **kw: encoded.append(list(texts)) or encode(texts, **kw)
+
+    results = rag.search("topic 42 Data Scientist", k=1)
+    assert results[0]["question"] == "How would you approach topic 42 in Data Scientist work?"
+    assert encoded == [] and rag.lexical_only == 1
+
+
+def test_short_keyword_result_is_filled_from_vectors(write_jsonl):
+    # One row matches every keyword, but k asks for more than BM25 found:
+    # the vector side fills the rest instead of returning one row
+    rows = _rows(60) + [{"role": "Data Scientist", "question": "Interview for Data Scientist?", "answer": "Yes."}]
+    rows = [dict(row, question=row["question"].replace("Data Scientist", "DS")) if i < 60 else row
+            for i, row in enumerate(rows)]
+    rag = _engine(write_jsonl(rows), search_mode="hybrid")
+    results = rag.search("interview for Data Scientist", k=20, role="Data Scientist")
+    assert len(results) == 20
+    assert results[0]["question"] == "Interview for Data Scientist?"
+    assert rag.lexical_only == 0 and rag.fused == 1
+
+
+def test_hybrid_matches_vector_mode_result_counts(write_jsonl):
+    path = write_jsonl(_rows())
+    vector, hybrid = _engine(path), _engine(path, search_mode="hybrid")
+    for query, role in [("approach topic 3", None), ("topic", "Product Manager"), ("zzz unknown", None)]:
+        assert len(hybrid.search(query, k=10, role=role)) == len(vector.search(query, k=10, role=role))
+
+
+# ─── Shared dataset text ──────────────────────────────────────────────────────
+def test_default_load_indexes_the_shared_dataset_in_place(write_jsonl, monkeypatch):
+    from dataset_store import load_dataset_file
+    from text_store import TextView
+
+    dataset = load_dataset_file(write_jsonl(_rows(30) + [{"role": "X", "question": "No answer?"}]))
+    monkeypatch.setattr(rag_engine, "get_dataset", lambda: dataset)
+    rag = RAGEngine(model=StubEncoder(dim=64))
+    rag.load_data()
+    rag.build_index()
+    assert isinstance(rag.questions, TextView) and rag.questions.base is dataset.questions
+    assert len(rag.questions) == 30  # rows without an answer are skipped
+
+    rag.add_items([("X", "Added question?", "Added answer.")])
+    assert rag.search("Added question?", k=1)[0]["answer"] == "Added answer."
+    assert len(dataset) == 31  # the dataset itself is untouched
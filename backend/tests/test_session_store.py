@@ -0,0 +1,42 @@
+# backend/tests/test_session_store.py
+#
+# Both session backends; the SQLite one writes to its own temporary file.
+
+import pytest
+
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def sessions(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore(maxsize=10, ttl=0)
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=0)
+
+
+def test_session_round_trip(sessions):
+    sessions.start("s1", "Data Scientist", "What is overfitting?")
+    assert sessions.append("s1", "answer", {"answer": "Fitting noise."})
+    assert sessions.append("s1", "feedback", {"feedback": {"f1": 0.8}})
+    expected = {"role": "Data Scientist", "qa": [
+        {"question": "What is overfitting?", "answer": "Fitting noise.", "feedback": {"f1": 0.8}},
+    ]}
+    assert sessions.get("s1") == expected
+    assert sessions.get("missing") is None
+
+
+def test_session_is_readable_by_another_worker(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    writer = SQLiteSessionStore(path, ttl=0)
+    writer.start("s1", "Data Scientist", "What is PCA?")
+    writer.append("s1", "answer", {"answer": "A projection."})
+    assert writer.writer.flush(timeout=5)
+    other = SQLiteSessionStore(path, ttl=0)
+    assert other.get("s1") == {"role": "Data Scientist", "qa": [{"question": "What is PCA?", "answer": "A projection."}]}
+
+
+def test_memory_session_copies_are_isolated():
+    sessions = MemorySessionStore(maxsize=10, ttl=0)
+    sessions.start("s1", "Data Scientist", "Q?")
+    sessions.get("s1")["qa"].append({"question": "tampered"})
+    assert len(sessions.get("s1")["qa"]) == 1
@@ -0,0 +1,135 @@
+# backend/text_store.py
+#
+# Append-only list of strings kept as one contiguous UTF-8 buffer plus an
+# offsets array: ~1 byte per character and 8 bytes per row, instead of a
+# Python str object (~50 bytes of overhead) per row. With a path the buffer
+# lives in a file and is read back through mmap, so only the pages actually
+# touched take memory. TextView selects rows of another store without
+# copying their text.
+
+import mmap
+import threading
+from array import array
+
+
+class TextStore:
+    def __init__(self, path=None):
+        self.path = path
+        self.offsets = array("Q", [0])
+        self._buffer = bytearray() if path is None else None
+        self._file = open(path, "w+b") if path else None
+        self._map = None
+        self._map_lock = threading.Lock()
+
+    def append(self, text: str):
+        data = text.encode("utf-8")
+        if self.path is None:
+            self._buffer += data
+        else:
+            self._file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def extend(self, texts):
+        for text in texts:
+            self.append(text)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _view(self, end):
+        if self.path is None:
+            return self._buffer
+        current = self._map
+        if current is None or len(current) < end:
+            with self._map_lock:
+                if self._map is None or len(self._map) < end:
+                    # Written since the last mapping: flush and map the file
+                    # again (the old map stays valid for readers still on it)
+                    self._file.flush()
+                    self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                current = self._map
+        return current
+
+    def _slice(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("TextStore index out of range")
+        i %= len(self)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self._view(end)[start:end] if end > start else b""
+
+    def raw(self, i) -> bytes:
+        return bytes(self._slice(i))
+
+    def __getitem__(self, i) -> str:
+        return self._slice(i).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def iter_raw(self):
+        for i in range(len(self)):
+            yield self.raw(i)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets[-1] + self.offsets.itemsize * len(self.offsets)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TextView:
+    """Rows of a base store picked by id (read-only, shared with whoever owns
+    the base), followed by rows appended to the view itself. Same interface as
+    TextStore; costs 4 bytes per picked row instead of its text."""
+
+    def __init__(self, base, rows):
+        self.base = base
+        self.rows = rows  # array("I") of row ids in base
+        self.tail = TextStore()
+        self.path = None
+
+    def append(self, text: str):
+        self.tail.append(text)
+
+    def extend(self, texts):
+        self.tail.extend(texts)
+
+    def __len__(self):
+        return len(self.rows) + len(self.tail)
+
+    def _locate(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("TextView index out of range")
+        i %= len(self)
+        return (self.base, self.rows[i]) if i < len(self.rows) else (self.tail, i - len(self.rows))
+
+    def raw(self, i) -> bytes:
+        store, row = self._locate(i)
+        return store.raw(row)
+
+    def __getitem__(self, i) -> str:
+        store, row = self._locate(i)
+        return store[row]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def iter_raw(self):
+        for i in range(len(self)):
+            yield self.raw(i)
+
+    @property
+    def nbytes(self) -> int:
+        # Only what the view itself holds; the base belongs to its owner
+        return self.rows.itemsize * len(self.rows) + self.tail.nbytes
+
+    def close(self):
+        self.tail.close()
@@ -0,0 +1,152 @@
+# backend/topic_index.py
+#
+# Precomputed index for study_plan_generator.extract_weak_topics. A dataset
+# question matches a weak keyword when either string contains the other or
+# their difflib ratio is above 0.75. Instead of running SequenceMatcher for
+# every (question × keyword) pair, the index prunes candidates with bounds
+# that can never reject a true match, so results are identical to the
+# brute-force scan:
+#   • substring tests only look at rows sharing every character trigram
+#   • ratio = 2·M / (|a|+|b|), where difflib's matching blocks M form a
+#     common subsequence. So M can't exceed the shared character counts
+#     (vectorised histogram bound) nor the LCS length (bit-parallel, ~20x
+#     cheaper than SequenceMatcher); only rows passing both get the exact ratio
+# Test histories are resent with every study-plan request, so per-keyword
+# results are also memoized for the lifetime of the index.
+
+import bisect
+import difflib
+import string
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+FUZZY_THRESHOLD = 0.75
+
+# Histogram buckets: letters, digits and space get their own slot, everything
+# else shares one. Merging characters only loosens the bound, never breaks it.
+_BUCKETS = {c: i for i, c in enumerate(string.ascii_lowercase + string.digits + " ")}
+_OTHER = len(_BUCKETS)
+N_BUCKETS = _OTHER + 1
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _histogram(text):
+    counts = np.zeros(N_BUCKETS, dtype=np.int32)
+    for c in text:
+        counts[_BUCKETS.get(c, _OTHER)] += 1
+    return counts
+
+
+def _lcs_pattern(text):
+    masks = {}
+    for i, c in enumerate(text):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks, (1 << len(text)) - 1
+
+
+def _lcs_length(pattern, text, length):
+    # Bit-parallel LCS (Allison–Dix / Hyyrö): zero bits of v count the LCS
+    masks, full = pattern
+    v = full
+    for c in text:
+        u = v & masks.get(c, 0)
+        v = ((v + u) | (v - u)) & full
+    return length - bin(v).count("1")
+
+
+class TopicIndex:
+    def __init__(self, texts, cache_size=4096):
+        """texts: stripped + lowercased questions; row ids are list positions."""
+        self.texts = texts
+        self.keyword_cache = TTLCache(cache_size)
+        self.lengths = np.array([len(t) for t in self.texts], dtype=np.int32)
+
+        self.postings = {}       # trigram -> list of row ids
+        self.gram_counts = []    # distinct trigrams per row
+        self.short_rows = []     # rows under 3 chars have no trigrams
+        for row, text in enumerate(self.texts):
+            grams = _trigrams(text)
+            self.gram_counts.append(len(grams))
+            if not grams:
+                self.short_rows.append(row)
+            for g in grams:
+                self.postings.setdefault(g, []).append(row)
+
+        self.histograms = np.stack([_histogram(t) for t in self.texts]) if self.texts else \
+            np.zeros((0, N_BUCKETS), dtype=np.int32)
+        # Rows sorted by length, for the ratio length window
+        self._by_length = np.argsort(self.lengths, kind="stable")
+        self._sorted_lengths = self.lengths[self._by_length].tolist()
+
+    def match_rows(self, keyword):
+        """Row ids matching keyword (already stripped + lowercased)."""
+        matched = self.keyword_cache.get(keyword)
+        if matched is None:
+            matched = frozenset(self._match_rows(keyword))
+            self.keyword_cache.put(keyword, matched)
+        return matched
+
+    def _match_rows(self, keyword):
+        matched = set()
+        n = len(self.texts)
+        k_len = len(keyword)
+        grams = _trigrams(keyword)
+
+        # keyword in text: the text must contain every trigram of the keyword
+        if grams:
+            candidates = None
+            for g in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+                posting = self.postings.get(g)
+                if not posting:
+                    candidates = set()
+                    break
+                candidates = set(posting) if candidates is None else candidates.intersection(posting)
+                if not candidates:
+                    break
+            matched.update(r for r in candidates if keyword in self.texts[r])
+        else:
+            matched.update(r for r in range(n) if keyword in self.texts[r])
+
+        # text in keyword: all of the text's trigrams must occur in the keyword
+        hits = {}
+        for g in grams:
+            for r in self.postings.get(g, ()):
+                hits[r] = hits.get(r, 0) + 1
+        matched.update(r for r, c in hits.items() if c == self.gram_counts[r] and self.texts[r] in keyword)
+        matched.update(r for r in self.short_rows if self.texts[r] in keyword)
+
+        # Fuzzy: 2·min(la, lb)/(la+lb) > t  ⇔  the shorter is > t/(2-t) of the longer
+        t = FUZZY_THRESHOLD
+        lo = k_len * t / (2 - t)
+        hi = k_len * (2 - t) / t
+        start = bisect.bisect_left(self._sorted_lengths, lo)
+        stop = bisect.bisect_right(self._sorted_lengths, hi)
+        window = self._by_length[start:stop]
+        if len(window):
+            overlap = np.minimum(self.histograms[window], _histogram(keyword)).sum(axis=1)
+            bound = 2.0 * overlap / (self.lengths[window] + k_len)
+            pattern = _lcs_pattern(keyword)
+            for r in window[bound > t].tolist():
+                if r in matched:
+                    continue
+                text = self.texts[r]
+                if 2.0 * _lcs_length(pattern, text, k_len) / (len(text) + k_len) <= t:
+                    continue
+                if difflib.SequenceMatcher(None, keyword, text).ratio() > t:
+                    matched.add(r)
+        return matched
+
+    def match(self, keywords):
+        """[(row_id, keyword_position)] in dataset order, pairing each matched
+        row with the first keyword that matches it (same as the nested scan)."""
+        first = {}
+        for pos, keyword in enumerate(keywords):
+            for r in self.match_rows(keyword):
+                if r not in first:
+                    first[r] = pos
+        return sorted(first.items())